@@ -1,8 +1,11 @@
 import pygame
-import random
 import sys # Import sys for exit
 import math # For tile color calculation
 import os # For file operations
+import bitboard # Packed 64-bit board and table-driven moves
+from board import Board2048, MIN_SIZE, MAX_SIZE, geometry, move_cells
+from expectimax import ExpectimaxAI
+from ai_worker import AIWorker
 
 # 初始化 Pygame
 pygame.init()
@@ -18,6 +21,13 @@ INFO_PANEL_HEIGHT = HEADER_HEIGHT
 GAME_GRID_HEIGHT = GRID_ROWS * BLOCK_SIZE
 SCREEN_WIDTH = GRID_COLUMNS * BLOCK_SIZE
 SCREEN_HEIGHT = GAME_GRID_HEIGHT + INFO_PANEL_HEIGHT
+# Other grid sizes (set_grid_size): tiles shrink so the grid fits in MAX_GRID_WIDTH x MAX_GRID_HEIGHT,
+# and a grid smaller than MIN_GRID_SIDE on a side is centred in that much room
+MAX_GRID_WIDTH = 800
+MAX_GRID_HEIGHT = 700
+MIN_GRID_SIDE = 400
+GRID_LEFT = 0 # Top-left corner of the grid in the window
+GRID_TOP = INFO_PANEL_HEIGHT
 
 # Colors
 BACKGROUND_COLOR = (200, 200, 200) # Light Gray
@@ -46,6 +56,21 @@ pygame.display.set_caption("2048")
 # Clock for FPS control
 clock = pygame.time.Clock()
 
+
+def set_grid_size(rows, columns):
+    """Switches the game to a rows x columns grid and resizes the window (and tiles) to fit it."""
+    global GRID_ROWS, GRID_COLUMNS, BLOCK_SIZE, GAME_GRID_HEIGHT, SCREEN_WIDTH, SCREEN_HEIGHT
+    global GRID_LEFT, GRID_TOP, FONT_TILE, screen
+    GRID_ROWS, GRID_COLUMNS = rows, columns
+    BLOCK_SIZE = min(100, MAX_GRID_WIDTH // columns, MAX_GRID_HEIGHT // rows)
+    SCREEN_WIDTH = max(MIN_GRID_SIDE, columns * BLOCK_SIZE)
+    GAME_GRID_HEIGHT = max(MIN_GRID_SIDE, rows * BLOCK_SIZE)
+    SCREEN_HEIGHT = GAME_GRID_HEIGHT + INFO_PANEL_HEIGHT
+    GRID_LEFT = (SCREEN_WIDTH - columns * BLOCK_SIZE) // 2
+    GRID_TOP = INFO_PANEL_HEIGHT + (GAME_GRID_HEIGHT - rows * BLOCK_SIZE) // 2
+    FONT_TILE = pygame.font.SysFont(FONT_FAMILY, max(12, BLOCK_SIZE * 2 // 5)) # 40 at the default size
+    screen = pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT))
+
 # --- Tile Color Calculation ---
 def get_tile_color(value):
     """Generates a color for a tile based on its value.
@@ -65,66 +90,12 @@ def get_tile_color(value):
     return (max(0, min(255, r)), max(0, min(255, g)), max(0, min(255, b)))
 
 # --- Game Logic Functions (mostly unchanged) ---
-def move_row_left(row):
-    filtered = [num for num in row if num != 0]
-    new_row = []
-    i = 0
-    while i < len(filtered):
-        if i < len(filtered) - 1 and filtered[i] == filtered[i + 1]:
-            new_row.append(filtered[i] * 2)
-            i += 2
-        else:
-            new_row.append(filtered[i])
-            i += 1
-    new_row += [0] * (GRID_COLUMNS - len(new_row))  # 补齐列数
-    return new_row
-
-
-def transpose(grid):
-    return [list(row) for row in zip(*grid)]
-
-
-def reverse(grid):
-    return [row[::-1] for row in grid]
-
-
-def add_new_tile(grid):
-    empty_cells = []
-    for i in range(GRID_ROWS):
-        for j in range(GRID_COLUMNS):
-            if grid[i][j] == 0:
-                empty_cells.append((i, j))
-    if empty_cells:
-        x, y = random.choice(empty_cells)
-        grid[x][y] = random.choice([2, 4])
-
-
-def check_win(grid):
-    for row in grid:
-        if 2048 in row:
-            return True
-    return False
-
-
-def check_lose(grid):
-    for row in grid:
-        if 0 in row:
-            return False
-    for i in range(GRID_ROWS):
-        for j in range(GRID_COLUMNS):
-            if (i < GRID_ROWS - 1 and grid[i][j] == grid[i + 1][j]) or (
-                    j < GRID_COLUMNS - 1 and grid[i][j] == grid[i][j + 1]):
-                return False
-    return True
-
-
-def calculate_score(grid):
-    # Simple score: sum of all tiles
-    score = 0
-    for r in range(GRID_ROWS):
-        for c in range(GRID_COLUMNS):
-            score += grid[r][c]
-    return score
+def new_board():
+    """A Board2048 with its two starting tiles."""
+    board = Board2048(GRID_ROWS, GRID_COLUMNS)
+    board.spawn()
+    board.spawn()
+    return board
 
 # --- Drawing Functions (Updated Styles) ---
 def draw_grid_and_tiles(grid):
@@ -134,7 +105,7 @@ def draw_grid_and_tiles(grid):
     # Draw background grid squares
     for r in range(GRID_ROWS):
         for c in range(GRID_COLUMNS):
-            rect = pygame.Rect(c * BLOCK_SIZE, INFO_PANEL_HEIGHT + r * BLOCK_SIZE, BLOCK_SIZE, BLOCK_SIZE)
+            rect = pygame.Rect(GRID_LEFT + c * BLOCK_SIZE, GRID_TOP + r * BLOCK_SIZE, BLOCK_SIZE, BLOCK_SIZE)
             tile_val = grid[r][c]
             tile_color = get_tile_color(tile_val) 
             pygame.draw.rect(screen, tile_color, rect)
@@ -145,13 +116,15 @@ def draw_grid_and_tiles(grid):
                 screen.blit(text_surface, text_rect)
 
     # Draw grid lines over the tiles
-    line_width = 5
+    line_width = max(2, BLOCK_SIZE // 20) # 5 at the default size
+    right = GRID_LEFT + GRID_COLUMNS * BLOCK_SIZE
+    bottom = GRID_TOP + GRID_ROWS * BLOCK_SIZE
     for i in range(GRID_ROWS + 1):
-        y = INFO_PANEL_HEIGHT + i * BLOCK_SIZE
-        pygame.draw.line(screen, GRID_LINE_COLOR, (0, y), (SCREEN_WIDTH, y), line_width)
+        y = GRID_TOP + i * BLOCK_SIZE
+        pygame.draw.line(screen, GRID_LINE_COLOR, (GRID_LEFT, y), (right, y), line_width)
     for i in range(GRID_COLUMNS + 1):
-        x = i * BLOCK_SIZE
-        pygame.draw.line(screen, GRID_LINE_COLOR, (x, INFO_PANEL_HEIGHT), (x, SCREEN_HEIGHT), line_width)
+        x = GRID_LEFT + i * BLOCK_SIZE
+        pygame.draw.line(screen, GRID_LINE_COLOR, (x, GRID_TOP), (x, bottom), line_width)
 
 # Standardized Button Function (Updated Padding Logic)
 def draw_button(surface, text, font, x, y, width, height, color, hover_color, text_color):
@@ -183,56 +156,54 @@ def draw_button(surface, text, font, x, y, width, height, color, hover_color, te
     return button_rect, is_hovered 
 
 # --- Game State Functions (Movement unchanged, High Score Added) ---
+# The list functions are adapters: a 4x4 grid is packed into one int for bitboard.py,
+# moved with the precomputed row tables and unpacked again; any other shape, and a 4x4
+# grid with a tile the bitboard cannot merge (bitboard.fits), goes through board.py's
+# kernel along the precomputed lines of its flattened cells
+def _bitboard_move(grid, move):
+    board = bitboard.from_grid(grid)
+    moved, _ = move(board)
+    return bitboard.to_grid(moved), moved != board
+
+
+def _grid_move(grid, direction):
+    rows, columns = len(grid), len(grid[0])
+    if rows == columns == 4 and bitboard.fits(grid):
+        return _bitboard_move(grid, bitboard.MOVES[direction])
+    cells, _, changed = move_cells([value for row in grid for value in row], geometry(rows, columns), direction)
+    return [cells[r * columns:(r + 1) * columns] for r in range(rows)], changed
+
+
 def move_up(grid):
-    transposed = transpose(grid)
-    new_transposed = []
-    changed = False
-    for row in transposed:
-        new_row = move_row_left(row)
-        new_transposed.append(new_row)
-        if new_row != row:
-            changed = True
-    new_grid = transpose(new_transposed)
-    return new_grid, changed
+    return _grid_move(grid, 0)
 
 
 def move_down(grid):
-    transposed = transpose(grid)
-    new_transposed = []
-    changed = False
-    for row in transposed:
-        row = row[::-1]
-        new_row = move_row_left(row)
-        new_row = new_row[::-1]
-        new_transposed.append(new_row)
-        if new_row != row[::-1]:
-            changed = True
-    new_grid = transpose(new_transposed)
-    return new_grid, changed
+    return _grid_move(grid, 1)
 
 
 def move_left(grid):
-    new_grid = []
-    changed = False
-    for row in grid:
-        new_row = move_row_left(row)
-        new_grid.append(new_row)
-        if new_row != row:
-            changed = True
-    return new_grid, changed
+    return _grid_move(grid, 2)
 
 
 def move_right(grid):
-    new_grid = []
-    changed = False
-    for row in grid:
-        row = row[::-1]
-        new_row = move_row_left(row)
-        new_row = new_row[::-1]
-        new_grid.append(new_row)
-        if new_row != row[::-1]:
-            changed = True
-    return new_grid, changed
+    return _grid_move(grid, 3)
+
+# Keys and names of the directions in bitboard.MOVES order, which Board2048.move takes too
+MOVE_NAMES = ("上", "下", "左", "右")
+MOVE_KEYS = {
+    pygame.K_UP: 0, pygame.K_w: 0,
+    pygame.K_DOWN: 1, pygame.K_s: 1,
+    pygame.K_LEFT: 2, pygame.K_a: 2,
+    pygame.K_RIGHT: 3, pygame.K_d: 3,
+}
+
+def high_score_file():
+    """Each grid size keeps its own high score; the classic 4x4 one stays in high_score.txt."""
+    if (GRID_ROWS, GRID_COLUMNS) == (4, 4):
+        return "high_score.txt"
+    return f"high_score_{GRID_ROWS}x{GRID_COLUMNS}.txt"
+
 
 def load_high_score():
     # Define the correct path relative to the project root or script location
@@ -240,7 +211,7 @@ def load_high_score():
     # If the script's CWD is uncertain, build an absolute path
     try:
         script_dir = os.path.dirname(__file__) # Get directory of the current script
-        file_path = os.path.join(script_dir, "high_score.txt") # Path relative to script dir
+        file_path = os.path.join(script_dir, high_score_file()) # Path relative to script dir
         # Or if you are sure CWD is project root:
         # file_path = "2048/high_score.txt"
         with open(file_path, "r") as file:
@@ -258,7 +229,7 @@ def load_high_score():
 def save_high_score(score):
     try:
         script_dir = os.path.dirname(__file__) # Get directory of the current script
-        file_path = os.path.join(script_dir, "high_score.txt") # Path relative to script dir
+        file_path = os.path.join(script_dir, high_score_file()) # Path relative to script dir
         # Or if you are sure CWD is project root:
         # file_path = "2048/high_score.txt"
         with open(file_path, "w") as file:
@@ -267,12 +238,20 @@ def save_high_score(score):
         print(f"Error saving high score to {file_path}: {e}")
 
 # --- Main Menu (Updated Style) ---
-def main_menu():
+def clamp_size(n):
+    return max(MIN_SIZE, min(MAX_SIZE, n))
+
+
+def main_menu(rows=4, columns=4):
+    """Start/exit buttons and the grid size picker; returns the chosen (rows, columns)."""
     button_width = 200
     button_height = 50
+    small_button = 40
     # Define button center positions
     start_button_center_x = SCREEN_WIDTH // 2
-    start_button_center_y = SCREEN_HEIGHT // 2 - button_height // 2 # Adjust y slightly
+    rows_y = SCREEN_HEIGHT * 0.38
+    columns_y = rows_y + small_button + 15
+    start_button_center_y = SCREEN_HEIGHT * 0.66
     exit_button_center_y = start_button_center_y + button_height + 20
 
     running = True
@@ -281,9 +260,22 @@ def main_menu():
 
         # Title
         title_surf = FONT_LARGE.render("2048 Game", True, PRIMARY_COLOR)
-        title_rect = title_surf.get_rect(center=(SCREEN_WIDTH // 2, SCREEN_HEIGHT // 3))
+        title_rect = title_surf.get_rect(center=(SCREEN_WIDTH // 2, SCREEN_HEIGHT * 0.2))
         screen.blit(title_surf, title_rect)
 
+        # 棋盘大小: 行数和列数各有 - / + 按钮 (方向键也可以调整)
+        size_buttons = []
+        for label, value, y, axis in (("行数", rows, rows_y, 0), ("列数", columns, columns_y, 1)):
+            label_surf = FONT_MEDIUM.render(f"{label}: {value}", True, TEXT_COLOR)
+            screen.blit(label_surf, label_surf.get_rect(center=(start_button_center_x, y)))
+            for text, dx, step in (("-", -100, -1), ("+", 100, 1)):
+                rect, _ = draw_button(
+                    screen, text, FONT_MEDIUM,
+                    start_button_center_x + dx, y, small_button, small_button,
+                    PRIMARY_COLOR, ACCENT_COLOR, BUTTON_TEXT_COLOR
+                )
+                size_buttons.append((rect, axis, step))
+
         # Buttons - Pass center coordinates to draw_button
         start_button_rect, start_hover = draw_button(
             screen, "开始游戏", FONT_MEDIUM,
@@ -303,13 +295,26 @@ def main_menu():
             if event.type == pygame.QUIT:
                 pygame.quit()
                 sys.exit() # Exit cleanly
+            if event.type == pygame.KEYDOWN:
+                if event.key in (pygame.K_RETURN, pygame.K_SPACE):
+                    return rows, columns # Start game
+                elif event.key in (pygame.K_UP, pygame.K_DOWN):
+                    rows = clamp_size(rows + (1 if event.key == pygame.K_UP else -1))
+                elif event.key in (pygame.K_LEFT, pygame.K_RIGHT):
+                    columns = clamp_size(columns + (1 if event.key == pygame.K_RIGHT else -1))
             if event.type == pygame.MOUSEBUTTONDOWN:
                 if event.button == 1:
                     if start_button_rect.collidepoint(event.pos):
-                        return True  # Start game
+                        return rows, columns  # Start game
                     elif exit_button_rect.collidepoint(event.pos):
                         pygame.quit()
                         sys.exit() # Exit cleanly
+                    for rect, axis, step in size_buttons:
+                        if rect.collidepoint(event.pos):
+                            if axis == 0:
+                                rows = clamp_size(rows + step)
+                            else:
+                                columns = clamp_size(columns + step)
 
         pygame.display.flip()
         clock.tick(30) # Lower tick rate for menu
@@ -319,11 +324,12 @@ def main_menu():
     sys.exit()
 
 # --- Game Over Screen (Updated Style) ---
-def game_over_screen(score, high_score, grid):
+def game_over_screen(board, high_score):
     button_width = 200
     button_height = 50
-    restart_button_y = SCREEN_HEIGHT * 0.6 + button_height // 2
-    menu_button_y = restart_button_y + button_height + 20
+    restart_button_y = SCREEN_HEIGHT * 0.55 + button_height // 2
+    size_button_y = restart_button_y + button_height + 20
+    menu_button_y = size_button_y + button_height + 20
 
     while True:
         screen.fill(BACKGROUND_COLOR)
@@ -333,9 +339,10 @@ def game_over_screen(score, high_score, grid):
         overlay.fill((0, 0, 0, 128))
         
         # 绘制游戏结束时的棋盘状态
+        grid = board.grid
         for r in range(GRID_ROWS):
             for c in range(GRID_COLUMNS):
-                rect = pygame.Rect(c * BLOCK_SIZE, INFO_PANEL_HEIGHT + r * BLOCK_SIZE, BLOCK_SIZE, BLOCK_SIZE)
+                rect = pygame.Rect(GRID_LEFT + c * BLOCK_SIZE, GRID_TOP + r * BLOCK_SIZE, BLOCK_SIZE, BLOCK_SIZE)
                 tile_color = get_tile_color(grid[r][c])
                 pygame.draw.rect(overlay, tile_color, rect)
                 if grid[r][c] != 0:
@@ -351,7 +358,7 @@ def game_over_screen(score, high_score, grid):
         screen.blit(go_text, go_rect)
         
         # 分数显示
-        score_text = FONT_MEDIUM.render(f"得分: {score}", True, TEXT_COLOR)
+        score_text = FONT_MEDIUM.render(f"得分: {board.score}", True, TEXT_COLOR)
         score_rect = score_text.get_rect(center=(SCREEN_WIDTH // 2, SCREEN_HEIGHT * 0.35))
         screen.blit(score_text, score_rect)
         
@@ -365,6 +372,11 @@ def game_over_screen(score, high_score, grid):
             SCREEN_WIDTH // 2, restart_button_y, button_width, button_height,
             PRIMARY_COLOR, ACCENT_COLOR, BUTTON_TEXT_COLOR
         )
+        size_rect, _ = draw_button(
+            screen, "换棋盘 (M)", FONT_MEDIUM,
+            SCREEN_WIDTH // 2, size_button_y, button_width, button_height,
+            PRIMARY_COLOR, ACCENT_COLOR, BUTTON_TEXT_COLOR
+        )
         menu_rect, _ = draw_button(
             screen, "退出游戏 (Q)", FONT_MEDIUM,
             SCREEN_WIDTH // 2, menu_button_y, button_width, button_height,
@@ -378,21 +390,18 @@ def game_over_screen(score, high_score, grid):
                 sys.exit()
             elif event.type == pygame.KEYDOWN:
                 if event.key == pygame.K_r:
-                    grid = [[0] * GRID_COLUMNS for _ in range(GRID_ROWS)]
-                    add_new_tile(grid)
-                    add_new_tile(grid)
-                    return "restart"
+                    return "restart" # The caller starts a new board
+                elif event.key == pygame.K_m:
+                    return "menu" # Back to the main menu to pick another grid size
                 elif event.key == pygame.K_q or event.key == pygame.K_ESCAPE:
                     # 直接退出游戏
                     pygame.quit()
                     sys.exit()
             elif event.type == pygame.MOUSEBUTTONDOWN and event.button == 1:
                 if restart_rect.collidepoint(event.pos):
-                    # 直接重置游戏状态并开始新游戏
-                    grid = [[0] * GRID_COLUMNS for _ in range(GRID_ROWS)]
-                    add_new_tile(grid)
-                    add_new_tile(grid)
-                    return "restart"
+                    return "restart" # The caller starts a new board
+                elif size_rect.collidepoint(event.pos):
+                    return "menu"
                 elif menu_rect.collidepoint(event.pos):
                     # 直接退出游戏
                     pygame.quit()
@@ -403,87 +412,128 @@ def game_over_screen(score, high_score, grid):
 
 # --- Main Game Loop (Updated Style and Logic) ---
 def main():
+    # The expectimax AI thinks on a background thread: hints (H) and autoplay (P) never stall drawing
+    advisor = AIWorker(ExpectimaxAI())
+    autoplay = False
     while True: # Outer loop to handle returning to menu
-        if not main_menu(): # Show main menu, exit if it returns False
-             break
+        set_grid_size(*main_menu(GRID_ROWS, GRID_COLUMNS)) # Show main menu, then size the window for its grid
+        # The AI's bitboards and tables only exist for the classic 4x4 grid
+        ai_enabled = (GRID_ROWS, GRID_COLUMNS) == (4, 4)
 
         # --- Initialize Game State ---
-        grid = [[0] * GRID_COLUMNS for _ in range(GRID_ROWS)]
-        add_new_tile(grid)
-        add_new_tile(grid)
+        # The board keeps its score, empty cells, largest tile and game over state up to date as it moves
+        board = new_board()
         high_score = load_high_score()
-        current_score = 0
         game_over = False
+        hint = None # Index into bitboard.MOVES suggested for the current board
+        packed = None # The board as a bitboard for the AI, packed again only after the board changes
         # No separate show_menu flag needed now, handled by game_over state
         
         # --- Inner Game Loop ---
         running_game = True
         while running_game:
-            changed = False # Track if a move happened
+            move = None # Direction (bitboard.MOVES order) to play this frame
+            want_hint = False
             # --- Event Handling ---
             for event in pygame.event.get():
                 if event.type == pygame.QUIT:
                     pygame.quit()
                     sys.exit()
                 if event.type == pygame.KEYDOWN and not game_over:
-                    new_grid = grid # Keep pylint happy
-                    if event.key == pygame.K_UP or event.key == pygame.K_w:
-                        new_grid, changed = move_up(grid)
-                    elif event.key == pygame.K_DOWN or event.key == pygame.K_s:
-                        new_grid, changed = move_down(grid)
-                    elif event.key == pygame.K_LEFT or event.key == pygame.K_a:
-                        new_grid, changed = move_left(grid)
-                    elif event.key == pygame.K_RIGHT or event.key == pygame.K_d:
-                        new_grid, changed = move_right(grid)
+                    if event.key in MOVE_KEYS:
+                        move = MOVE_KEYS[event.key]
+                    elif event.key in (pygame.K_h, pygame.K_p) and not ai_enabled:
+                        print("AI 提示和自动只支持 4×4 棋盘")
+                    elif event.key in (pygame.K_h, pygame.K_p) and board.max_tile >= bitboard.EXACT_TILE_LIMIT:
+                        print("AI 不支持 32768 及以上的方块")
+                    elif event.key == pygame.K_h:
+                        want_hint = True # Requested below, shown when it arrives
+                    elif event.key == pygame.K_p:
+                        autoplay = not autoplay
                     # Add key for reset?
                     # elif event.key == pygame.K_n:
                     #     running_game = False # Go back to menu to restart
-                    
-                    if changed:
-                        grid = new_grid
-                        add_new_tile(grid)
-                        current_score = calculate_score(grid) # Update score
-                        if current_score > high_score:
-                            high_score = current_score # Update high score live
-                        # Check game end conditions after move
-                        if check_win(grid):
-                            # Simple win message for now
-                            print("You reached 2048!") 
-                            # game_over = True # Could set game over on win
-                        if check_lose(grid):
-                            game_over = True
-                            save_high_score(high_score) # Save score on lose
+
+            # --- AI: advice arrives from the worker thread, only used if the board is still the same ---
+            # Its bitboards cannot merge two 32768s, so the AI stops once one is on the board
+            if ai_enabled and board.max_tile < bitboard.EXACT_TILE_LIMIT:
+                if packed is None:
+                    packed = bitboard.from_grid(board.grid)
+                if want_hint and not advisor.thinking:
+                    advisor.request(packed)
+                advice = advisor.poll()
+                if advice is not None and advice.board == packed:
+                    hint = advice.move
+                    if autoplay and move is None:
+                        move = advice.move
+                if autoplay and not game_over and move is None and not advisor.thinking:
+                    advisor.request(packed)
+
+            if move is not None and not game_over:
+                won = board.has_won()
+                if board.move(move):
+                    hint = None
+                    board.spawn()
+                    packed = None
+                    if board.score > high_score:
+                        high_score = board.score # Update high score live
+                    # Check game end conditions after move
+                    if board.has_won() and not won:
+                        # Simple win message for now
+                        print("You reached 2048!") 
+                        # game_over = True # Could set game over on win
+                    if board.is_over():
+                        game_over = True
+                        save_high_score(high_score) # Save score on lose
 
             # --- Drawing --- 
             screen.fill(BACKGROUND_COLOR) # Fill whole background
             
             # Draw Header/Info Panel
-            score_text = FONT_MEDIUM.render(f"得分: {current_score}", True, TEXT_COLOR)
+            score_text = FONT_MEDIUM.render(f"得分: {board.score}", True, TEXT_COLOR)
             score_rect = score_text.get_rect(midleft=(10, INFO_PANEL_HEIGHT // 4))
             screen.blit(score_text, score_rect)
             
             hs_text = FONT_MEDIUM.render(f"最高分: {high_score}", True, TEXT_COLOR)
             hs_rect = hs_text.get_rect(midleft=(10, INFO_PANEL_HEIGHT * 0.75))
             screen.blit(hs_text, hs_rect)
+
+            # AI status: the hint for this board (H), and autoplay (P); other grid sizes show their size instead
+            if ai_enabled:
+                if advisor.thinking:
+                    hint_label = "思考中..."
+                elif hint is not None:
+                    hint_label = f"提示: {MOVE_NAMES[hint]}"
+                else:
+                    hint_label = "H 提示"
+                hint_text = FONT_SMALL.render(hint_label, True, PRIMARY_COLOR)
+                screen.blit(hint_text, hint_text.get_rect(midright=(SCREEN_WIDTH - 10, INFO_PANEL_HEIGHT // 4)))
+                auto_text = FONT_SMALL.render("P 自动: 开" if autoplay else "P 自动: 关", True, PRIMARY_COLOR)
+                screen.blit(auto_text, auto_text.get_rect(midright=(SCREEN_WIDTH - 10, INFO_PANEL_HEIGHT * 0.75)))
+            else:
+                size_text = FONT_SMALL.render(f"{GRID_ROWS} × {GRID_COLUMNS}", True, PRIMARY_COLOR)
+                screen.blit(size_text, size_text.get_rect(midright=(SCREEN_WIDTH - 10, INFO_PANEL_HEIGHT // 4)))
             
             # Optional: Add a small 'New Game' button in header?
             # new_game_button, _ = draw_button(screen, "New", FONT_SMALL, SCREEN_WIDTH - 70, 10, 60, 30, PRIMARY_COLOR, ACCENT_COLOR, BUTTON_TEXT_COLOR)
             # Check new_game_button click here if added
 
             # Draw Grid and Tiles
-            draw_grid_and_tiles(grid)
+            draw_grid_and_tiles(board.grid)
 
             # --- Game Over Handling ---
             if game_over:
-                action = game_over_screen(current_score, high_score, grid)
+                action = game_over_screen(board, high_score)
                 if action == "restart":
                     # 直接重置游戏状态并开始新游戏
-                    grid = [[0] * GRID_COLUMNS for _ in range(GRID_ROWS)]
-                    add_new_tile(grid)
-                    add_new_tile(grid)
-                    current_score = 0
+                    board = new_board()
                     game_over = False
+                    hint = None
+                    packed = None
                     continue # 继续游戏循环
+                if action == "menu":
+                    running_game = False # 回到主菜单选择棋盘大小
+                    continue
 
             pygame.display.flip()
             clock.tick(60)
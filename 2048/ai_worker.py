@@ -0,0 +1,57 @@
+import queue
+import threading
+from collections import namedtuple
+
+# What the worker posts back: the board it was asked about, the index into MOVES (None: no move) and SearchStats
+Advice = namedtuple('Advice', 'board move stats')
+
+
+class AIWorker:
+    """
+    Runs an ExpectimaxAI on a background thread so the pygame loop keeps drawing while it thinks.
+
+    The UI thread calls request(board) and later poll(), which returns the finished Advice
+    or None and never waits. Each Advice names the board it is for, so the caller can drop
+    advice for a board that has changed since (e.g. the player moved by hand meanwhile).
+    """
+
+    def __init__(self, ai):
+        self._ai = ai
+        self._requests = queue.Queue()
+        self._results = queue.Queue()
+        self.thinking = False
+        self._pending = 0  # Requests without an Advice yet
+        self._thread = threading.Thread(target=self._run, name='2048-ai', daemon=True)
+        self._thread.start()
+
+    # --- UI thread API ---
+    def request(self, board):
+        """Starts choosing a move for the bitboard 'board'; collect it later with poll()."""
+        self.thinking = True
+        self._pending += 1
+        self._requests.put(board)
+
+    def poll(self):
+        """The latest finished Advice, or None. Never blocks."""
+        advice = None
+        while True:
+            try:
+                advice = self._results.get_nowait()
+            except queue.Empty:
+                break
+            self._pending -= 1
+        self.thinking = self._pending > 0
+        return advice
+
+    def close(self):
+        self._requests.put(None)
+        self._thread.join(timeout=2)
+
+    # --- Worker thread ---
+    def _run(self):
+        while True:
+            board = self._requests.get()
+            if board is None:
+                return
+            move = self._ai.best_move(board)
+            self._results.put(Advice(board, move, self._ai.stats))
@@ -0,0 +1,138 @@
+import numpy as np
+
+import bitboard
+
+# The move tables of bitboard.py as arrays, indexed by a packed row (leftmost cell in the low 4 bits)
+_ROW_LEFT = np.frombuffer(bitboard.ROW_LEFT, dtype=np.uint16)
+_ROW_RIGHT = np.frombuffer(bitboard.ROW_RIGHT, dtype=np.uint16)
+_ROW_SCORE = np.frombuffer(bitboard.ROW_SCORE, dtype=np.uint32).astype(np.int64)
+_SHIFTS = np.array([0, 4, 8, 12], dtype=np.uint16)
+
+# In bitboard.MOVES order: up, down, left, right
+UP, DOWN, LEFT, RIGHT = range(4)
+
+
+def new_boards(n, rng):
+    """'n' games as an (n, 4, 4) uint8 array of tile exponents, each with its two starting tiles."""
+    boards = np.zeros((n, 4, 4), dtype=np.uint8)
+    spawn(boards, rng)
+    spawn(boards, rng)
+    return boards
+
+
+def _pack(rows):
+    """Rows (..., 4) of exponents as the 16-bit indices of the move tables."""
+    return (rows.astype(np.uint16) << _SHIFTS).sum(axis=-1, dtype=np.uint16)
+
+
+def _unpack(packed):
+    return ((packed[..., None] >> _SHIFTS) & 0xF).astype(np.uint8)
+
+
+def _slide(rows, table):
+    """Rows (..., 4) of exponents moved by a row table: (moved rows, points of each board)."""
+    packed = _pack(rows)
+    return _unpack(table[packed]), _ROW_SCORE[packed].sum(axis=-1)
+
+
+def move_all(boards):
+    """
+    Every move on every board at once: (moved, points, changed) with moved (4, n, 4, 4)
+    and points and changed (4, n), in MOVES order. Up and down slide the columns, which
+    are the rows of the transposed view, so nothing is copied to turn the boards.
+    """
+    columns = boards.transpose(0, 2, 1)
+    moved = np.empty((4,) + boards.shape, dtype=np.uint8)
+    points = np.empty((4, len(boards)), dtype=np.int64)
+    for move, rows, table in ((UP, columns, _ROW_LEFT), (DOWN, columns, _ROW_RIGHT),
+                              (LEFT, boards, _ROW_LEFT), (RIGHT, boards, _ROW_RIGHT)):
+        result, points[move] = _slide(rows, table)
+        moved[move] = result.transpose(0, 2, 1) if rows is columns else result
+    changed = (moved != boards).any(axis=(2, 3))
+    return moved, points, changed
+
+
+def apply_moves(boards, moves):
+    """
+    Plays moves[i] on boards[i] for every board: (new boards, points, changed). Each
+    board is moved once, as rows or as the columns of the transposed view.
+    """
+    vertical = moves <= DOWN
+    packed = _pack(np.where(vertical[:, None, None], boards.transpose(0, 2, 1), boards))
+    # A row's merges earn the same either way, so only the moved row depends on the direction
+    reverse = (moves == DOWN) | (moves == RIGHT)
+    result = _unpack(np.where(reverse[:, None], _ROW_RIGHT[packed], _ROW_LEFT[packed]))
+    points = _ROW_SCORE[packed].sum(axis=1)
+    result = np.where(vertical[:, None, None], result.transpose(0, 2, 1), result)
+    changed = (result != boards).any(axis=(1, 2))
+    return result, points, changed
+
+
+def spawn(boards, rng, mask=None):
+    """
+    Adds a tile like add_new_tile, in place, to every board (or those in 'mask') that has
+    an empty cell: a 2 or a 4 with equal odds on a uniformly random empty cell.
+    """
+    flat = boards.reshape(len(boards), -1)
+    # Random keys for the empty cells, -1 for the others: the largest key is a uniform choice
+    keys = np.where(flat == 0, rng.random(flat.shape), -1.0)
+    cells = keys.argmax(axis=1)
+    targets = keys[np.arange(len(boards)), cells] >= 0
+    if mask is not None:
+        targets &= mask
+    rows = np.nonzero(targets)[0]
+    flat[rows, cells[rows]] = rng.integers(1, 3, len(rows), dtype=np.uint8)
+
+
+def check_lose(boards):
+    """Per board: no empty cell and no two equal neighbours, so no move changes it."""
+    return ~((boards == 0).any(axis=(1, 2))
+             | (boards[:, :, 1:] == boards[:, :, :-1]).any(axis=(1, 2))
+             | (boards[:, 1:, :] == boards[:, :-1, :]).any(axis=(1, 2)))
+
+
+def random_policy(boards, moved, points, changed, rng):
+    """A uniformly random move among those that change the board."""
+    keys = np.where(changed, rng.random(changed.shape), -1.0)
+    return keys.argmax(axis=0)
+
+
+def greedy_policy(boards, moved, points, changed, rng):
+    """The move that earns the most points now, ties broken at random."""
+    keys = np.where(changed, points + rng.random(changed.shape), -1.0)
+    return keys.argmax(axis=0)
+
+
+POLICIES = {'random': random_policy, 'greedy': greedy_policy}
+
+
+def play(n, policy, rng, max_moves=None):
+    """
+    Plays 'n' games to the end with 'policy' (see POLICIES), all of them a move at a time;
+    finished games drop out of the batch. Returns (scores, moves, final boards) per game.
+    """
+    boards = new_boards(n, rng)
+    final = boards.copy()
+    scores = np.zeros(n, dtype=np.int64)
+    moves = np.zeros(n, dtype=np.int64)
+    alive = np.arange(n)  # Indices of the games still being played
+    turn = 0
+    while len(alive) and (max_moves is None or turn < max_moves):
+        moved, points, changed = move_all(boards)
+        playable = changed.any(axis=0)
+        if not playable.all():
+            # Lost games leave the batch with their final board
+            final[alive[~playable]] = boards[~playable]
+            alive, boards = alive[playable], boards[playable]
+            moved, points, changed = moved[:, playable], points[:, playable], changed[:, playable]
+            if not len(alive):
+                break
+        choice = policy(boards, moved, points, changed, rng)
+        index = np.arange(len(alive))
+        boards = moved[choice, index]
+        scores[alive] += points[choice, index]
+        moves[alive] += 1
+        spawn(boards, rng)
+        turn += 1
+    final[alive] = boards
+    return scores, moves, final
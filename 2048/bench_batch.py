@@ -0,0 +1,69 @@
+"""
+Benchmark: whole 2048 games per second with the NumPy batch simulator (batch.py).
+
+Plays N games at once with each policy for every N in --sizes, and the same number of
+games one at a time on bitboards (bitboard.py) for comparison, and reports games and
+moves per second, the mean score and how often each largest tile was reached.
+
+Usage: python bench_batch.py [--sizes 1,1000,100000] [--policy random greedy] [--seed 1]
+"""
+import argparse
+import random
+import time
+
+import numpy as np
+
+import bitboard
+import batch
+
+
+def play_one(policy, rng):
+    """One game on a bitboard with a policy like batch.POLICIES; returns its move count."""
+    board = 0
+    for _ in range(2):
+        board = bitboard.with_tile(board, rng.choice(bitboard.empty_cells(board)), rng.randint(1, 2))
+    moves = 0
+    while True:
+        results = [move(board) for move in bitboard.MOVES]
+        playable = [(points, i) for i, (moved, points) in enumerate(results) if moved != board]
+        if not playable:
+            return moves
+        if policy == 'greedy':
+            best = max(points for points, _ in playable)
+            playable = [entry for entry in playable if entry[0] == best]
+        board = results[rng.choice(playable)[1]][0]
+        board = bitboard.with_tile(board, rng.choice(bitboard.empty_cells(board)), rng.randint(1, 2))
+        moves += 1
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--sizes', default='1,1000,100000', help='batch sizes, comma separated')
+    parser.add_argument('--policy', nargs='+', default=['random', 'greedy'], choices=sorted(batch.POLICIES))
+    parser.add_argument('--seed', type=int, default=1)
+    parser.add_argument('--scalar-games', type=int, default=1000, help='games for the one-at-a-time comparison')
+    args = parser.parse_args()
+    sizes = [int(size) for size in args.sizes.split(',')]
+
+    for policy in args.policy:
+        print(f'{policy} policy')
+        rng = random.Random(args.seed)
+        start = time.perf_counter()
+        moves = sum(play_one(policy, rng) for _ in range(args.scalar_games))
+        elapsed = time.perf_counter() - start
+        print(f'  one at a time (bitboard): {args.scalar_games / elapsed:>10,.0f} games/s, '
+              f'{moves / elapsed:>12,.0f} moves/s')
+        for n in sizes:
+            rng = np.random.default_rng(args.seed)
+            start = time.perf_counter()
+            scores, moves, final = batch.play(n, batch.POLICIES[policy], rng)
+            elapsed = time.perf_counter() - start
+            assert batch.check_lose(final).all()
+            tiles = np.bincount(final.max(axis=(1, 2)), minlength=16)
+            spread = ', '.join(f'{1 << exponent}: {count / n:.1%}' for exponent, count in enumerate(tiles) if count)
+            print(f'  batch N={n:<8} {n / elapsed:>10,.0f} games/s, {moves.sum() / elapsed:>12,.0f} moves/s, '
+                  f'mean score {scores.mean():,.0f}, max tile {spread}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,85 @@
+"""
+Benchmark: 2048 moves on lists (the original 2048.py code, reference_moves.py) vs the packed bitboard (bitboard.py).
+
+Checks that both give the same boards on random positions, then times all four moves on
+each, and the move tables' build against loading them from disk. Positions with 16384
+and 32768 tiles check the guard in front of the bitboard: two 32768s merge into 65536
+on lists but not packed, so every board bitboard.fits accepts must still move the same.
+
+Usage: python bench_bitboard.py [--boards 20000] [--seed 1]
+"""
+import argparse
+import random
+import time
+
+import bitboard
+from reference_moves import list_move
+
+
+def random_grid(rng, tiles=(0, 0, 0, 2, 2, 4, 8, 16, 32, 64, 128, 1024)):
+    return [[rng.choice(tiles) for _ in range(4)] for _ in range(4)]
+
+
+LARGE_TILES = (0, 0, 2, 4, 8192, 16384, 16384, 32768, 32768)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--boards', type=int, default=20000)
+    parser.add_argument('--seed', type=int, default=1)
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    bitboard.build_tables()
+    build_s = time.perf_counter() - start
+    start = time.perf_counter()
+    bitboard.load_tables()
+    load_s = time.perf_counter() - start
+    print(f'move tables: build {build_s * 1000:.0f} ms, load from {bitboard.TABLE_FILE} {load_s * 1000:.1f} ms')
+
+    rng = random.Random(args.seed)
+    grids = [random_grid(rng) for _ in range(args.boards)]
+    boards = [bitboard.from_grid(grid) for grid in grids]
+    mismatches = 0
+    for grid, board in zip(grids, boards):
+        for direction, move in enumerate(bitboard.MOVES):
+            mismatches += bitboard.to_grid(move(board)[0]) != list_move(grid, direction)[0]
+    print(f'{args.boards} boards x 4 moves: {mismatches} mismatches')
+
+    # Large tiles: the guard must send every board the bitboard gets wrong to the list moves
+    unguarded = guarded = rejected = 0
+    for _ in range(args.boards // 10):
+        grid = random_grid(rng, LARGE_TILES)
+        board = bitboard.from_grid(grid)
+        wrong = any(bitboard.to_grid(move(board)[0]) != list_move(grid, direction)[0]
+                    for direction, move in enumerate(bitboard.MOVES))
+        unguarded += wrong
+        if bitboard.fits(grid):
+            guarded += wrong
+        else:
+            rejected += 1
+    try:
+        bitboard.from_grid([[65536, 0, 0, 0]] + [[0] * 4] * 3)
+        overflow = 'packed'
+    except ValueError:
+        overflow = 'rejected'
+    print(f'{args.boards // 10} boards with large tiles: {unguarded} differ packed, {rejected} left to the lists '
+          f'by bitboard.fits, {guarded} mismatches through the guard; a 65536 tile is {overflow}')
+
+    start = time.perf_counter()
+    for grid in grids:
+        for direction in range(4):
+            list_move(grid, direction)
+    list_s = time.perf_counter() - start
+    start = time.perf_counter()
+    for board in boards:
+        for move in bitboard.MOVES:
+            move(board)
+    bit_s = time.perf_counter() - start
+    moves = 4 * args.boards
+    print(f'lists:    {moves / list_s:>10,.0f} moves/s ({list_s / moves * 1e6:.2f} us/move)')
+    print(f'bitboard: {moves / bit_s:>10,.0f} moves/s ({bit_s / moves * 1e6:.2f} us/move), {list_s / bit_s:.1f}x')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,87 @@
+"""
+Benchmark: the cost of one 2048 turn with Board2048 (board.py) vs the old full scans.
+
+A turn is a move, a new tile and the end-of-turn checks. The old loop summed every cell
+for the score, rebuilt the empty-cell list to place the tile and scanned the grid for a
+win and a loss; Board2048 keeps all of these up to date as cells change. Both play the
+same random games; the incremental state is checked against full scans as they go.
+
+Usage: python bench_board.py [--games 200] [--seed 1]
+"""
+import argparse
+import random
+import time
+
+from board import Board2048
+
+
+def full_scan(board):
+    """(empty cells, max tile, any equal neighbours) of a board, from scratch."""
+    grid = board.grid
+    rows, columns = board.rows, board.columns
+    empty = {(r, c) for r in range(rows) for c in range(columns) if not grid[r][c]}
+    pairs = any(grid[r][c] and ((r + 1 < rows and grid[r][c] == grid[r + 1][c])
+                                or (c + 1 < columns and grid[r][c] == grid[r][c + 1]))
+                for r in range(rows) for c in range(columns))
+    return empty, max(max(row) for row in grid), pairs
+
+
+def old_turn_checks(grid, rng):
+    """What the old loop did around each move: add_new_tile, calculate_score, check_win, check_lose."""
+    empty_cells = [(i, j) for i in range(len(grid)) for j in range(len(grid[0])) if grid[i][j] == 0]
+    if empty_cells:
+        rng.choice(empty_cells)
+    sum(sum(row) for row in grid)
+    any(2048 in row for row in grid)
+    any(0 in row for row in grid) or any(
+        (i < len(grid) - 1 and grid[i][j] == grid[i + 1][j]) or (j < len(grid[0]) - 1 and grid[i][j] == grid[i][j + 1])
+        for i in range(len(grid)) for j in range(len(grid[0])))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--games', type=int, default=200)
+    parser.add_argument('--seed', type=int, default=1)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    mismatches = turns = 0
+    for _ in range(args.games):
+        board = Board2048()
+        board.spawn(rng)
+        board.spawn(rng)
+        while not board.is_over():
+            if board.move(rng.randrange(4)):
+                board.spawn(rng)
+            turns += 1
+            empty, max_tile, pairs = full_scan(board)
+            mismatches += (set(board.empty_cells()) != empty or board.max_tile != max_tile
+                           or board.can_merge() != pairs)
+    print(f'{args.games} games, {turns} turns: {mismatches} mismatches against full scans')
+
+    # Timing: the same games again, checks only
+    timings = {}
+    for name in ('full scans', 'Board2048'):
+        rng = random.Random(args.seed)
+        start = time.perf_counter()
+        for _ in range(args.games):
+            board = Board2048()
+            board.spawn(rng)
+            board.spawn(rng)
+            while True:
+                if board.move(rng.randrange(4)):
+                    if name == 'full scans':
+                        old_turn_checks(board.grid, rng)
+                    board.spawn(rng)
+                    board.has_won()
+                if board.is_over():
+                    break
+        timings[name] = (time.perf_counter() - start) / turns * 1e6
+    for name, us in timings.items():
+        print(f'{name:<12} {us:6.2f} us per turn')
+    print(f'the scans added {timings["full scans"] - timings["Board2048"]:.2f} us per turn '
+          f'on top of the incremental bookkeeping')
+
+
+if __name__ == '__main__':
+    main()
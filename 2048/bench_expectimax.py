@@ -0,0 +1,78 @@
+"""
+Benchmark: the expectimax 2048 player (expectimax.py) playing whole games headless.
+
+Plays --games games on bitboards with add_new_tile's spawns (a 2 or a 4, 50/50, on a
+random empty cell) and reports moves per second, the search cost per move and the
+distribution of the largest tile reached.
+
+Usage: python bench_expectimax.py [--games 3] [--seed 1] [--depth D] [--max-moves N]
+"""
+import argparse
+import random
+import time
+from collections import Counter
+
+import bitboard
+from expectimax import ExpectimaxAI, SPAWNS
+
+
+def spawn(board, rng):
+    """A new tile on a random empty cell, as add_new_tile places it."""
+    cells = bitboard.empty_cells(board)
+    exponent = rng.choices([exponent for exponent, _ in SPAWNS], [odds for _, odds in SPAWNS])[0]
+    return bitboard.with_tile(board, rng.choice(cells), exponent)
+
+
+def play(ai, rng, max_moves=None):
+    """One game; returns (moves played, score, largest exponent, nodes, cache hits, search seconds)."""
+    board = spawn(spawn(0, rng), rng)
+    moves = score = nodes = hits = 0
+    search_s = 0.0
+    while max_moves is None or moves < max_moves:
+        start = time.perf_counter()
+        move = ai.best_move(board)
+        search_s += time.perf_counter() - start
+        nodes += ai.stats.nodes
+        hits += ai.stats.cache_hits
+        if move is None:
+            break
+        board, points = bitboard.MOVES[move](board)
+        score += points
+        board = spawn(board, rng)
+        moves += 1
+    return moves, score, bitboard.max_exponent(board), nodes, hits, search_s
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--games', type=int, default=3)
+    parser.add_argument('--seed', type=int, default=1)
+    parser.add_argument('--depth', type=int, help='fixed search depth (default: by empty cells)')
+    parser.add_argument('--max-moves', type=int, help='stop each game after this many moves')
+    args = parser.parse_args()
+
+    ai = ExpectimaxAI(args.depth)
+    rng = random.Random(args.seed)
+    tiles = Counter()
+    total_moves = total_nodes = total_hits = 0
+    total_s = total_search_s = 0.0
+    for game in range(args.games):
+        start = time.perf_counter()
+        moves, score, exponent, nodes, hits, search_s = play(ai, rng, args.max_moves)
+        elapsed = time.perf_counter() - start
+        tiles[1 << exponent] += 1
+        total_moves += moves
+        total_nodes += nodes
+        total_hits += hits
+        total_s += elapsed
+        total_search_s += search_s
+        print(f'game {game + 1}: {moves} moves, score {score}, max tile {1 << exponent}, '
+              f'{moves / elapsed:.1f} moves/s')
+    print(f'{total_moves} moves in {total_s:.1f} s: {total_moves / total_s:.1f} moves/s, '
+          f'{total_search_s / max(1, total_moves) * 1000:.1f} ms and {total_nodes / max(1, total_moves):.0f} nodes '
+          f'per move, cache hits {total_hits / max(1, total_nodes):.1%} of nodes')
+    print('max tile: ' + ', '.join(f'{tile}: {count}/{args.games}' for tile, count in sorted(tiles.items())))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,104 @@
+"""
+Benchmark: the cost of a 2048 move against the grid size, generic kernel vs the old list moves.
+
+The old list moves (reference_moves.py) turned the grid so every direction became a left
+move (transpose and/or reverse, move_row_left on each row, and back again), copying the
+grid up to four times per move. The kernel (board.move_cells) walks each shape's
+precomputed lines over a flat list of cells instead: each row or column, either way round,
+is read as a tuple, slid (lines up to board.CACHED_LINE_LENGTH long through the slide
+cache) and written back only if it changed. Board2048.move also keeps its bookkeeping up to
+date cell by cell. All three move the same random half-full boards, are checked against
+each other, and are timed per move and per cell; the slide cache is emptied before every
+timed run, so the boards start from a cold cache as in a new game.
+
+Usage: python bench_sizes.py [--sizes 3x3,4x4,4x8,6x6,8x8,12x12,16x16] [--boards 200] [--seed 1] [--repeat 5]
+"""
+import argparse
+import random
+import time
+
+from board import Board2048, geometry, move_cells, _slides
+from reference_moves import list_move
+
+MOVES_PER_BOARD = 8
+
+
+def random_board(rows, columns, rng):
+    """A Board2048 with tiles from 2 to 1024 on a random half of its cells."""
+    cells = [0] * (rows * columns)
+    for cell in rng.sample(range(rows * columns), rows * columns // 2):
+        cells[cell] = 2 ** rng.randint(1, 10)
+    return Board2048.from_grid([cells[r * columns:(r + 1) * columns] for r in range(rows)])
+
+
+def best_time(run, prepare, repeat):
+    """The fastest of 'repeat' runs of run(prepare()), in seconds; prepare is not timed."""
+    times = []
+    for _ in range(repeat):
+        state = prepare()
+        start = time.perf_counter()
+        run(state)
+        times.append(time.perf_counter() - start)
+    return min(times)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--sizes', default='3x3,4x4,4x8,6x6,8x8,12x12,16x16', help='ROWSxCOLUMNS, comma separated')
+    parser.add_argument('--boards', type=int, default=200, help='random boards per size')
+    parser.add_argument('--seed', type=int, default=1)
+    parser.add_argument('--repeat', type=int, default=5, help='timed runs per size, the fastest is shown')
+    args = parser.parse_args()
+    sizes = [tuple(int(n) for n in size.split('x')) for size in args.sizes.split(',')]
+
+    print(f'{"size":>7} {"old us/move":>12} {"kernel us/move":>15} {"Board2048 us/move":>18} '
+          f'{"old ns/cell":>12} {"Board2048 ns/cell":>18} {"old/kernel":>10} {"old/Board2048":>13}')
+    for rows, columns in sizes:
+        rng = random.Random(args.seed)
+        boards = [random_board(rows, columns, rng) for _ in range(args.boards)]
+        shape = geometry(rows, columns)
+        mismatches = 0
+        for board in boards:
+            for direction in range(4):
+                cells, _, _ = move_cells(board.cells, shape, direction)
+                grid, _ = list_move(board.grid, direction)
+                mismatches += cells != [value for row in grid for value in row]
+        assert not mismatches, f'{rows}x{columns}: {mismatches} moves differ'
+
+        # Each board then plays the same directions, one after another, all three ways
+        directions = [rng.randrange(4) for _ in range(MOVES_PER_BOARD)]
+        moves = len(boards) * MOVES_PER_BOARD
+
+        def old_moves(grids):
+            for grid in grids:
+                for direction in directions:
+                    grid, _ = list_move(grid, direction)
+
+        def kernel_moves(cell_lists):
+            for cells in cell_lists:
+                for direction in directions:
+                    cells, _, _ = move_cells(cells, shape, direction)
+
+        def board_moves(copies):
+            # Board2048.move also keeps the score, empty cells and mergeable pairs up to date
+            for board in copies:
+                for direction in directions:
+                    board.move(direction)
+
+        def cold(copies):
+            _slides.clear()
+            return copies
+
+        old_us = best_time(old_moves, lambda: [board.grid for board in boards], args.repeat) / moves * 1e6
+        kernel_us = best_time(kernel_moves, lambda: cold([board.cells for board in boards]), args.repeat) / moves * 1e6
+        board_us = best_time(board_moves, lambda: cold([Board2048.from_grid(board.grid) for board in boards]),
+                             args.repeat) / moves * 1e6
+
+        size = rows * columns
+        print(f'{rows:>3}x{columns:<3} {old_us:12.2f} {kernel_us:15.2f} {board_us:18.2f} '
+              f'{old_us / size * 1000:12.1f} {board_us / size * 1000:18.1f} {old_us / kernel_us:9.2f}x '
+              f'{old_us / board_us:12.2f}x')
+
+
+if __name__ == '__main__':
+    main()
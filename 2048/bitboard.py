@@ -0,0 +1,183 @@
+import os
+from array import array
+
+# A 4x4 board packed into one int: 16 four-bit cells, cell (row, col) at bits 4 * (4 * row + col),
+# so row r is the 16 bits at 16 * r with its leftmost cell lowest. A cell holds the tile's
+# exponent (1 for 2, 11 for 2048, 0 for empty); 15 (32768) is the largest tile it can hold.
+ROWS = COLUMNS = 4
+CELLS = ROWS * COLUMNS
+ROW_MASK = 0xFFFF
+MAX_EXPONENT = 15
+# The bitboard moves a board exactly like the list game only while every tile is below 32768:
+# two 32768s would merge into 65536, whose exponent 16 overflows its cell, so they never merge here
+EXACT_TILE_LIMIT = 1 << MAX_EXPONENT
+
+TABLE_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'move_tables.bin')
+_TABLE_VERSION = 1
+_TABLE_SIZE = 1 << 16
+
+
+def _slide_left(cells):
+    """One row moved left by the game's rules: (new cells, points). Two 32768s do not merge."""
+    tiles = [cell for cell in cells if cell]
+    merged = []
+    points = 0
+    i = 0
+    while i < len(tiles):
+        if i + 1 < len(tiles) and tiles[i] == tiles[i + 1] and tiles[i] < MAX_EXPONENT:
+            merged.append(tiles[i] + 1)
+            points += 1 << (tiles[i] + 1)
+            i += 2
+        else:
+            merged.append(tiles[i])
+            i += 1
+    return merged + [0] * (len(cells) - len(merged)), points
+
+
+def _pack_row(cells):
+    return cells[0] | cells[1] << 4 | cells[2] << 8 | cells[3] << 12
+
+
+def build_tables():
+    """
+    Move tables indexed by a packed 16-bit row: (row_left, row_right, row_score), the row
+    after moving it left and right, and the points its merges earn. A row's merges earn the
+    same moving either way (runs of equal tiles pair up the same), so one score table serves both.
+    """
+    row_left = array('H', bytes(2 * _TABLE_SIZE))
+    row_right = array('H', bytes(2 * _TABLE_SIZE))
+    row_score = array('I', bytes(4 * _TABLE_SIZE))
+    for row in range(_TABLE_SIZE):
+        cells = [(row >> (4 * i)) & 0xF for i in range(COLUMNS)]
+        left, points = _slide_left(cells)
+        right, _ = _slide_left(cells[::-1])
+        row_left[row] = _pack_row(left)
+        row_right[row] = _pack_row(right[::-1])
+        row_score[row] = points
+    return row_left, row_right, row_score
+
+
+def load_cached(path, version, typecodes, build):
+    """
+    Row-indexed tables of 65536 entries, one per typecode: read from 'path' if it holds
+    'version', otherwise made by build() and saved there for next time.
+    """
+    try:
+        with open(path, 'rb') as f:
+            header = array('I')
+            header.fromfile(f, 1)
+            if header[0] == version:
+                tables = []
+                for typecode in typecodes:
+                    table = array(typecode)
+                    table.fromfile(f, _TABLE_SIZE)
+                    tables.append(table)
+                return tuple(tables)
+    except (OSError, EOFError):
+        pass
+    tables = build()
+    try:
+        with open(path, 'wb') as f:
+            array('I', [version]).tofile(f)
+            for table in tables:
+                table.tofile(f)
+    except OSError:
+        pass  # Read-only install: just rebuild next time
+    return tables
+
+
+def load_tables(path=TABLE_FILE):
+    """Reads the move tables from 'path', rebuilding (and re-saving) them if it is missing or stale."""
+    return load_cached(path, _TABLE_VERSION, 'HHI', build_tables)
+
+
+ROW_LEFT, ROW_RIGHT, ROW_SCORE = load_tables()
+
+
+def transpose(board):
+    """Swaps rows and columns by moving 4-bit cells in masked groups: 2x2 blocks, then the 2x2 cells in them."""
+    a1 = board & 0xF0F00F0FF0F00F0F
+    a2 = board & 0x0000F0F00000F0F0
+    a3 = board & 0x0F0F00000F0F0000
+    a = a1 | (a2 << 12) | (a3 >> 12)
+    b1 = a & 0xFF00FF0000FF00FF
+    b2 = a & 0x00FF00FF00000000
+    b3 = a & 0x00000000FF00FF00
+    return b1 | (b2 >> 24) | (b3 << 24)
+
+
+def _move_rows(board, table):
+    row0 = board & ROW_MASK
+    row1 = (board >> 16) & ROW_MASK
+    row2 = (board >> 32) & ROW_MASK
+    row3 = board >> 48
+    moved = table[row0] | table[row1] << 16 | table[row2] << 32 | table[row3] << 48
+    return moved, ROW_SCORE[row0] + ROW_SCORE[row1] + ROW_SCORE[row2] + ROW_SCORE[row3]
+
+
+def move_left(board):
+    """(new board, points earned); the move changed nothing if the board is unchanged."""
+    return _move_rows(board, ROW_LEFT)
+
+
+def move_right(board):
+    return _move_rows(board, ROW_RIGHT)
+
+
+def move_up(board):
+    moved, points = _move_rows(transpose(board), ROW_LEFT)
+    return transpose(moved), points
+
+
+def move_down(board):
+    moved, points = _move_rows(transpose(board), ROW_RIGHT)
+    return transpose(moved), points
+
+
+# In the order 2048.py's keys list them
+MOVES = (move_up, move_down, move_left, move_right)
+
+
+def fits(grid):
+    """Whether a 4x4 list grid moves exactly the same packed: every tile below EXACT_TILE_LIMIT."""
+    return all(value < EXACT_TILE_LIMIT for row in grid for value in row)
+
+
+def from_grid(grid):
+    """Packs a 4x4 list grid of tile values (0 for empty)."""
+    board = 0
+    for r, row in enumerate(grid):
+        for c, value in enumerate(row):
+            if value:
+                exponent = value.bit_length() - 1
+                if exponent > MAX_EXPONENT:
+                    raise ValueError(f"tile {value} does not fit in a 4-bit cell")
+                board |= exponent << (4 * (COLUMNS * r + c))
+    return board
+
+
+def to_grid(board):
+    """Unpacks a board into a 4x4 list grid of tile values."""
+    return [[(1 << e) if (e := (board >> (4 * (COLUMNS * r + c))) & 0xF) else 0 for c in range(COLUMNS)]
+            for r in range(ROWS)]
+
+
+def empty_cells(board):
+    """Cell indices (4 * row + col) of the empty cells."""
+    return [i for i in range(CELLS) if not (board >> (4 * i)) & 0xF]
+
+
+def count_empty(board):
+    """Number of empty cells, by folding each cell's four bits into one and counting."""
+    occupied = board | board >> 1
+    occupied = (occupied | occupied >> 2) & 0x1111111111111111
+    return CELLS - bin(occupied).count('1')
+
+
+def max_exponent(board):
+    return max((board >> (4 * i)) & 0xF for i in range(CELLS))
+
+
+def with_tile(board, index, exponent):
+    """'board' with a tile of 2 ** exponent on the empty cell 'index'."""
+    return board | exponent << (4 * index)
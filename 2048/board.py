@@ -0,0 +1,240 @@
+import random
+from collections import namedtuple
+from operator import eq, itemgetter
+
+# Directions in bitboard.MOVES order
+UP, DOWN, LEFT, RIGHT = range(4)
+
+MIN_SIZE = 3
+MAX_SIZE = 16
+
+# Lines up to this long keep their slides (cached_slide), up to SLIDE_CACHE_SIZE of them
+CACHED_LINE_LENGTH = 6
+SLIDE_CACHE_SIZE = 1 << 16
+
+# For each direction, each line of the board in the order tiles slide towards (the first
+# cell is where they pile up): lines[direction] as the flat cell indices (row * columns + col),
+# readers[direction] as an itemgetter returning the line's values as a tuple, and
+# slices[direction] as the slice of the flat cell list with the same cells, so a line is read
+# with one call and written back with one slice assignment whichever way it runs. Lines are
+# also numbered, rows 0 .. rows - 1 then columns: line_ids[direction] gives each line's number
+# and cell_lines[cell] the (row, column) line numbers of a cell. neighbours[cell]: (cell next
+# to it, number of the line the two share).
+Geometry = namedtuple('Geometry', 'lines readers slices line_ids cell_lines neighbours')
+
+_geometry_cache = {}
+_slides = {}  # Line values -> slide(values), for lines up to CACHED_LINE_LENGTH long
+
+
+def _line_slice(line):
+    step = line[1] - line[0]
+    stop = line[-1] + step
+    return slice(line[0], stop if stop >= 0 else None, step)
+
+
+def geometry(rows, columns):
+    """
+    The Geometry of a board shape. Rows are contiguous runs of the cell list and columns
+    runs with a stride of 'columns', so any shape's four moves are the same walk over
+    precomputed slices, with no transposing or reversing of the grid. Shared by every
+    board of that shape.
+    """
+    key = (rows, columns)
+    if key not in _geometry_cache:
+        row_lines = [range(r * columns, (r + 1) * columns) for r in range(rows)]
+        column_lines = [range(c, rows * columns, columns) for c in range(columns)]
+        lines = (column_lines, [line[::-1] for line in column_lines],
+                 row_lines, [line[::-1] for line in row_lines])
+        readers = tuple([itemgetter(*line) for line in direction] for direction in lines)
+        slices = tuple([_line_slice(line) for line in direction] for direction in lines)
+        column_ids = range(rows, rows + columns)
+        line_ids = (column_ids, column_ids, range(rows), range(rows))
+        cell_lines = [(r, rows + c) for r in range(rows) for c in range(columns)]
+        neighbours = [[((r + dr) * columns + c + dc, rows + c if dr else r)
+                       for dr, dc in ((-1, 0), (1, 0), (0, -1), (0, 1))
+                       if 0 <= r + dr < rows and 0 <= c + dc < columns]
+                      for r in range(rows) for c in range(columns)]
+        _geometry_cache[key] = Geometry(lines, readers, slices, line_ids, cell_lines, neighbours)
+    return _geometry_cache[key]
+
+
+def slide(values):
+    """
+    One line (a tuple) moved towards its start by the game's rules: (new values, points),
+    or None when the move leaves it as it is.
+    """
+    tiles = list(filter(None, values))
+    # Only a line with two equal tiles next to each other needs the merge walk
+    if any(map(eq, tiles, tiles[1:])):
+        merged = []
+        points = 0
+        i = 0
+        while i < len(tiles):
+            if i + 1 < len(tiles) and tiles[i] == tiles[i + 1]:
+                merged.append(tiles[i] * 2)
+                points += tiles[i] * 2
+                i += 2
+            else:
+                merged.append(tiles[i])
+                i += 1
+        return tuple(merged) + (0,) * (len(values) - len(merged)), points
+    if not any(values[len(tiles):]):
+        return None  # Already packed at the start, with nothing to merge
+    return tuple(tiles) + (0,) * (len(values) - len(tiles)), 0
+
+
+def cached_slide(values):
+    """
+    slide, looked up by the line's values first. A short line takes few distinct values,
+    so most are found and cost one dict lookup; long lines rarely repeat and go to slide
+    directly. The cache starts over once it holds SLIDE_CACHE_SIZE lines.
+    """
+    try:
+        return _slides[values]
+    except KeyError:
+        if len(_slides) >= SLIDE_CACHE_SIZE:
+            _slides.clear()
+        result = _slides[values] = slide(values)
+        return result
+
+
+def move_cells(cells, shape, direction):
+    """A move on a flat list of tile values with the shape's Geometry: (new cells, points, changed)."""
+    new_cells = list(cells)
+    points = 0
+    changed = False
+    slide_line = cached_slide if len(shape.lines[direction][0]) <= CACHED_LINE_LENGTH else slide
+    for read, line in zip(shape.readers[direction], shape.slices[direction]):
+        result = slide_line(read(cells))
+        if result is not None:
+            new_cells[line] = result[0]
+            points += result[1]
+            changed = True
+    return new_cells, points, changed
+
+
+class Board2048:
+    """
+    A 2048 grid of any shape that keeps its score, empty cells, largest tile and whether
+    any two neighbours could merge up to date as tiles change, so none of them needs a scan.
+
+    Cells are a flat list moved along the shape's precomputed lines (geometry), each one
+    read as a tuple and slid by cached_slide (slide for lines longer than CACHED_LINE_LENGTH).
+    Every cell write goes through _set, which adjusts the counts of equal neighbouring pairs
+    and of empty cells, in total and per row and column, and the empty-cell set (a list
+    plus each cell's position in it, for O(1) random choice and removal). A move skips
+    every line those counts show cannot change (full with no equal neighbours, or empty),
+    and writes, and pays bookkeeping for, only the cells it changes. `score` is the
+    standard 2048 score: the value of every tile made by a merge.
+    """
+
+    __slots__ = ('rows', 'columns', 'cells', 'score', 'max_tile', '_empty', '_empty_index', '_pairs',
+                 '_line_empty', '_line_pairs', '_shape', '_neighbours')
+
+    def __init__(self, rows=4, columns=4):
+        self.rows = rows
+        self.columns = columns
+        self.cells = [0] * (rows * columns)
+        self.score = 0
+        self.max_tile = 0
+        self._empty = list(range(rows * columns))
+        self._empty_index = list(range(rows * columns))  # Position in _empty of each empty cell
+        self._pairs = 0  # Neighbouring cells holding the same tile
+        # Per line (numbered as in Geometry): its empty cells and its neighbouring pairs
+        self._line_empty = [columns] * rows + [rows] * columns
+        self._line_pairs = [0] * (rows + columns)
+        self._shape = geometry(rows, columns)
+        self._neighbours = self._shape.neighbours
+
+    @classmethod
+    def from_grid(cls, grid):
+        """A board holding the tiles of a list of rows, with a score of 0."""
+        board = cls(len(grid), len(grid[0]))
+        for cell, value in enumerate(value for row in grid for value in row):
+            if value:
+                board._set(cell, value)
+        return board
+
+    @property
+    def grid(self):
+        """The tiles as a list of rows (a copy)."""
+        cells, columns = self.cells, self.columns
+        return [cells[r * columns:(r + 1) * columns] for r in range(self.rows)]
+
+    @property
+    def empty_count(self):
+        return len(self._empty)
+
+    def empty_cells(self):
+        """The empty cells as (row, col), in no particular order."""
+        return [divmod(cell, self.columns) for cell in self._empty]
+
+    def can_merge(self):
+        """Whether two neighbouring tiles are equal, i.e. some move merges them."""
+        return self._pairs > 0
+
+    def is_over(self):
+        """No empty cell and nothing to merge: no move changes the board."""
+        return not self._empty and not self._pairs
+
+    def has_won(self, target=2048):
+        return self.max_tile >= target
+
+    def move(self, direction):
+        """Slides and merges the tiles towards UP, DOWN, LEFT or RIGHT; returns whether anything changed."""
+        cells = self.cells
+        changed = False
+        shape = self._shape
+        line_empty, line_pairs = self._line_empty, self._line_pairs
+        length = self.rows if direction < LEFT else self.columns
+        slide_line = cached_slide if length <= CACHED_LINE_LENGTH else slide
+        for line, read, line_id in zip(shape.lines[direction], shape.readers[direction], shape.line_ids[direction]):
+            empty = line_empty[line_id]
+            if empty == length or not (empty or line_pairs[line_id]):
+                continue  # Nothing to slide, or full with nothing to merge
+            values = read(cells)
+            result = slide_line(values)
+            if result is not None:
+                moved, points = result
+                self.score += points
+                for i, old, new in zip(line, values, moved):
+                    if old != new:
+                        self._set(i, new)
+                changed = True
+        return changed
+
+    def spawn(self, rng=random):
+        """Adds a 2 or a 4 (equal odds) on a random empty cell, like add_new_tile; returns (row, col) or None."""
+        if not self._empty:
+            return None
+        cell = rng.choice(self._empty)
+        self._set(cell, rng.choice((2, 4)))
+        return divmod(cell, self.columns)
+
+    def _set(self, cell, value):
+        cells = self.cells
+        old = cells[cell]
+        for neighbour, line in self._neighbours[cell]:
+            other = cells[neighbour]
+            if other:
+                pairs = (other == value) - (other == old)
+                if pairs:
+                    self._pairs += pairs
+                    self._line_pairs[line] += pairs
+        if (not old) != (not value):
+            row, column = self._shape.cell_lines[cell]
+            self._line_empty[row] += -1 if value else 1
+            self._line_empty[column] += -1 if value else 1
+        if not old:
+            # Swap the cell with the last empty one and drop it
+            index = self._empty_index[cell]
+            last = self._empty.pop()
+            if last != cell:
+                self._empty[index] = last
+                self._empty_index[last] = index
+        elif not value:
+            self._empty_index[cell] = len(self._empty)
+            self._empty.append(cell)
+        cells[cell] = value
+        if value > self.max_tile:
+            self.max_tile = value
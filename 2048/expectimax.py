@@ -0,0 +1,157 @@
+import os
+import time
+from array import array
+from collections import namedtuple
+
+import bitboard
+from bitboard import MOVES, transpose, empty_cells, count_empty, load_cached
+
+# What add_new_tile in 2048.py spawns: a 2 or a 4 with equal odds, on a uniformly random empty cell
+SPAWNS = ((1, 0.5), (2, 0.5))  # (exponent, probability)
+
+# Row heuristic weights: a position is worth more with empty cells, tiles ready to merge and
+# rows and columns that rise or fall steadily, and less the more of its value is in big tiles
+LOST_PENALTY = 200000.0  # Base score of any position; a position with no moves scores 0
+EMPTY_WEIGHT = 270.0
+MERGES_WEIGHT = 700.0
+MONOTONICITY_POWER = 4
+MONOTONICITY_WEIGHT = 47.0
+SUM_POWER = 3.5
+SUM_WEIGHT = 11.0
+
+HEURISTIC_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'heuristic_table.bin')
+_HEURISTIC_VERSION = 1  # Bump when the weights change so cached tables are rebuilt
+
+MIN_PROBABILITY = 1e-4  # Chance branches less likely than this are scored by the heuristic
+
+SearchStats = namedtuple('SearchStats', 'depth nodes cache_hits elapsed_ms')
+
+
+def _row_heuristic(cells):
+    empty = cells.count(0)
+    merges = 0
+    previous = 0
+    run = 0
+    for rank in cells:
+        if rank == 0:
+            continue
+        if rank == previous:
+            run += 1
+        elif run > 0:
+            merges += 1 + run
+            run = 0
+        previous = rank
+    if run > 0:
+        merges += 1 + run
+    falling = rising = 0
+    for a, b in zip(cells, cells[1:]):
+        if a > b:
+            falling += a ** MONOTONICITY_POWER - b ** MONOTONICITY_POWER
+        else:
+            rising += b ** MONOTONICITY_POWER - a ** MONOTONICITY_POWER
+    return (LOST_PENALTY + EMPTY_WEIGHT * empty + MERGES_WEIGHT * merges
+            - MONOTONICITY_WEIGHT * min(falling, rising) - SUM_WEIGHT * sum(rank ** SUM_POWER for rank in cells))
+
+
+def build_heuristic():
+    """The heuristic of every packed row (a column scores the same as the row it transposes to)."""
+    table = array('d', bytes(8 << 16))
+    for row in range(1 << 16):
+        table[row] = _row_heuristic([(row >> (4 * i)) & 0xF for i in range(bitboard.COLUMNS)])
+    return (table,)
+
+
+HEURISTIC, = load_cached(HEURISTIC_FILE, _HEURISTIC_VERSION, 'd', build_heuristic)
+
+
+def evaluate(board):
+    """Heuristic value of a board: its rows' and its columns' table entries summed."""
+    h = HEURISTIC
+    columns = transpose(board)
+    return (h[board & 0xFFFF] + h[(board >> 16) & 0xFFFF] + h[(board >> 32) & 0xFFFF] + h[board >> 48]
+            + h[columns & 0xFFFF] + h[(columns >> 16) & 0xFFFF] + h[(columns >> 32) & 0xFFFF] + h[columns >> 48])
+
+
+def search_depth(board):
+    """Moves to look ahead: more as the board fills up, where one mistake can end the game."""
+    empty = count_empty(board)
+    if empty >= 8:
+        return 1
+    if empty >= 4:
+        return 2
+    return 3
+
+
+class ExpectimaxAI:
+    """
+    Picks 2048 moves by expectimax over bitboard.py boards: the player's moves are max
+    nodes, the tile spawns chance nodes weighted like add_new_tile (SPAWNS), and the
+    leaves are scored by the row heuristic. Chance nodes are memoized per search by
+    (board, depth), since different move orders often reach the same board. Branches
+    less likely than `min_probability` are cut off and scored by the heuristic.
+    """
+
+    def __init__(self, depth=None, min_probability=MIN_PROBABILITY):
+        self.depth = depth  # None: search_depth(board)
+        self.min_probability = min_probability
+        self.stats = SearchStats(0, 0, 0, 0.0)
+        self._cache = {}
+        self._nodes = 0
+        self._hits = 0
+
+    def scores(self, board):
+        """Expected heuristic value after each move in MOVES order (None for moves that change nothing)."""
+        start = time.perf_counter()
+        depth = self.depth if self.depth is not None else search_depth(board)
+        self._cache = {}
+        self._nodes = self._hits = 0
+        scores = []
+        for move in MOVES:
+            moved, _ = move(board)
+            scores.append(self._chance(moved, depth, 1.0) if moved != board else None)
+        self._cache = {}
+        self.stats = SearchStats(depth, self._nodes, self._hits, round((time.perf_counter() - start) * 1000, 2))
+        return scores
+
+    def best_move(self, board):
+        """Index into MOVES of the best move, or None if no move changes the board (game over)."""
+        scores = self.scores(board)
+        playable = [i for i, score in enumerate(scores) if score is not None]
+        if not playable:
+            return None
+        return max(playable, key=lambda i: scores[i])
+
+    def _chance(self, board, depth, probability):
+        """Expected value of 'board' before its tile spawns, with 'depth' moves still to search."""
+        self._nodes += 1
+        if depth == 0 or probability < self.min_probability:
+            return evaluate(board)
+        key = (board, depth)
+        cached = self._cache.get(key)
+        if cached is not None:
+            self._hits += 1
+            return cached
+        cells = empty_cells(board)
+        if not cells:
+            return evaluate(board)
+        probability /= len(cells)
+        total = 0.0
+        for index in cells:
+            shift = 4 * index
+            for exponent, odds in SPAWNS:
+                total += odds * self._max(board | exponent << shift, depth - 1, probability * odds)
+        value = total / len(cells)
+        self._cache[key] = value
+        return value
+
+    def _max(self, board, depth, probability):
+        """Value of the best move from 'board'; 0 if there is none (the game is lost)."""
+        self._nodes += 1
+        best = 0.0
+        for move in MOVES:
+            moved, _ = move(board)
+            if moved != board:
+                value = self._chance(moved, depth, probability)
+                if value > best:
+                    best = value
+        return best
@@ -0,0 +1,35 @@
+"""
+The list moves as 2048.py had them before bitboard.py and board.py: every direction turned
+into a left move by transposing and/or reversing the grid. Kept only as the reference the
+benchmarks check the faster moves against and time them with.
+"""
+
+
+def move_row_left(row):
+    filtered = [num for num in row if num != 0]
+    new_row = []
+    i = 0
+    while i < len(filtered):
+        if i < len(filtered) - 1 and filtered[i] == filtered[i + 1]:
+            new_row.append(filtered[i] * 2)
+            i += 2
+        else:
+            new_row.append(filtered[i])
+            i += 1
+    return new_row + [0] * (len(row) - len(new_row))
+
+
+def transpose(grid):
+    return [list(row) for row in zip(*grid)]
+
+
+def list_move(grid, direction):
+    """Up, down, left or right (0-3, the order of bitboard.MOVES) on a list grid of any shape: (new grid, changed)."""
+    rows = transpose(grid) if direction < 2 else grid
+    if direction in (1, 3):
+        moved = [move_row_left(row[::-1])[::-1] for row in rows]
+    else:
+        moved = [move_row_left(row) for row in rows]
+    if direction < 2:
+        moved = transpose(moved)
+    return moved, moved != grid
@@ -1,10 +1,15 @@
 import sys
-import random
 import pygame
 from pygame.locals import *
 import pygame.gfxdraw
-from checkerboard import Checkerboard, Point, offset
+from checkerboard import Checkerboard, Point
 from checkerboard import BLACK_CHESSMAN as B_Orig, WHITE_CHESSMAN as W_Orig, Chessman
+from engines import create_timed_ai
+from ai_worker import AIWorker
+from opening_book import open_book
+from game_record import append_record, MODE_PVAI
+from renju import RenjuCheckerboard
+from viewport import stone_sprite
 
 # --- Unified Style Constants ---
 SIZE = 30  # Grid spacing
@@ -21,6 +26,12 @@ SCREEN_WIDTH = SCREEN_HEIGHT + 200 # Keep the info panel width
 Stone_Radius = SIZE // 2 - 3
 Stone_Radius2 = SIZE // 2 + 3 # For info panel display
 
+AI_ENGINE = 'search' # 'search' (alpha-beta), 'mcts' (Monte Carlo Tree Search), 'greedy' or 'vectorized', see engines.py
+AI_TIME_LIMIT_MS = 1000 # Thinking time per AI move for 'search' and 'mcts' (see bench_search.py to tune)
+AI_PROCESSES = 1 # >1 splits the alpha-beta search across that many processes (see bench_parallel.py)
+RENJU = False # Renju rules: black (the player) may not make 3-3, 4-4 or overlines, see renju.py
+OPENING_BOOK = open_book() # Memory-mapped opening book, or None if opening_book.bin has not been built
+
 # Colors (Matching Snake/2048)
 BACKGROUND_COLOR = (200, 200, 200) # Light Gray
 PRIMARY_COLOR = (50, 50, 150)      # Medium Blue (Used for UI elements)
@@ -135,18 +146,27 @@ def main():
 
     font_info = FONT_SMALL # Use standard small font for info
 
-    checkerboard = Checkerboard(Line_Points)
+    checkerboard = _new_board()
     cur_runner = BLACK_CHESSMAN # Use globally defined BLACK_CHESSMAN
     winner = None
-    computer = AI(Line_Points, WHITE_CHESSMAN) # Use globally defined WHITE_CHESSMAN
+    computer = _create_computer() # Plays WHITE_CHESSMAN
+    worker = AIWorker(computer) # AI thinks (and ponders) on its own thread so drawing never stalls
 
     black_win_count = 0 # Corresponds to PLAYER1
     white_win_count = 0 # Corresponds to PLAYER2
+    clock = pygame.time.Clock() # One clock, so tick() actually holds the frame rate while the AI thinks
+    background = _board_background()
+    stone_colors = {BLACK_CHESSMAN.Value: BLACK_CHESSMAN.Color, WHITE_CHESSMAN.Value: WHITE_CHESSMAN.Color}
+    panel_rect = pygame.Rect(SCREEN_HEIGHT, 0, SCREEN_WIDTH - SCREEN_HEIGHT, SCREEN_HEIGHT)
+    # What the screen shows, to find what a frame has to redraw
+    shown_board = shown_panel = None
+    shown_moves = 0
 
     while True:
         # --- Event Handling ---
         for event in pygame.event.get():
             if event.type == QUIT:
+                worker.close()
                 pygame.quit() # Quit pygame cleanly
                 sys.exit()
             elif event.type == MOUSEBUTTONDOWN:
@@ -155,14 +175,18 @@ def main():
                         mouse_pos = pygame.mouse.get_pos()
                         click_point = _get_clickpoint(mouse_pos)
                         if click_point is not None:
-                            if checkerboard.can_drop(click_point):
+                            if RENJU and checkerboard.is_forbidden(click_point):
+                                print('禁手: 黑棋不能下三三、四四或长连')
+                            elif checkerboard.can_drop(click_point):
                                 winner = checkerboard.drop(cur_runner, click_point)
                                 if winner is None:
                                     # Player move complete, switch to AI
-                                    computer.get_opponent_drop(click_point) # Update AI's board
+                                    worker.opponent_moved(click_point) # Update AI's board
                                     cur_runner = _get_next(cur_runner)
                                     # --- AI Turn Trigger --- 
-                                    # AI makes its move immediately after player
+                                    # AI starts thinking in the background; its move is collected below
+                                    print("电脑正在思考...")
+                                    worker.request_move()
                                 else:
                                     black_win_count += 1 # Player 1 wins
                             else:
@@ -173,10 +197,9 @@ def main():
                         print("现在是电脑的回合") # Inform user it's not their turn
                         
         # --- AI Turn Logic (if it's AI's turn and game is not over) ---
-        if winner is None and cur_runner.Value == WHITE_CHESSMAN.Value:
-            pygame.time.wait(100) # Small delay to simulate thinking
-            print("电脑正在思考...")
-            AI_point = computer.AI_drop()
+        ai_move = worker.poll() if winner is None and cur_runner.Value == WHITE_CHESSMAN.Value else None
+        if ai_move is not None: # Never waits: the board keeps redrawing while the AI thinks
+            AI_point = ai_move.point
             if AI_point and checkerboard.can_drop(AI_point): # Check if AI returned a valid and droppable point
                 winner = checkerboard.drop(cur_runner, AI_point)
                 if winner is not None:
@@ -196,37 +219,68 @@ def main():
                  cur_runner = _get_next(cur_runner)
 
         # --- Drawing --- 
-        screen.fill(BACKGROUND_COLOR)
-        _draw_checkerboard(screen)
-        for i, row in enumerate(checkerboard.checkerboard):
-            for j, cell in enumerate(row):
-                if cell == BLACK_CHESSMAN.Value:
-                    _draw_chessman(screen, Point(j, i), BLACK_CHESSMAN.Color)
-                elif cell == WHITE_CHESSMAN.Value:
-                    _draw_chessman(screen, Point(j, i), WHITE_CHESSMAN.Color)
-        _draw_right_info(screen, font_info, cur_runner, black_win_count, white_win_count)
+        # Only what changed since the last frame is drawn and sent to the display: the cached
+        # board after a reset, the stones played since, the info panel when its contents changed.
+        # A frame where nothing happened (the player thinking, the AI thinking) draws nothing.
+        dirty = []
+        if checkerboard is not shown_board or len(checkerboard.moves) < shown_moves:
+            screen.blit(background, (0, 0))
+            dirty.append(background.get_rect())
+            shown_moves = 0
+        for point in checkerboard.moves[shown_moves:]:
+            dirty.append(_draw_chessman(screen, point, stone_colors[checkerboard.value_at(point)]))
+        shown_board, shown_moves = checkerboard, len(checkerboard.moves)
+        panel = (cur_runner, black_win_count, white_win_count, worker.thinking)
+        if panel != shown_panel:
+            screen.fill(BACKGROUND_COLOR, panel_rect)
+            _draw_right_info(screen, font_info, *panel)
+            dirty.append(panel_rect)
+            shown_panel = panel
+        if dirty:
+            pygame.display.update(dirty)
 
         # --- Game Over Check --- 
         if winner:
+            append_record(MODE_PVAI, Line_Points, winner.Value, checkerboard.moves) # Append the game to games.rec
             if show_end_screen(screen, winner):
                 # Reset game state
                 winner = None
                 cur_runner = BLACK_CHESSMAN
-                checkerboard = Checkerboard(Line_Points)
-                computer = AI(Line_Points, WHITE_CHESSMAN)
+                checkerboard = _new_board()
+                worker.close()
+                computer = _create_computer()
+                worker = AIWorker(computer)
+                shown_panel = None # The end screen covered the panel; the new board redraws the rest
                 # Reset win counts or keep them?
                 # black_win_count = 0
                 # white_win_count = 0
             else: # If show_end_screen returns False (e.g. closed window) 
                 break # Exit main loop
 
-        pygame.display.flip()
-        pygame.time.Clock().tick(30) # Lower tick rate slightly
+        clock.tick(30) # Lower tick rate slightly
     
+    worker.close()
     pygame.quit() # Quit pygame if main loop exits
     sys.exit()
 
 
+def _create_computer():
+    # Uses the globally defined WHITE_CHESSMAN. The AI searches with make/unmake on its own board
+    # rather than the shared `checkerboard`: it thinks on a worker thread while this thread draws.
+    if AI_ENGINE == 'search' and AI_PROCESSES > 1:
+        computer = create_timed_ai(Line_Points, WHITE_CHESSMAN, 'parallel', AI_TIME_LIMIT_MS, workers=AI_PROCESSES)
+    else:
+        computer = create_timed_ai(Line_Points, WHITE_CHESSMAN, AI_ENGINE, AI_TIME_LIMIT_MS)  # python engines.py checks every engine builds
+    computer.book = OPENING_BOOK  # None when there is no opening_book.bin (see build_book.py)
+    if RENJU:
+        computer.enable_renju() # Its search then never plays (or expects) a forbidden black move
+    return computer
+
+
+def _new_board():
+    return RenjuCheckerboard(Line_Points) if RENJU else Checkerboard(Line_Points)
+
+
 def _get_next(cur_runner):
     # Compares against globally defined Chessman objects
     if cur_runner.Value == BLACK_CHESSMAN.Value:
@@ -255,13 +309,28 @@ def _draw_checkerboard(screen):
             pygame.gfxdraw.filled_circle(screen, Start_X + SIZE * i, Start_Y + SIZE * j, radius, star_point_color)
 
 
+def _board_background():
+    # The empty board never changes: draw it once and blit it whenever the board is redrawn
+    background = pygame.Surface((SCREEN_HEIGHT, SCREEN_HEIGHT))
+    background.fill(BACKGROUND_COLOR)
+    _draw_checkerboard(background)
+    return background
+
+
+_stone_sprites = {} # Color -> pre-rendered antialiased stone
+
+
 def _draw_chessman(screen, point, stone_color):
-    # This function is fine, uses the passed (unified) color
-    pygame.gfxdraw.aacircle(screen, Start_X + SIZE * point.X, Start_Y + SIZE * point.Y, Stone_Radius, stone_color)
-    pygame.gfxdraw.filled_circle(screen, Start_X + SIZE * point.X, Start_Y + SIZE * point.Y, Stone_Radius, stone_color)
+    # Blits the stone sprite for the color (rendered on first use); returns the rect it covers
+    sprite = _stone_sprites.get(stone_color)
+    if sprite is None:
+        sprite = _stone_sprites[stone_color] = stone_sprite(stone_color, Stone_Radius)
+    rect = sprite.get_rect(center=(Start_X + SIZE * point.X, Start_Y + SIZE * point.Y))
+    screen.blit(sprite, rect)
+    return rect
 
 # Renamed from _draw_left_info - Revised Positioning
-def _draw_right_info(screen, font, cur_runner, player1_wins, player2_wins):
+def _draw_right_info(screen, font, cur_runner, player1_wins, player2_wins, thinking=False):
     panel_x_start = SCREEN_HEIGHT # Start of the info panel area
     padding = 15
     y_pos = Start_Y # Start drawing from same top alignment as board grid
@@ -291,6 +360,12 @@ def _draw_right_info(screen, font, cur_runner, player1_wins, player2_wins):
     turn_text_rect = turn_text_surf.get_rect(midleft=(turn_indicator_rect.right + 10, turn_indicator_rect.centery))
     screen.blit(turn_text_surf, turn_text_rect)
 
+    # AI thinking indicator (AI runs on a worker thread)
+    if thinking:
+        thinking_surf = font.render('思考中...', True, ACCENT_COLOR)
+        thinking_rect = thinking_surf.get_rect(topleft=(p2_text_rect.left, p2_text_rect.bottom + 5))
+        screen.blit(thinking_surf, thinking_rect)
+
     y_pos += Stone_Radius2 * 4 # Add more space before scores
 
     # Scores Title
@@ -349,220 +424,5 @@ def _get_clickpoint(click_pos):
     return None # Click not close enough to an intersection or out of bounds
 
 
-class AI:
-    def __init__(self, line_points, chessman):
-        self._line_points = line_points
-        self._my = chessman # Should be WHITE_CHESSMAN (global)
-        # Use global objects for comparison
-        self._opponent = BLACK_CHESSMAN if chessman.Value == WHITE_CHESSMAN.Value else WHITE_CHESSMAN
-        self._checkerboard = [[0] * line_points for _ in range(line_points)]
-
-    def get_opponent_drop(self, point):
-        if 0 <= point.Y < self._line_points and 0 <= point.X < self._line_points:
-             self._checkerboard[point.Y][point.X] = self._opponent.Value
-        else:
-             print(f"AI Error: Opponent drop out of bounds: {point}")
-
-
-    def AI_drop(self):
-        point = None
-        score = -1 # Initialize score to allow 0-score moves if necessary
-        empty_cells = []
-
-        for i in range(self._line_points):
-            for j in range(self._line_points):
-                if self._checkerboard[j][i] == 0:
-                    cell_point = Point(i, j)
-                    empty_cells.append(cell_point)
-                    _score = self._get_point_score(cell_point)
-                    # Simple Tie-breaking: Prefer center-ish moves for same score
-                    is_better_tiebreak = False
-                    if _score == score and point is not None:
-                         # Calculate distance from center (9, 9)
-                         dist_sq_new = (i - (self._line_points // 2))**2 + (j - (self._line_points // 2))**2
-                         dist_sq_old = (point.X - (self._line_points // 2))**2 + (point.Y - (self._line_points // 2))**2
-                         if dist_sq_new < dist_sq_old: # Prefer closer to center
-                              is_better_tiebreak = True
-
-                    if _score > score or is_better_tiebreak:
-                        score = _score
-                        point = cell_point
-        
-        # Fallback: If no move found with score > -1 (or preferred tiebreak)
-        if point is None:
-            if empty_cells:
-                # Choose randomly from available cells as last resort
-                point = random.choice(empty_cells)
-                print("AI choosing random move.")
-            else:
-                print("AI Error: No empty cells found!")
-                return None
-
-        # Ensure point is valid before updating internal board and returning
-        if point and 0 <= point.Y < self._line_points and 0 <= point.X < self._line_points:
-             self._checkerboard[point.Y][point.X] = self._my.Value
-             print(f"AI chooses: ({point.X}, {point.Y}) with score {score}")
-             return point
-        else:
-             print(f"AI Error: Invalid point selected: {point}")
-             # Try random again if point became invalid? Or just fail.
-             if empty_cells: return random.choice(empty_cells) 
-             return None
-
-
-    def _get_point_score(self, point):
-        score = 0
-        for os in offset:
-            score += self._get_direction_score(point, os[0], os[1])
-        # Add a small bonus for center positions
-        center_bonus = 0
-        center_dist_sq = (point.X - self._line_points // 2)**2 + (point.Y - self._line_points // 2)**2
-        max_dist_sq = (self._line_points // 2)**2 * 2
-        center_bonus = (1 - (center_dist_sq / max_dist_sq)) * 5 # Max bonus of 5 for exact center
-        return score + center_bonus
-
-    # --- Scoring logic based on counts and blocking ---
-    # (This detailed scoring logic seems complex and might need tweaking for balance)
-    # Keeping the original scoring logic for now. 
-    def _get_direction_score(self, point, x_offset, y_offset):
-        count = 0   # My continuous stones including the potential drop point (starts at 1 conceptually)
-        _count = 0  # Opponent continuous stones adjacent to potential drop point
-        my_blocked = 0    # Ends blocked for my potential line
-        opp_blocked = 0   # Ends blocked for opponent's adjacent line
-
-        # Check one direction
-        live_ends_my = 0
-        empty_in_line_my = 0
-        consecutive_my = 0
-        for i in range(1, 5): # Check up to 4 spaces away for potential 5-in-a-row
-            x = point.X + i * x_offset
-            y = point.Y + i * y_offset
-            if 0 <= x < self._line_points and 0 <= y < self._line_points:
-                if self._checkerboard[y][x] == self._my.Value:
-                    consecutive_my += 1
-                elif self._checkerboard[y][x] == 0:
-                    live_ends_my +=1
-                    break # Found an empty space, line is 'live' on this end
-                else: # Opponent's stone
-                    my_blocked += 1
-                    break # Blocked on this end
-            else: # Off board
-                my_blocked += 1
-                break
-        count += consecutive_my
-        
-        # Check opposite direction
-        consecutive_my = 0 # Reset for opposite direction
-        for i in range(1, 5):
-            x = point.X - i * x_offset
-            y = point.Y - i * y_offset
-            if 0 <= x < self._line_points and 0 <= y < self._line_points:
-                if self._checkerboard[y][x] == self._my.Value:
-                     consecutive_my += 1
-                elif self._checkerboard[y][x] == 0:
-                    live_ends_my += 1
-                    break
-                else:
-                    my_blocked += 1
-                    break
-            else:
-                my_blocked += 1
-                break
-        count += consecutive_my
-
-        # --- Calculate My Score based on count and blocks ---
-        # (Using original game's logic structure for scoring mapping)
-        # This needs careful mapping to prioritize winning/blocking moves
-        my_score = 0
-        if count >= 4: # Forms 5-in-a-row
-             my_score = 10000
-        elif count == 3: 
-             if live_ends_my == 2: my_score = 1000 # Live four
-             elif live_ends_my == 1: my_score = 100 # Dead four
-        elif count == 2:
-             if live_ends_my == 2: my_score = 100 # Live three
-             elif live_ends_my == 1: my_score = 10 # Dead three
-        elif count == 1:
-             if live_ends_my == 2: my_score = 10 # Live two
-             elif live_ends_my == 1: my_score = 1 # Dead two
-        
-        # --- Check Opponent Threat ---
-        # Check opponent's potential lines if we *don't* place here
-        # This is complex - the original code seems to calculate this differently.
-        # Let's adapt the opponent check similar to how 'my' check was done.
-        
-        live_ends_opp = 0
-        consecutive_opp = 0
-        # Check one direction for opponent stones adjacent to the potential drop point
-        for i in range(1, 5): 
-            x = point.X + i * x_offset
-            y = point.Y + i * y_offset
-            if 0 <= x < self._line_points and 0 <= y < self._line_points:
-                if self._checkerboard[y][x] == self._opponent.Value:
-                    consecutive_opp += 1
-                elif self._checkerboard[y][x] == 0:
-                    live_ends_opp +=1
-                    break 
-                else: # My stone
-                    opp_blocked += 1
-                    break 
-            else: # Off board
-                opp_blocked += 1
-                break
-        _count += consecutive_opp
-
-        # Check opposite direction for opponent
-        consecutive_opp = 0 
-        for i in range(1, 5):
-            x = point.X - i * x_offset
-            y = point.Y - i * y_offset
-            if 0 <= x < self._line_points and 0 <= y < self._line_points:
-                if self._checkerboard[y][x] == self._opponent.Value:
-                     consecutive_opp += 1
-                elif self._checkerboard[y][x] == 0:
-                    live_ends_opp += 1
-                    break
-                else:
-                    opp_blocked += 1
-                    break
-            else:
-                opp_blocked += 1
-                break
-        _count += consecutive_opp
-        
-        # --- Calculate Opponent Score (Threat level) ---
-        opp_score = 0
-        if _count >= 4: # Block opponent's 5-in-a-row
-             opp_score = 9000 
-        elif _count == 3: 
-             if live_ends_opp == 2: opp_score = 900 # Block live four
-             elif live_ends_opp == 1: opp_score = 90 # Block dead four
-        elif _count == 2:
-             if live_ends_opp == 2: opp_score = 90 # Block live three
-             elif live_ends_opp == 1: opp_score = 9 # Block dead three
-        elif _count == 1:
-             if live_ends_opp == 2: opp_score = 9 # Block live two
-             # elif live_ends_opp == 1: opp_score = 1 # Block dead two (less important)
-
-        # Return the higher score (either my offensive score or defensive score)
-        return max(my_score, opp_score)
-
-
-    # This helper seems unused or less useful with the revised scoring logic
-    def _get_stone_color(self, point, x_offset, y_offset, next):
-        x = point.X + x_offset
-        y = point.Y + y_offset
-        if 0 <= x < self._line_points and 0 <= y < self._line_points:
-            if self._checkerboard[y][x] == self._my.Value:
-                return 1
-            elif self._checkerboard[y][x] == self._opponent.Value:
-                return 2
-            else: # Empty
-                 # Original logic recursively checked next empty, might be complex/slow
-                 return 0 
-        else: # Off board
-            return -1 # Indicate blocked/off board
-
-
 if __name__ == '__main__':
     main()
\ No newline at end of file
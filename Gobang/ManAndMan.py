@@ -1,13 +1,25 @@
+import argparse
 import sys
 import pygame
 from pygame.locals import *
 import pygame.gfxdraw
 from checkerboard import Checkerboard, Point
 from checkerboard import BLACK_CHESSMAN as B_Orig, WHITE_CHESSMAN as W_Orig, Chessman
+from game_record import append_record, MODE_PVP
+from sparse_board import SparseCheckerboard
+from renju import RenjuCheckerboard
+from viewport import Viewport
+from server import DEFAULT_PORT
+from net_client import NetworkClient
+from ai_worker import AnalysisWorker
+from search import WIN_SCORE, MAX_PLY
 
 # --- Unified Style Constants ---
 SIZE = 30
-Line_Points = 19
+Line_Points = 19 # Lines of the board area on screen; the board itself can be larger (see BOARD_SIZE)
+MAX_BOARD_SIZE = 1000
+MAX_ANALYSIS_SIZE = 25 # The analysis search keeps dense per-cell tables, so only on boards up to this size
+MAX_ANALYSIS_LINES = 5
 Outer_Width = 20
 Border_Width = 4
 Inside_Width = 4
@@ -54,54 +66,82 @@ else:
 RIGHT_INFO_POS_X = SCREEN_HEIGHT + Stone_Radius2 * 2 + 10
 
 # --- Add Missing Drawing Functions (Copied from ManAndMachine.py) ---
-def _draw_checkerboard(screen):
-    # Use unified colors for board background and lines
-    # screen.fill(BACKGROUND_COLOR) # Filling handled in main loop now
-    pygame.draw.rect(screen, GRID_LINE_COLOR, (Outer_Width, Outer_Width, Border_Length, Border_Length), Border_Width)
-    for i in range(Line_Points):
-        pygame.draw.line(screen, GRID_LINE_COLOR,
-                         (Start_Y, Start_Y + SIZE * i),
-                         (Start_Y + SIZE * (Line_Points - 1), Start_Y + SIZE * i), 1)
-    for j in range(Line_Points):
-        pygame.draw.line(screen, GRID_LINE_COLOR,
-                         (Start_X + SIZE * j, Start_X),
-                         (Start_X + SIZE * j, Start_X + SIZE * (Line_Points - 1)), 1)
-    star_point_color = TEXT_COLOR # Use standard text color for star points
-    for i in (3, 9, 15):
-        for j in (3, 9, 15):
-            radius = 5 if i == j == 9 else 3
-            pygame.gfxdraw.aacircle(screen, Start_X + SIZE * i, Start_Y + SIZE * j, radius, star_point_color)
-            pygame.gfxdraw.filled_circle(screen, Start_X + SIZE * i, Start_Y + SIZE * j, radius, star_point_color)
-
-def _draw_chessman(screen, point, stone_color):
-    # This function is fine, uses the passed (unified) color
-    pygame.gfxdraw.aacircle(screen, Start_X + SIZE * point.X, Start_Y + SIZE * point.Y, Stone_Radius, stone_color)
-    pygame.gfxdraw.filled_circle(screen, Start_X + SIZE * point.X, Start_Y + SIZE * point.Y, Stone_Radius, stone_color)
-
 def _draw_chessman_pos(screen, pos, stone_color):
     # This function is fine, uses the passed (unified) color
     pygame.gfxdraw.aacircle(screen, pos[0], pos[1], Stone_Radius2, stone_color)
     pygame.gfxdraw.filled_circle(screen, pos[0], pos[1], Stone_Radius2, stone_color)
 # --- End Add Missing Drawing Functions ---
 
-# Updated click detection (same as ManAndMachine)
-def _get_clickpoint(click_pos):
-    board_start_x = Outer_Width
-    board_start_y = Outer_Width
-    board_end_x = board_start_x + Border_Length
-    board_end_y = board_start_y + Border_Length
-    if not (board_start_x <= click_pos[0] <= board_end_x and 
-            board_start_y <= click_pos[1] <= board_end_y):
+def _board_size(text):
+    """Board size argument: lines up to MAX_BOARD_SIZE, or 'inf' for an unbounded board (None)."""
+    if text.lower() in ('inf', 'infinite', '0'):
         return None
-    pos_x = click_pos[0] - Start_X
-    pos_y = click_pos[1] - Start_Y
-    x = round(pos_x / SIZE)
-    y = round(pos_y / SIZE)
-    if 0 <= x < Line_Points and 0 <= y < Line_Points:
-         click_radius_sq = (pos_x - x * SIZE)**2 + (pos_y - y * SIZE)**2
-         if click_radius_sq <= (SIZE // 2)**2:
-              return Point(x, y)
-    return None
+    try:
+        size = int(text)
+    except ValueError:
+        size = 0
+    if not 5 <= size <= MAX_BOARD_SIZE:
+        raise argparse.ArgumentTypeError(f'棋盘大小应为 5-{MAX_BOARD_SIZE} 或 inf')
+    return size
+
+
+def _parse_args(argv):
+    parser = argparse.ArgumentParser(description='五子棋 (双人)')
+    parser.add_argument('size', nargs='?', type=_board_size, default=Line_Points,
+                        help=f'board lines (5-{MAX_BOARD_SIZE}) or inf, default {Line_Points}')
+    parser.add_argument('--connect', metavar='HOST[:PORT]', help='play on a Gobang server (server.py) instead of locally')
+    parser.add_argument('--room', default='lobby', help='server room to join')
+    parser.add_argument('--spectate', action='store_true', help='watch the room instead of taking a seat')
+    parser.add_argument('--renju', action='store_true', help="Renju rules: black's 3-3, 4-4 and overlines are forbidden")
+    parser.add_argument('--analysis', action='store_true', help='start with the analysis shown (A toggles it)')
+    parser.add_argument('--top', type=int, default=3, help=f'moves the analysis shows (1-{MAX_ANALYSIS_LINES})')
+    args = parser.parse_args(argv)
+    if args.renju and (args.size is None or args.connect is not None):
+        parser.error('--renju 只支持本地的有限棋盘')
+    if not 1 <= args.top <= MAX_ANALYSIS_LINES:
+        parser.error(f'--top 应为 1-{MAX_ANALYSIS_LINES}')
+    return args
+
+
+def _new_board(board_size, renju=False):
+    # The dense board is fine at 19x19; large and unbounded boards only store their stones
+    if renju:
+        return RenjuCheckerboard(board_size) # Keeps black's forbidden points up to date
+    if board_size == Line_Points:
+        return Checkerboard(Line_Points)
+    return SparseCheckerboard(board_size)
+
+
+def _new_analyzer(board_size, top_n, renju=False):
+    """Background analysis of the game for hints, or None (with a message) if the board is too large."""
+    if board_size is None or board_size > MAX_ANALYSIS_SIZE:
+        print(f'分析只支持 {MAX_ANALYSIS_SIZE}×{MAX_ANALYSIS_SIZE} 以内的棋盘')
+        return None
+    return AnalysisWorker(board_size, top_n, renju=renju)
+
+
+def _score_text(score):
+    """An analysis score for the side to move; forced wins and losses as words."""
+    if score >= WIN_SCORE - MAX_PLY:
+        return '必胜'
+    if score <= -WIN_SCORE + MAX_PLY:
+        return '必败'
+    return str(score)
+
+
+def _draw_hints(screen, viewport, analysis):
+    """Numbers the analysis' suggested points on the board, best first."""
+    x0, x1, y0, y1 = viewport.visible_range()
+    radius = max(4, viewport.stone_radius() // 2)
+    screen.set_clip(viewport.rect)
+    for rank, (_, point) in enumerate(analysis.lines, 1):
+        if x0 <= point.X <= x1 and y0 <= point.Y <= y1:
+            pos = viewport.to_screen(point.X, point.Y)
+            pygame.gfxdraw.aacircle(screen, pos[0], pos[1], radius, ACCENT_COLOR)
+            pygame.gfxdraw.filled_circle(screen, pos[0], pos[1], radius, ACCENT_COLOR)
+            label = FONT_SMALL.render(str(rank), True, TEXT_COLOR)
+            screen.blit(label, label.get_rect(center=pos))
+    screen.set_clip(None)
 
 # Updated show_end_screen (Similar to ManAndMachine)
 def show_end_screen(screen, winner):
@@ -170,8 +210,12 @@ def draw_button(surface, text, font, x, y, width, height, color, hover_color, te
     return pygame.Rect(x, y, width, height)
 
 # Updated function for drawing info panel in Man vs Man mode
-def _draw_right_info_pvp(screen, font, cur_runner):
-    """Draws the information panel on the right for Player vs Player mode."""
+def _draw_right_info_pvp(screen, font, cur_runner, board_size=Line_Points, status=None, renju=False,
+                         analyzing=False, analysis=None):
+    """
+    Draws the information panel on the right for Player vs Player mode.
+    With 'analyzing', also the latest analysis of the position (None until its first depth).
+    """
     panel_x_start = SCREEN_HEIGHT # Start of the info panel area
     padding = 15
     y_pos = Start_Y # Start drawing from same top alignment as board grid
@@ -202,66 +246,237 @@ def _draw_right_info_pvp(screen, font, cur_runner):
     
     # No score tracking in PvP mode
 
+    # Board size, and the view controls when the board does not fit the window
+    y_pos = p2_text_rect.bottom + Stone_Radius2 * 2
+    size_text = '无限棋盘' if board_size is None else f'棋盘 {board_size}×{board_size}'
+    lines = [size_text] if status is None else [status, size_text]
+    if renju:
+        lines.append('连珠规则: 黑棋禁手')
+    if board_size != Line_Points:
+        lines += ['滚轮 / +- 缩放', '右键拖动 / 方向键移动', 'C 回到最后一手']
+    lines.append('A 分析开关')
+    if analyzing:
+        if analysis is None:
+            lines.append('分析中...')
+        else:
+            # Scores are for the side to move, the player the turn indicator points at
+            lines.append(f'分析 (深度 {analysis.depth})')
+            lines += [f'{rank} ({point.X},{point.Y}) {_score_text(score)}'
+                      for rank, (score, point) in enumerate(analysis.lines, 1)]
+    for i, text in enumerate(lines):
+        screen.blit(FONT_SMALL.render(text, True, INFO_TEXT_COLOR), (panel_x_start + padding, y_pos + 30 * i))
+
 def main():
-    """Main game loop for the Player vs Player mode."""
+    """
+    Main game loop for the Player vs Player mode.
+    Usage: python ManAndMan.py [board size | inf] [--renju] [--analysis [--top N]]
+                               [--connect HOST[:PORT] [--room NAME] [--spectate]]
+    """
+    args = _parse_args(sys.argv[1:])
     pygame.init()
     screen = pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT))
-    pygame.display.set_caption('五子棋 (双人)')
+    pygame.display.set_caption('五子棋 (双人)' if args.connect is None else f'五子棋 (网络: {args.room})')
 
     font_info = FONT_MEDIUM # Use standard medium font for info
 
-    checkerboard = Checkerboard(Line_Points)
+    board_size = args.size # None: unbounded board
+    checkerboard = _new_board(board_size, args.renju)
+    # Only the part of the board inside the view is drawn; scroll with the right or middle
+    # mouse button or the arrow keys, zoom with the wheel or +/-, C re-centers on the last move
+    viewport = Viewport((0, 0, SCREEN_HEIGHT, SCREEN_HEIGHT), board_size, SIZE)
+    stone_colors = {BLACK_CHESSMAN.Value: BLACK_CHESSMAN.Color, WHITE_CHESSMAN.Value: WHITE_CHESSMAN.Color}
+    chessmen = {BLACK_CHESSMAN.Value: BLACK_CHESSMAN, WHITE_CHESSMAN.Value: WHITE_CHESSMAN}
+    dragging = False
     cur_runner = BLACK_CHESSMAN # Start with Black (global, now black color)
     winner = None
+    game_over = False # Also true for a draw, which only happens on the network
+    clock = pygame.time.Clock()
+    panel_rect = pygame.Rect(SCREEN_HEIGHT, 0, SCREEN_WIDTH - SCREEN_HEIGHT, SCREEN_HEIGHT)
+    # What the screen shows, to find what a frame has to redraw
+    shown_view = shown_board = shown_panel = None
+    shown_moves = 0
+    shown_hints = None
+
+    # Hints: a background search of the current position, restarted whenever a stone is
+    # placed; the panel and board show its latest completed depth for this position only
+    analyzer = _new_analyzer(board_size, args.top, args.renju) if args.analysis else None
+    analyzed = None # (board, move count) the analyzer was last given
+
+    # --- Network mode: the server owns the board, this window only sends clicks and shows its moves ---
+    network = None
+    my_value = 0 # Our seat on the server: a Chessman value, 0 while spectating
+    started = False
+    status = None
+    pending = [] # Server messages not handled yet
+    if args.connect is not None:
+        host, _, port = args.connect.partition(':')
+        try:
+            network = NetworkClient(host, int(port or DEFAULT_PORT), args.room, args.spectate)
+        except (OSError, ValueError) as e:
+            print(f'无法连接服务器 {args.connect}: {e}')
+            pygame.quit()
+            sys.exit()
+        status = '连接中...'
 
     while True:
+        if network is not None:
+            pending.extend(network.poll())
+            while pending and not game_over:
+                fields = pending.pop(0)
+                kind = fields[0]
+                if kind == 'JOINED':
+                    board_size = int(fields[3])
+                    checkerboard = _new_board(board_size)
+                    if analyzer is not None and analyzer.line_points != board_size:
+                        analyzer.close()
+                        analyzer = _new_analyzer(board_size, args.top)
+                        analyzed = None
+                    viewport = Viewport((0, 0, SCREEN_HEIGHT, SCREEN_HEIGHT), board_size, SIZE)
+                    my_value = {'black': BLACK_CHESSMAN.Value, 'white': WHITE_CHESSMAN.Value}.get(fields[2], 0)
+                    status = {BLACK_CHESSMAN.Value: '你执黑 (玩家 1)', WHITE_CHESSMAN.Value: '你执白 (玩家 2)'}.get(my_value, '观战中')
+                elif kind == 'START':
+                    started = True
+                elif kind == 'MOVE':
+                    chessman = chessmen[int(fields[2])]
+                    checkerboard.drop(chessman, Point(int(fields[3]), int(fields[4])))
+                    cur_runner = _get_next_pvp(chessman)
+                elif kind in ('WIN', 'DRAW'):
+                    winner = chessmen[int(fields[1])] if kind == 'WIN' else None
+                    game_over = True # Show the end screen before the NEW game that follows
+                elif kind == 'NEW':
+                    checkerboard = _new_board(board_size)
+                    cur_runner = BLACK_CHESSMAN
+                elif kind == 'LEFT':
+                    started = False
+                    print(f'对手已离开 ({fields[1]})')
+                elif kind == 'ERROR':
+                    print('服务器: ' + ' '.join(fields[1:]))
+                elif kind == 'CLOSED':
+                    print('与服务器断开连接')
+                    status = '已断开'
+                    network = None
+                    break
+
         for event in pygame.event.get():
             if event.type == QUIT:
+                if network is not None:
+                    network.close()
+                if analyzer is not None:
+                    analyzer.close()
                 pygame.quit()
                 sys.exit()
             elif event.type == MOUSEBUTTONDOWN:
-                if winner is None and event.button == 1:
+                if event.button in (2, 3):
+                    dragging = True
+                elif not game_over and event.button == 1:
                     mouse_pos = pygame.mouse.get_pos()
-                    click_point = _get_clickpoint(mouse_pos)
-                    if click_point is not None:
-                        if checkerboard.can_drop(click_point):
-                            winner = checkerboard.drop(cur_runner, click_point)
-                            if winner is None:
-                                # Switch player using global objects
-                                if cur_runner.Value == BLACK_CHESSMAN.Value:
-                                    cur_runner = WHITE_CHESSMAN
-                                else:
-                                    cur_runner = BLACK_CHESSMAN
+                    click_point = viewport.to_board(mouse_pos)
+                    if click_point is None:
+                        print('超出棋盘区域')
+                    elif not checkerboard.can_drop(click_point):
+                        print('不可落子')
+                    elif args.renju and cur_runner.Value == BLACK_CHESSMAN.Value and checkerboard.is_forbidden(click_point):
+                        print('禁手: 黑棋不能下三三、四四或长连')
+                    elif args.connect is not None:
+                        if network is None or not started or cur_runner.Value != my_value:
+                            print('现在不是你的回合')
                         else:
-                             print('不可落子')
+                            network.send_move(click_point, len(checkerboard.moves) + 1) # Dropped when the server broadcasts it
                     else:
-                        print('超出棋盘区域')
+                        winner = checkerboard.drop(cur_runner, click_point)
+                        if winner is None:
+                            cur_runner = _get_next_pvp(cur_runner)
+                        else:
+                            game_over = True
+            elif event.type == MOUSEBUTTONUP:
+                if event.button in (2, 3):
+                    dragging = False
+            elif event.type == MOUSEMOTION:
+                if dragging:
+                    viewport.scroll(*event.rel)
+            elif event.type == MOUSEWHEEL:
+                viewport.zoom(1.25 ** event.y, pygame.mouse.get_pos())
+            elif event.type == KEYDOWN:
+                if event.key in (K_LEFT, K_RIGHT, K_UP, K_DOWN):
+                    step = SIZE * 3
+                    viewport.scroll({K_LEFT: step, K_RIGHT: -step}.get(event.key, 0),
+                                    {K_UP: step, K_DOWN: -step}.get(event.key, 0))
+                elif event.key in (K_PLUS, K_EQUALS, K_KP_PLUS):
+                    viewport.zoom(1.25)
+                elif event.key in (K_MINUS, K_KP_MINUS):
+                    viewport.zoom(0.8)
+                elif event.key == K_c:
+                    viewport.recenter(checkerboard.moves[-1] if checkerboard.moves else None)
+                elif event.key == K_a:
+                    if analyzer is None:
+                        analyzer = _new_analyzer(board_size, args.top, args.renju)
+                        analyzed = None
+                    else:
+                        analyzer.close()
+                        analyzer = None
 
-        # Draw background first
-        screen.fill(BACKGROUND_COLOR)
-        # Draw checkerboard on top
-        _draw_checkerboard(screen)
+        # Restart the analysis as soon as the position changes; poll() never shows an older position's result
+        analysis = None
+        if analyzer is not None:
+            if analyzed != (checkerboard, len(checkerboard.moves)):
+                analyzer.set_position(checkerboard.moves)
+                analyzed = (checkerboard, len(checkerboard.moves))
+            analysis = analyzer.poll()
+        hints = None if analysis is None else analysis.lines
 
-        # Draw pieces using global colors
-        for i, row in enumerate(checkerboard.checkerboard):
-            for j, cell in enumerate(row):
-                if cell == BLACK_CHESSMAN.Value:
-                    _draw_chessman(screen, Point(j, i), BLACK_CHESSMAN.Color)
-                elif cell == WHITE_CHESSMAN.Value:
-                    _draw_chessman(screen, Point(j, i), WHITE_CHESSMAN.Color)
+        # Redraw only what changed since the last frame and send only those rects to the display:
+        # the board area when the view or the board changed, single stones when moves were added,
+        # the info panel when its text changed. An idle frame draws nothing.
+        dirty = []
+        if (viewport.view_key() != shown_view or checkerboard is not shown_board
+                or len(checkerboard.moves) < shown_moves or hints != shown_hints):
+            screen.blit(viewport.background(BACKGROUND_COLOR, GRID_LINE_COLOR, Border_Width, Inside_Width, TEXT_COLOR),
+                        viewport.rect)
+            viewport.draw_stones(screen, checkerboard, stone_colors)
+            if analysis is not None:
+                _draw_hints(screen, viewport, analysis)
+            dirty.append(viewport.rect)
+        else:
+            for point in checkerboard.moves[shown_moves:]:
+                rect = viewport.draw_stone(screen, point, stone_colors[checkerboard.value_at(point)])
+                if rect is not None:
+                    dirty.append(rect)
+        shown_view, shown_board, shown_moves = viewport.view_key(), checkerboard, len(checkerboard.moves)
+        shown_hints = hints
 
         # Draw PvP info panel
-        _draw_right_info_pvp(screen, font_info, cur_runner)
+        panel = (cur_runner, board_size, status if started or status is None else f'{status}, 等待对手...', args.renju,
+                 analyzer is not None, analysis)
+        if panel != shown_panel:
+            screen.fill(BACKGROUND_COLOR, panel_rect)
+            _draw_right_info_pvp(screen, font_info, *panel)
+            dirty.append(panel_rect)
+            shown_panel = panel
+
+        if dirty:
+            pygame.display.update(dirty)
 
-        if winner:
+        if game_over:
+            if args.connect is None and board_size is not None: # Records need a bounded board
+                append_record(MODE_PVP, board_size, winner.Value, checkerboard.moves) # Append the game to games.rec
             if show_end_screen(screen, winner): # Returns True if Restart selected
-                 # Reset game state
+                 # Reset game state; on the network the server's NEW message starts the next game
                 winner = None
-                cur_runner = BLACK_CHESSMAN # Reset to player 1 (global)
-                checkerboard = Checkerboard(Line_Points)
+                game_over = False
+                if args.connect is None:
+                    cur_runner = BLACK_CHESSMAN # Reset to player 1 (global)
+                    checkerboard = _new_board(board_size, args.renju)
+                viewport.recenter()
+            shown_view = shown_panel = None # The end screen covered everything
 
-        pygame.display.flip()
-        pygame.time.Clock().tick(60)
+        clock.tick(60)
+
+
+def _get_next_pvp(cur_runner):
+    # Switch player using global objects
+    if cur_runner.Value == BLACK_CHESSMAN.Value:
+        return WHITE_CHESSMAN
+    return BLACK_CHESSMAN
 
 if __name__ == '__main__':
     main()
\ No newline at end of file
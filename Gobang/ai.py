@@ -0,0 +1,442 @@
+import heapq
+from checkerboard import Checkerboard, Point, offset, BLACK_CHESSMAN, WHITE_CHESSMAN
+from zobrist import zobrist_keys
+from candidates import CandidateGenerator
+from patterns import MY_FIVE_SCORE, OPP_FIVE_SCORE, SCORE_TABLES, WINDOW_MASK, line_geometry
+from renju import RenjuRules
+
+_DIRECTION_INDEX = {direction: k for k, direction in enumerate(offset)}
+
+
+class AI:
+    """
+    Greedy one-ply Gobang AI.
+
+    Scores every empty cell with _get_point_score and plays the best one. The per-direction
+    scores are cached: a stone only changes the scores of empty cells on the four lines
+    through it within distance 4, so each move rescores at most 32 (cell, direction)
+    entries instead of the whole board, and the best cell is popped from a heap.
+
+    The AI plays and searches with make/unmake on a Checkerboard. Pass the game's board
+    as `checkerboard` to share it: the AI then follows the board's move stack (moves
+    dropped or taken back by the game are picked up before the AI thinks) and AI_drop
+    leaves dropping the chosen stone to the game. Without one, the AI keeps its own
+    quiet board and is told about the opponent's moves through get_opponent_drop.
+    A shared board must only be used from one thread.
+    """
+
+    def __init__(self, line_points, chessman, checkerboard=None):
+        self._line_points = line_points
+        self._my = chessman # Should be WHITE_CHESSMAN (global)
+        # Use global objects for comparison
+        self._opponent = BLACK_CHESSMAN if chessman.Value == WHITE_CHESSMAN.Value else WHITE_CHESSMAN
+        self._chessmen = {self._my.Value: self._my, self._opponent.Value: self._opponent}
+        self._owns_board = checkerboard is None
+        self._board = Checkerboard(line_points, quiet=True) if checkerboard is None else checkerboard
+        self._checkerboard = self._board.checkerboard  # [y][x] view of the board
+        self._applied = []  # (point, value) of the stones the caches below reflect, in move order
+        self.book = None  # Optional OpeningBook (opening_book.py) consulted before thinking
+        self.renju = None  # RenjuRules once enable_renju() was called
+        # Zobrist hash of the stones on the AI board, updated on every _place/_remove
+        self._zobrist = zobrist_keys(line_points)
+        self._hash = 0
+        # Empty cells near stones, for the search and any other move generator
+        self._candidates = CandidateGenerator(line_points)
+        # Every line of the board packed 2 bits per cell; the 9-cell window through a cell
+        # indexes the precomputed direction score tables of patterns.py
+        empty_lines, self._cell_lines = line_geometry(line_points)
+        self._lines = list(empty_lines)
+        self._my_score_table, self._opp_score_table = SCORE_TABLES[chessman.Value]
+
+        # --- Score cache, indexed by y * line_points + x ---
+        center = line_points // 2
+        max_dist_sq = center ** 2 * 2
+        self._center_dist_sq = [(x - center) ** 2 + (y - center) ** 2
+                                for y in range(line_points) for x in range(line_points)]
+        self._center_bonus = [(1 - (dist_sq / max_dist_sq)) * 5 for dist_sq in self._center_dist_sq]
+        self._direction_scores = [[0] * len(offset) for _ in range(line_points * line_points)]
+        self._my_scores = [[0] * len(offset) for _ in range(line_points * line_points)]
+        self._opp_scores = [[0] * len(offset) for _ in range(line_points * line_points)]
+        # Sums of the per-direction scores over all empty cells, and how many of those
+        # entries complete a five, for each side. Used by the search for static evaluation.
+        self._my_potential = 0
+        self._opp_potential = 0
+        self._my_fives = 0
+        self._opp_fives = 0
+        self._cell_scores = [None] * (line_points * line_points)  # None for occupied cells
+        self._score_heap = []  # (-score, center distance, x, y); stale entries are skipped lazily
+        for y in range(line_points):
+            for x in range(line_points):
+                self._rescore_cell(Point(x, y), range(len(offset)))
+        self._sync()
+
+    def get_opponent_drop(self, point):
+        if 0 <= point.Y < self._line_points and 0 <= point.X < self._line_points:
+            self._sync()
+            if self._checkerboard[point.Y][point.X] == 0:  # Not yet dropped on a shared board
+                self._place(point, self._opponent.Value)
+        else:
+             print(f"AI Error: Opponent drop out of bounds: {point}")
+
+
+    def AI_drop(self):
+        point = self._book_drop()
+        if point is not None:
+            return point
+        # The heap key (-score, center distance, x, y) reproduces the full-board scan:
+        # highest score first, ties broken towards the center, then by scan order.
+        entry = self._peek_best()
+        if entry is None:
+            print("AI Error: No empty cells found!")
+            return None
+
+        score = -entry[0]
+        point = Point(entry[2], entry[3])
+        if self._is_forbidden(point, self._my.Value):
+            moves = self.candidate_moves(1, value=self._my.Value)  # Best allowed cell near the stones
+            if not moves:
+                print("AI Error: No allowed cells found!")
+                return None
+            point = moves[0]
+            score = self._cell_scores[point.Y * self._line_points + point.X]
+        self._play(point)
+        print(f"AI chooses: ({point.X}, {point.Y}) with score {score}")
+        return point
+
+    def _book_drop(self):
+        """Plays the opening book's reply to the current position, if there is one; returns it or None."""
+        self._sync()
+        if self.book is None:
+            return None
+        point = self.book.lookup(self._line_points, self._applied)
+        if point is None or self._checkerboard[point.Y][point.X] != 0:
+            return None
+        if self._is_forbidden(point, self._my.Value):
+            return None  # A Renju-forbidden book reply: search the position instead
+        self._play(point)
+        print(f"AI chooses: ({point.X}, {point.Y}) from the opening book")
+        return point
+
+    def _play(self, point):
+        """Plays the AI's chosen move on its own board; on a shared board the game drops it."""
+        if self._owns_board:
+            self._place(point, self._my.Value)
+
+    def _sync(self):
+        """Brings the caches in line with the board's move stack, undoing and replaying only what changed."""
+        moves = self._board.moves
+        applied = self._applied
+        common = 0
+        while (common < len(applied) and common < len(moves)
+               and applied[common] == (moves[common], self._checkerboard[moves[common].Y][moves[common].X])):
+            common += 1
+        while len(applied) > common:
+            point, value = applied.pop()
+            self._remove_stone(point, value)
+        for point in moves[common:]:
+            value = self._checkerboard[point.Y][point.X]
+            self._add_stone(point, value)
+            applied.append((point, value))
+
+    def enable_renju(self):
+        """Plays by Renju rules: black's forbidden points (renju.py) are kept up to date and never played."""
+        if self.renju is None:
+            self._sync()
+            self.renju = RenjuRules(self._line_points)
+            for point, value in self._applied:
+                self.renju.place(point, value)
+
+    def _is_forbidden_side(self, value):
+        """Whether 'value' has forbidden points, i.e. plays black under Renju rules."""
+        return self.renju is not None and value == BLACK_CHESSMAN.Value
+
+    def _is_forbidden(self, point, value):
+        return self._is_forbidden_side(value) and self.renju.is_forbidden(point)
+
+    def candidate_moves(self, limit=None, keep=None, value=None):
+        """
+        Empty cells within distance 2 of a stone, highest cached point score first.
+        With 'value' black and Renju rules enabled, black's forbidden points are left out.
+        """
+        exclude = self.renju.forbidden if self._is_forbidden_side(value) else None
+        return self._candidates.ordered(self._candidate_key, limit, keep, exclude)
+
+    def _candidate_key(self, index):
+        return self._cell_scores[index], -self._center_dist_sq[index]
+
+    def _peek_best(self):
+        """Returns the heap entry of the best empty cell, discarding stale entries on the way."""
+        heap = self._score_heap
+        while heap:
+            neg_score, _, x, y = heap[0]
+            if self._cell_scores[y * self._line_points + x] == -neg_score:
+                return heap[0]
+            heapq.heappop(heap)
+        return None
+
+    def _place(self, point, value):
+        """Makes a move on the board and rescores only the cells whose lines it touches."""
+        self._board.make(point, self._chessmen[value])
+        self._add_stone(point, value)
+        self._applied.append((point, value))
+
+    def _remove(self, point):
+        """Unmakes the last move, which must be 'point', undoing _place."""
+        last, value = self._applied.pop()
+        assert last == point, f"_remove({point}) but the last move was {last}"
+        self._board.unmake()
+        self._remove_stone(point, value)
+
+    def _add_stone(self, point, value):
+        """Updates the lines, hash, candidates and scores for a stone now on 'point'."""
+        index = point.Y * self._line_points + point.X
+        for line, shift in self._cell_lines[index]:
+            self._lines[line] |= value << shift
+        self._hash ^= self._zobrist[value][index]
+        self._candidates.place(point)
+        if self.renju is not None:
+            self.renju.place(point, value)
+        self._cell_scores[index] = None
+        # An occupied cell no longer contributes to either side's potential
+        my_scores = self._my_scores[index]
+        opp_scores = self._opp_scores[index]
+        for k in range(len(offset)):
+            self._my_potential -= my_scores[k]
+            self._opp_potential -= opp_scores[k]
+            self._my_fives -= my_scores[k] == MY_FIVE_SCORE
+            self._opp_fives -= opp_scores[k] == OPP_FIVE_SCORE
+            my_scores[k] = opp_scores[k] = self._direction_scores[index][k] = 0
+        self._rescore_lines(point)
+
+    def _remove_stone(self, point, value):
+        """Undoes _add_stone once the stone of 'value' has left 'point'."""
+        index = point.Y * self._line_points + point.X
+        self._hash ^= self._zobrist[value][index]
+        for line, shift in self._cell_lines[index]:
+            self._lines[line] &= ~(3 << shift)
+        self._candidates.remove(point)
+        if self.renju is not None:
+            self.renju.remove(point)
+        self._rescore_cell(point, range(len(offset)))
+        self._rescore_lines(point)
+
+    def _is_five(self, point, value):
+        """Whether a stone of 'value' on the empty cell 'point' would complete five in a row."""
+        return self._is_five_at(point.Y * self._line_points + point.X, value)
+
+    def _is_five_at(self, index, value):
+        if value == self._my.Value:
+            return MY_FIVE_SCORE in self._my_scores[index]
+        return OPP_FIVE_SCORE in self._opp_scores[index]
+
+    def _rescore_lines(self, point):
+        """Rescores empty cells within distance 4 of 'point' along each offset direction."""
+        for k, (x_offset, y_offset) in enumerate(offset):
+            for step in (-4, -3, -2, -1, 1, 2, 3, 4):
+                x = point.X + step * x_offset
+                y = point.Y + step * y_offset
+                if 0 <= x < self._line_points and 0 <= y < self._line_points and self._checkerboard[y][x] == 0:
+                    self._rescore_cell(Point(x, y), (k,))
+
+    def _rescore_cell(self, point, directions):
+        """Refreshes the cached direction scores of an empty cell and pushes its new total."""
+        index = point.Y * self._line_points + point.X
+        direction_scores = self._direction_scores[index]
+        my_scores = self._my_scores[index]
+        opp_scores = self._opp_scores[index]
+        cell_lines = self._cell_lines[index]
+        for k in directions:
+            line, shift = cell_lines[k]
+            window = (self._lines[line] >> (shift - 8)) & WINDOW_MASK
+            my_score = self._my_score_table[window]
+            opp_score = self._opp_score_table[window]
+            self._my_potential += my_score - my_scores[k]
+            self._opp_potential += opp_score - opp_scores[k]
+            self._my_fives += (my_score == MY_FIVE_SCORE) - (my_scores[k] == MY_FIVE_SCORE)
+            self._opp_fives += (opp_score == OPP_FIVE_SCORE) - (opp_scores[k] == OPP_FIVE_SCORE)
+            my_scores[k] = my_score
+            opp_scores[k] = opp_score
+            direction_scores[k] = max(my_score, opp_score)
+        # Same summation order as _get_point_score, so totals compare bit-for-bit
+        score = 0
+        for direction_score in direction_scores:
+            score += direction_score
+        score += self._center_bonus[index]
+        if score != self._cell_scores[index]:
+            self._cell_scores[index] = score
+            heapq.heappush(self._score_heap, (-score, self._center_dist_sq[index], point.X, point.Y))
+            if len(self._score_heap) > 4 * len(self._cell_scores):
+                self._compact_heap()
+
+    def _compact_heap(self):
+        """Drops stale heap entries once they outnumber the live ones."""
+        n = self._line_points
+        self._score_heap = [(-score, self._center_dist_sq[index], index % n, index // n)
+                            for index, score in enumerate(self._cell_scores) if score is not None]
+        heapq.heapify(self._score_heap)
+
+    def _get_point_score(self, point):
+        score = 0
+        for os in offset:
+            score += self._get_direction_score(point, os[0], os[1])
+        # Add a small bonus for center positions
+        center_bonus = 0
+        center_dist_sq = (point.X - self._line_points // 2)**2 + (point.Y - self._line_points // 2)**2
+        max_dist_sq = (self._line_points // 2)**2 * 2
+        center_bonus = (1 - (center_dist_sq / max_dist_sq)) * 5 # Max bonus of 5 for exact center
+        return score + center_bonus
+
+    # --- Scoring logic based on counts and blocking ---
+    # (This detailed scoring logic seems complex and might need tweaking for balance)
+    # Keeping the original scoring logic for now. 
+    def _get_direction_score(self, point, x_offset, y_offset):
+        return max(self._get_direction_scores(point, x_offset, y_offset))
+
+    def _get_direction_scores(self, point, x_offset, y_offset):
+        """Returns (my_score, opp_score): what a stone here is worth to me, and what it blocks."""
+        line, shift = self._cell_lines[point.Y * self._line_points + point.X][_DIRECTION_INDEX[x_offset, y_offset]]
+        window = (self._lines[line] >> (shift - 8)) & WINDOW_MASK
+        return self._my_score_table[window], self._opp_score_table[window]
+
+    def _scan_direction_scores(self, point, x_offset, y_offset):
+        """
+        Reference version of _get_direction_scores that walks the board cell by cell.
+        The pattern tables reproduce it exactly (checked by bench_patterns.py).
+        """
+        count = 0   # My continuous stones including the potential drop point (starts at 1 conceptually)
+        _count = 0  # Opponent continuous stones adjacent to potential drop point
+        my_blocked = 0    # Ends blocked for my potential line
+        opp_blocked = 0   # Ends blocked for opponent's adjacent line
+
+        # Check one direction
+        live_ends_my = 0
+        empty_in_line_my = 0
+        consecutive_my = 0
+        for i in range(1, 5): # Check up to 4 spaces away for potential 5-in-a-row
+            x = point.X + i * x_offset
+            y = point.Y + i * y_offset
+            if 0 <= x < self._line_points and 0 <= y < self._line_points:
+                if self._checkerboard[y][x] == self._my.Value:
+                    consecutive_my += 1
+                elif self._checkerboard[y][x] == 0:
+                    live_ends_my +=1
+                    break # Found an empty space, line is 'live' on this end
+                else: # Opponent's stone
+                    my_blocked += 1
+                    break # Blocked on this end
+            else: # Off board
+                my_blocked += 1
+                break
+        count += consecutive_my
+        
+        # Check opposite direction
+        consecutive_my = 0 # Reset for opposite direction
+        for i in range(1, 5):
+            x = point.X - i * x_offset
+            y = point.Y - i * y_offset
+            if 0 <= x < self._line_points and 0 <= y < self._line_points:
+                if self._checkerboard[y][x] == self._my.Value:
+                     consecutive_my += 1
+                elif self._checkerboard[y][x] == 0:
+                    live_ends_my += 1
+                    break
+                else:
+                    my_blocked += 1
+                    break
+            else:
+                my_blocked += 1
+                break
+        count += consecutive_my
+
+        # --- Calculate My Score based on count and blocks ---
+        # (Using original game's logic structure for scoring mapping)
+        # This needs careful mapping to prioritize winning/blocking moves
+        my_score = 0
+        if count >= 4: # Forms 5-in-a-row
+             my_score = MY_FIVE_SCORE
+        elif count == 3: 
+             if live_ends_my == 2: my_score = 1000 # Live four
+             elif live_ends_my == 1: my_score = 100 # Dead four
+        elif count == 2:
+             if live_ends_my == 2: my_score = 100 # Live three
+             elif live_ends_my == 1: my_score = 10 # Dead three
+        elif count == 1:
+             if live_ends_my == 2: my_score = 10 # Live two
+             elif live_ends_my == 1: my_score = 1 # Dead two
+        
+        # --- Check Opponent Threat ---
+        # Check opponent's potential lines if we *don't* place here
+        # This is complex - the original code seems to calculate this differently.
+        # Let's adapt the opponent check similar to how 'my' check was done.
+        
+        live_ends_opp = 0
+        consecutive_opp = 0
+        # Check one direction for opponent stones adjacent to the potential drop point
+        for i in range(1, 5): 
+            x = point.X + i * x_offset
+            y = point.Y + i * y_offset
+            if 0 <= x < self._line_points and 0 <= y < self._line_points:
+                if self._checkerboard[y][x] == self._opponent.Value:
+                    consecutive_opp += 1
+                elif self._checkerboard[y][x] == 0:
+                    live_ends_opp +=1
+                    break 
+                else: # My stone
+                    opp_blocked += 1
+                    break 
+            else: # Off board
+                opp_blocked += 1
+                break
+        _count += consecutive_opp
+
+        # Check opposite direction for opponent
+        consecutive_opp = 0 
+        for i in range(1, 5):
+            x = point.X - i * x_offset
+            y = point.Y - i * y_offset
+            if 0 <= x < self._line_points and 0 <= y < self._line_points:
+                if self._checkerboard[y][x] == self._opponent.Value:
+                     consecutive_opp += 1
+                elif self._checkerboard[y][x] == 0:
+                    live_ends_opp += 1
+                    break
+                else:
+                    opp_blocked += 1
+                    break
+            else:
+                opp_blocked += 1
+                break
+        _count += consecutive_opp
+        
+        # --- Calculate Opponent Score (Threat level) ---
+        opp_score = 0
+        if _count >= 4: # Block opponent's 5-in-a-row
+             opp_score = OPP_FIVE_SCORE
+        elif _count == 3: 
+             if live_ends_opp == 2: opp_score = 900 # Block live four
+             elif live_ends_opp == 1: opp_score = 90 # Block dead four
+        elif _count == 2:
+             if live_ends_opp == 2: opp_score = 90 # Block live three
+             elif live_ends_opp == 1: opp_score = 9 # Block dead three
+        elif _count == 1:
+             if live_ends_opp == 2: opp_score = 9 # Block live two
+             # elif live_ends_opp == 1: opp_score = 1 # Block dead two (less important)
+
+        # The caller takes the higher score (either my offensive score or defensive score)
+        return my_score, opp_score
+
+
+    # This helper seems unused or less useful with the revised scoring logic
+    def _get_stone_color(self, point, x_offset, y_offset, next):
+        x = point.X + x_offset
+        y = point.Y + y_offset
+        if 0 <= x < self._line_points and 0 <= y < self._line_points:
+            if self._checkerboard[y][x] == self._my.Value:
+                return 1
+            elif self._checkerboard[y][x] == self._opponent.Value:
+                return 2
+            else: # Empty
+                 # Original logic recursively checked next empty, might be complex/slow
+                 return 0 
+        else: # Off board
+            return -1 # Indicate blocked/off board
@@ -0,0 +1,196 @@
+import queue
+import threading
+from collections import namedtuple
+
+from checkerboard import Point, BLACK_CHESSMAN, WHITE_CHESSMAN
+
+# What the workers post back to the UI thread
+AIMove = namedtuple('AIMove', 'point pondered stats')
+PonderEntry = namedtuple('PonderEntry', 'point complete stats')
+# One completed depth of an analysis: lines are (score, point) for the side to move, best first
+Analysis = namedtuple('Analysis', 'generation value depth lines nodes elapsed_ms')
+
+
+class AIWorker:
+    """
+    Runs an AI on a background thread so the pygame loop never blocks on AI_drop.
+
+    The UI thread only talks to the worker through queues: opponent_moved() and
+    request_move() enqueue commands, poll() returns the finished AIMove (or None) and
+    never waits. The AI object itself is only ever touched by the worker thread.
+
+    With a SearchAI, the worker ponders while the human thinks: it searches replies to
+    the `ponder_moves` most likely human moves and keeps the results. Any new command
+    interrupts pondering immediately; if the human played one of the pondered moves and
+    that search had finished, the stored reply is played without searching again.
+    """
+
+    def __init__(self, ai, ponder=True, ponder_moves=3):
+        self._ai = ai
+        self._ponder = ponder and hasattr(ai, 'search')
+        self._ponder_moves = ponder_moves
+        self._requests = queue.Queue()
+        self._results = queue.Queue()
+        self._ponder_cache = {}
+        self._ready_reply = None
+        self.thinking = False
+        self.ponder_hits = 0
+        if self._ponder:
+            # Pondering searches stop as soon as the UI sends anything
+            ai.should_stop = lambda: not self._requests.empty()
+        self._thread = threading.Thread(target=self._run, name='gobang-ai', daemon=True)
+        self._thread.start()
+
+    # --- UI thread API ---
+    def opponent_moved(self, point):
+        """Tells the AI about the human's move (replaces calling get_opponent_drop directly)."""
+        self._requests.put(('opponent', point))
+
+    def request_move(self):
+        """Starts thinking about the AI's move; collect it later with poll()."""
+        self.thinking = True
+        self._requests.put(('think', None))
+
+    def poll(self):
+        """Returns the AI's AIMove if it has finished thinking, otherwise None. Never blocks."""
+        try:
+            move = self._results.get_nowait()
+        except queue.Empty:
+            return None
+        self.thinking = False
+        return move
+
+    def close(self):
+        """Cancels any running search, stops the worker thread and releases the AI's resources."""
+        if hasattr(self._ai, 'cancel'):
+            self._ai.cancel()
+        self._requests.put(('stop', None))
+        self._thread.join(timeout=2)
+        if hasattr(self._ai, 'close'):
+            self._ai.close()  # e.g. the process pool of a ParallelSearchAI
+
+    # --- Worker thread ---
+    def _run(self):
+        while True:
+            command, point = self._requests.get()
+            if command == 'stop':
+                return
+            if command == 'opponent':
+                self._ai.get_opponent_drop(point)
+                self._ready_reply = self._ponder_cache.get(point)
+                self._ponder_cache.clear()
+            elif command == 'think':
+                self._results.put(self._think())
+                if self._ponder:
+                    self._ponder_replies()
+
+    def _think(self):
+        reply = self._ready_reply
+        self._ready_reply = None
+        if reply is not None and reply.complete and reply.point is not None:
+            # Pondering already searched this exact position to completion
+            self.ponder_hits += 1
+            self._ai._play(reply.point)
+            print(f"AI chooses: ({reply.point.X}, {reply.point.Y}) (ponder hit)")
+            return AIMove(reply.point, True, reply.stats)
+        point = self._ai.AI_drop()
+        return AIMove(point, False, getattr(self._ai, 'stats', None))
+
+    def _ponder_replies(self):
+        """Searches the AI's reply to each likely human move until a command arrives."""
+        ai = self._ai
+        for guess in ai.candidate_moves(self._ponder_moves):
+            if not self._requests.empty():
+                return
+            ai._place(guess, ai._opponent.Value)
+            try:
+                point = ai.search()
+            finally:
+                ai._remove(guess)
+            self._ponder_cache[guess] = PonderEntry(point, not ai.interrupted, ai.stats)
+            if ai.interrupted:
+                return
+
+
+class AnalysisWorker:
+    """
+    Analyses the game's position on a background thread while people play (hints, PvP).
+
+    The UI thread calls set_position() with the move stack whenever a stone is placed or
+    taken back. The running analysis stops at its next time check (the search polls for
+    new commands) and one of the new position starts, deepening until `max_depth`.
+    Each completed depth is posted as an Analysis; poll() returns the latest one for the
+    current position and drops results of earlier positions, so nothing stale is shown.
+
+    The SearchAI is built and only ever used on the worker thread. Black moves first and
+    the sides alternate, as in every Gobang mode here.
+    """
+
+    def __init__(self, line_points, top_n=3, max_depth=8, renju=False):
+        self.line_points = line_points
+        self._top_n = top_n
+        self._max_depth = max_depth
+        self._renju = renju
+        self._requests = queue.Queue()
+        self._results = queue.Queue()
+        self._generation = 0
+        self._latest = None
+        self._thread = threading.Thread(target=self._run, name='gobang-analysis', daemon=True)
+        self._thread.start()
+
+    # --- UI thread API ---
+    def set_position(self, moves):
+        """Restarts the analysis on the position after 'moves' (points, black first)."""
+        self._generation += 1
+        self._latest = None
+        self._requests.put(('position', self._generation, list(moves)))
+
+    def poll(self):
+        """The latest Analysis of the current position, or None before its first depth. Never blocks."""
+        while True:
+            try:
+                analysis = self._results.get_nowait()
+            except queue.Empty:
+                return self._latest
+            if analysis.generation == self._generation:
+                self._latest = analysis
+
+    def close(self):
+        self._requests.put(('stop', 0, None))
+        self._thread.join(timeout=2)
+
+    # --- Worker thread ---
+    def _run(self):
+        # Imported here so that loading this module stays cheap for the AI-vs-human mode
+        from search import SearchAI
+        ai = SearchAI(self.line_points, BLACK_CHESSMAN, max_depth=self._max_depth, threat_search=False)
+        if self._renju:
+            ai.enable_renju()
+        ai.should_stop = lambda: not self._requests.empty()
+        while True:
+            command, generation, moves = self._requests.get()
+            if command == 'stop':
+                return
+            if not self._requests.empty():
+                continue  # Already replaced by a newer position
+            self._set_board(ai, moves)
+            value = BLACK_CHESSMAN.Value if len(moves) % 2 == 0 else WHITE_CHESSMAN.Value
+
+            def report(depth, lines):
+                stats = ai.stats
+                self._results.put(Analysis(generation, value, depth, [(score, Point(p.X, p.Y)) for score, p in lines],
+                                           stats.nodes, stats.elapsed_ms))
+
+            ai.analyze(value, self._top_n, report)
+
+    @staticmethod
+    def _set_board(ai, moves):
+        """Brings the AI's board to 'moves', undoing and replaying only the moves that differ."""
+        applied = [point for point, _ in ai._applied]
+        common = 0
+        while common < min(len(applied), len(moves)) and applied[common] == moves[common]:
+            common += 1
+        for _ in range(len(applied) - common):
+            ai._remove(applied.pop())
+        for ply, point in enumerate(moves[common:], common):
+            ai._place(point, BLACK_CHESSMAN.Value if ply % 2 == 0 else WHITE_CHESSMAN.Value)
@@ -0,0 +1,102 @@
+"""
+Batch statistics over game record archives (game_record.py).
+
+Streams every record once, so memory use depends only on the number of distinct
+openings and game lengths, not on the size of the archive. Reports the results by
+game mode, the game length distribution, and the win rates of the most played
+openings. Openings are the first --opening-moves stones, merged over the 8 board
+symmetries and shown relative to the center (0,0).
+
+Usage: python analyze_records.py [FILE ...] [--opening-moves 3] [--top 10] [--mode pvp|pvai|aivai]
+"""
+import argparse
+import time
+from collections import Counter, defaultdict
+
+from checkerboard import BLACK_CHESSMAN, WHITE_CHESSMAN
+from game_record import GAME_LOG, MODE_PVP, MODE_PVAI, MODE_AIVAI, NO_WINNER, read_records
+from opening_book import symmetry_maps
+
+MODES = {'pvp': MODE_PVP, 'pvai': MODE_PVAI, 'aivai': MODE_AIVAI}
+MODE_NAMES = {value: name for name, value in MODES.items()}
+RESULT_NAMES = {BLACK_CHESSMAN.Value: 'black', WHITE_CHESSMAN.Value: 'white', NO_WINNER: 'none'}
+
+
+def canonical_opening(line_points, moves):
+    """The smallest of the 8 symmetric versions of a move sequence, as a tuple of cell indices."""
+    forward, _ = symmetry_maps(line_points)
+    return min(tuple(cells[move] for move in moves) for cells in forward)
+
+
+def describe_opening(line_points, opening):
+    center = line_points // 2
+    return ' '.join(f'({cell % line_points - center},{cell // line_points - center})' for cell in opening)
+
+
+def percent(part, whole):
+    return f'{part / whole:.1%}' if whole else '-'
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('files', nargs='*', default=[GAME_LOG], metavar='FILE')
+    parser.add_argument('--opening-moves', type=int, default=3)
+    parser.add_argument('--top', type=int, default=10, help='openings to list')
+    parser.add_argument('--mode', choices=MODES, help='only games of this mode')
+    args = parser.parse_args()
+
+    mode_filter = MODES.get(args.mode)
+    results = defaultdict(Counter)   # mode -> result -> games
+    lengths = Counter()              # stones -> games
+    openings = defaultdict(Counter)  # (line_points, opening) -> result -> games
+    games = 0
+    start = time.perf_counter()
+    for path in args.files:
+        for record in read_records(path):
+            if mode_filter is not None and record.mode != mode_filter:
+                continue
+            games += 1
+            results[record.mode][record.result] += 1
+            lengths[len(record.moves)] += 1
+            if len(record.moves) >= args.opening_moves:
+                opening = canonical_opening(record.line_points, record.moves[:args.opening_moves])
+                openings[(record.line_points, opening)][record.result] += 1
+    elapsed = time.perf_counter() - start
+    print(f'{games} games read in {elapsed:.2f} s ({games / elapsed if elapsed else 0:.0f} records/s)')
+    if not games:
+        return
+
+    print(f'\n{"mode":<8}{"games":>9}{"black":>9}{"white":>9}{"none":>9}')
+    for mode in sorted(results):
+        counts = results[mode]
+        total = sum(counts.values())
+        print(f'{MODE_NAMES.get(mode, mode):<8}{total:>9}'
+              + ''.join(f'{percent(counts[r], total):>9}' for r in RESULT_NAMES))
+
+    total_stones = sum(length * count for length, count in lengths.items())
+    # Median from the counts, without keeping every length
+    seen, median = 0, 0
+    for length in sorted(lengths):
+        seen += lengths[length]
+        if seen * 2 >= games:
+            median = length
+            break
+    print(f'\ngame length: mean {total_stones / games:.1f}, median {median}, '
+          f'min {min(lengths)}, max {max(lengths)} stones')
+    buckets = Counter()
+    for length, count in lengths.items():
+        buckets[length // 10 * 10] += count
+    widest = max(buckets.values())
+    for bucket in sorted(buckets):
+        bar = '#' * max(1, round(buckets[bucket] / widest * 40))
+        print(f'{bucket:>4}-{bucket + 9:<4}{buckets[bucket]:>9}  {bar}')
+
+    print(f'\n{"opening (first " + str(args.opening_moves) + " stones)":<40}{"games":>8}{"black":>9}{"white":>9}{"none":>9}')
+    for (line_points, opening), counts in sorted(openings.items(), key=lambda item: -sum(item[1].values()))[:args.top]:
+        total = sum(counts.values())
+        print(f'{describe_opening(line_points, opening):<40}{total:>8}'
+              + ''.join(f'{percent(counts[r], total):>9}' for r in RESULT_NAMES))
+
+
+if __name__ == '__main__':
+    main()
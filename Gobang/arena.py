@@ -0,0 +1,167 @@
+"""
+Headless AI-vs-AI arena: plays two AI configurations against each other without pygame.
+
+Each player is an engine name from engines.py followed by constructor options, e.g.
+    search:time_limit_ms=200,beam_width=8
+    mcts:time_limit_ms=200,exploration=1.0
+    greedy (the original one-ply AI, the baseline)
+Colors alternate every game, and with --opening-stones each pair of games starts from
+the same random opening, once with each color. Games run in worker processes. The
+result is reported as A's win/draw/loss, an Elo difference with a 95% interval, the
+average move latency of each side and games per second.
+
+Usage: python arena.py A B [--games N] [--workers W] [--opening-stones K] [--seed S] [--record FILE]
+"""
+import argparse
+import ast
+import contextlib
+import io
+import math
+import os
+import random
+import time
+from collections import namedtuple
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+from checkerboard import Checkerboard, Point, BLACK_CHESSMAN, WHITE_CHESSMAN
+from engines import create_ai, ENGINES
+from game_record import append_record, MODE_AIVAI, NO_WINNER
+
+Line_Points = 19
+
+GameResult = namedtuple('GameResult', 'game winner moves a_ms a_moves b_ms b_moves stones')
+
+
+def parse_player(text):
+    """'engine:key=value,...' -> (engine, options); values are Python literals."""
+    engine, _, options_text = text.partition(':')
+    if engine not in ENGINES:
+        raise argparse.ArgumentTypeError(f"unknown engine '{engine}', expected one of: {', '.join(ENGINES)}")
+    options = {}
+    for item in filter(None, options_text.split(',')):
+        key, _, value = item.partition('=')
+        try:
+            options[key.strip()] = ast.literal_eval(value.strip())
+        except (ValueError, SyntaxError):
+            options[key.strip()] = value.strip()
+    return engine, options
+
+
+def random_opening(stones, rng):
+    """'stones' distinct random points within 3 of the center."""
+    center = Line_Points // 2
+    opening = []
+    while len(opening) < stones:
+        point = Point(center + rng.randint(-3, 3), center + rng.randint(-3, 3))
+        if point not in opening:
+            opening.append(point)
+    return opening
+
+
+def play_game(game, player_a, player_b, a_is_black, opening, max_moves):
+    """Plays one game on a shared board; returns a GameResult ('a', 'b' or None for a draw)."""
+    board = Checkerboard(Line_Points, quiet=True)
+    black_spec, white_spec = (player_a, player_b) if a_is_black else (player_b, player_a)
+    players = {BLACK_CHESSMAN.Value: create_ai(Line_Points, BLACK_CHESSMAN, black_spec[0], checkerboard=board, **black_spec[1]),
+               WHITE_CHESSMAN.Value: create_ai(Line_Points, WHITE_CHESSMAN, white_spec[0], checkerboard=board, **white_spec[1])}
+    think_ms = {BLACK_CHESSMAN.Value: 0.0, WHITE_CHESSMAN.Value: 0.0}
+    thought = {BLACK_CHESSMAN.Value: 0, WHITE_CHESSMAN.Value: 0}
+    chessman = BLACK_CHESSMAN
+    winner = None
+    try:
+        with contextlib.redirect_stdout(io.StringIO()):
+            for ply in range(min(max_moves, Line_Points * Line_Points)):
+                if ply < len(opening):
+                    point = opening[ply]
+                else:
+                    start = time.perf_counter()
+                    point = players[chessman.Value].AI_drop()
+                    think_ms[chessman.Value] += (time.perf_counter() - start) * 1000
+                    thought[chessman.Value] += 1
+                    if point is None or not board.can_drop(point):
+                        break  # No legal move left: draw
+                if board.drop(chessman, point):
+                    winner = chessman.Value
+                    break
+                chessman = WHITE_CHESSMAN if chessman is BLACK_CHESSMAN else BLACK_CHESSMAN
+    finally:
+        for player in players.values():
+            if hasattr(player, 'close'):
+                player.close()
+    a_value = BLACK_CHESSMAN.Value if a_is_black else WHITE_CHESSMAN.Value
+    b_value = 3 - a_value
+    result = None if winner is None else 'a' if winner == a_value else 'b'
+    return GameResult(game, result, len(board.moves), think_ms[a_value], thought[a_value],
+                      think_ms[b_value], thought[b_value], list(board.moves))
+
+
+def elo_estimate(wins, draws, losses):
+    """Elo difference of A over B and its 95% interval, from the per-game score variance."""
+    games = wins + draws + losses
+    score = (wins + draws / 2) / games
+    variance = (wins * (1 - score) ** 2 + draws * (0.5 - score) ** 2 + losses * score ** 2) / games
+    margin = 1.96 * math.sqrt(variance / games)
+
+    def to_elo(p):
+        if p <= 0:
+            return -math.inf
+        if p >= 1:
+            return math.inf
+        return -400 * math.log10(1 / p - 1)
+
+    return to_elo(score), to_elo(score - margin), to_elo(score + margin)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('a', type=parse_player, help="player A, e.g. 'search:time_limit_ms=200'")
+    parser.add_argument('b', type=parse_player, help="player B, e.g. 'mcts:time_limit_ms=200'")
+    parser.add_argument('--games', type=int, default=20)
+    parser.add_argument('--workers', type=int, default=os.cpu_count() or 1)
+    parser.add_argument('--opening-stones', type=int, default=2, help='random stones before the AIs take over (0 for none)')
+    parser.add_argument('--max-moves', type=int, default=Line_Points * Line_Points, help='stones after which a game is a draw')
+    parser.add_argument('--seed', type=int, default=1)
+    parser.add_argument('--record', metavar='FILE', help='append every game to this game record log (game_record.py)')
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    tasks = []
+    for game in range(args.games):
+        if game % 2 == 0:
+            opening = random_opening(args.opening_stones, rng)
+        tasks.append((game, args.a, args.b, game % 2 == 0, opening, args.max_moves))
+
+    print(f'A = {args.a[0]} {args.a[1]}\nB = {args.b[0]} {args.b[1]}')
+    print(f'{args.games} games, {args.workers} worker processes, {args.opening_stones} random opening stones')
+    results = []
+    start = time.perf_counter()
+    with ProcessPoolExecutor(max_workers=args.workers) as pool:
+        futures = [pool.submit(play_game, *task) for task in tasks]
+        for future in as_completed(futures):
+            result = future.result()
+            results.append(result)
+            outcome = {'a': 'A wins', 'b': 'B wins', None: 'draw'}[result.winner]
+            a_color = 'black' if result.game % 2 == 0 else 'white'
+            print(f'game {result.game + 1:>3} (A {a_color}): {outcome} after {result.moves} stones')
+            if args.record:
+                a_is_black = result.game % 2 == 0
+                winner = (NO_WINNER if result.winner is None
+                          else BLACK_CHESSMAN.Value if (result.winner == 'a') == a_is_black else WHITE_CHESSMAN.Value)
+                append_record(MODE_AIVAI, Line_Points, winner, result.stones, args.record)
+    elapsed = time.perf_counter() - start
+
+    wins = sum(r.winner == 'a' for r in results)
+    losses = sum(r.winner == 'b' for r in results)
+    draws = len(results) - wins - losses
+    elo, low, high = elo_estimate(wins, draws, losses)
+    a_moves = sum(r.a_moves for r in results)
+    b_moves = sum(r.b_moves for r in results)
+    print(f'\nA vs B: +{wins} ={draws} -{losses}  (score {(wins + draws / 2) / len(results):.1%})')
+    print(f'Elo A - B: {elo:+.0f}  (95% interval {low:+.0f} .. {high:+.0f})')
+    print(f'average move latency: A {sum(r.a_ms for r in results) / max(a_moves, 1):.1f} ms, '
+          f'B {sum(r.b_ms for r in results) / max(b_moves, 1):.1f} ms')
+    print(f'{len(results) / elapsed:.3f} games/s ({elapsed:.1f} s wall)')
+
+
+if __name__ == '__main__':
+    main()
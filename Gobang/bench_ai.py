@@ -0,0 +1,91 @@
+"""
+Benchmark: cached greedy AI vs the original full-board scan.
+
+Plays the AI against a random opponent that drops near existing stones. Before every AI
+move the original 361-cell scan is replayed on the same board, so the benchmark both
+times the two selections and checks that they choose the same point.
+
+Usage: python bench_ai.py [--games N] [--moves M] [--seed S]
+"""
+import argparse
+import contextlib
+import io
+import random
+import time
+
+from checkerboard import Point, BLACK_CHESSMAN, WHITE_CHESSMAN
+from ai import AI
+
+Line_Points = 19
+
+
+def full_scan_drop(ai):
+    """The original AI_drop selection loop: score every empty cell, keep the best."""
+    point = None
+    score = -1
+    center = ai._line_points // 2
+    for i in range(ai._line_points):
+        for j in range(ai._line_points):
+            if ai._checkerboard[j][i] == 0:
+                _score = ai._get_point_score(Point(i, j))
+                is_better_tiebreak = False
+                if _score == score and point is not None:
+                    dist_sq_new = (i - center) ** 2 + (j - center) ** 2
+                    dist_sq_old = (point.X - center) ** 2 + (point.Y - center) ** 2
+                    is_better_tiebreak = dist_sq_new < dist_sq_old
+                if _score > score or is_better_tiebreak:
+                    score = _score
+                    point = Point(i, j)
+    return point
+
+
+def _random_reply(board, rng):
+    stones = [(x, y) for y in range(Line_Points) for x in range(Line_Points) if board[y][x]]
+    while True:
+        x, y = rng.choice(stones) if stones else (Line_Points // 2, Line_Points // 2)
+        x += rng.randint(-2, 2)
+        y += rng.randint(-2, 2)
+        if 0 <= x < Line_Points and 0 <= y < Line_Points and board[y][x] == 0:
+            return Point(x, y)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--games', type=int, default=10)
+    parser.add_argument('--moves', type=int, default=40, help='AI moves per game')
+    parser.add_argument('--seed', type=int, default=7)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    scan_time = cached_time = 0.0
+    moves = mismatches = 0
+    sink = io.StringIO()
+    for _ in range(args.games):
+        ai = AI(Line_Points, WHITE_CHESSMAN)
+        for _ in range(args.moves):
+            reply = _random_reply(ai._checkerboard, rng)
+            ai.get_opponent_drop(reply)
+
+            start = time.perf_counter()
+            expected = full_scan_drop(ai)
+            scan_time += time.perf_counter() - start
+
+            start = time.perf_counter()
+            with contextlib.redirect_stdout(sink):
+                point = ai.AI_drop()
+            cached_time += time.perf_counter() - start
+
+            moves += 1
+            if point != expected:
+                mismatches += 1
+            sink.seek(0)
+            sink.truncate()
+
+    print(f'{moves} AI moves over {args.games} games ({BLACK_CHESSMAN.Name} plays randomly)')
+    print(f'full-board scan: {scan_time / moves * 1000:8.3f} ms/move')
+    print(f'cached scores:   {cached_time / moves * 1000:8.3f} ms/move  (x{scan_time / cached_time:.1f})')
+    print(f'mismatched moves: {mismatches}')
+
+
+if __name__ == '__main__':
+    main()
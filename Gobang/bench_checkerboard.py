@@ -0,0 +1,93 @@
+"""
+Microbenchmark: list-of-lists Checkerboard vs BitboardCheckerboard vs SparseCheckerboard.
+
+Usage: python bench_checkerboard.py [--games N] [--seed S]
+"""
+import argparse
+import contextlib
+import io
+import random
+import time
+
+from checkerboard import Checkerboard, Point, BLACK_CHESSMAN, WHITE_CHESSMAN
+from bitboard import BitboardCheckerboard
+from sparse_board import SparseCheckerboard
+
+Line_Points = 19
+
+
+def _random_games(games, seed):
+    rng = random.Random(seed)
+    cells = [Point(x, y) for y in range(Line_Points) for x in range(Line_Points)]
+    sequences = []
+    for _ in range(games):
+        sequence = cells[:]
+        rng.shuffle(sequence)
+        sequences.append(sequence)
+    return sequences
+
+
+def bench_drops(board_cls, sequences):
+    """Fills the whole board once per game; returns drops per second."""
+    sink = io.StringIO()
+    drops = 0
+    start = time.perf_counter()
+    with contextlib.redirect_stdout(sink):
+        for sequence in sequences:
+            board = board_cls(Line_Points)
+            chessman = BLACK_CHESSMAN
+            for point in sequence:
+                board.drop(chessman, point)
+                chessman = WHITE_CHESSMAN if chessman is BLACK_CHESSMAN else BLACK_CHESSMAN
+            drops += len(sequence)
+            sink.seek(0)
+            sink.truncate()
+    return drops / (time.perf_counter() - start)
+
+
+def bench_win_checks(board_cls, sequences):
+    """Runs _win on every stone of half-filled boards; returns checks per second and the win count."""
+    sink = io.StringIO()
+    boards = []
+    with contextlib.redirect_stdout(sink):
+        for sequence in sequences:
+            board = board_cls(Line_Points)
+            chessman = BLACK_CHESSMAN
+            for point in sequence[:len(sequence) // 2]:
+                board.drop(chessman, point)
+                chessman = WHITE_CHESSMAN if chessman is BLACK_CHESSMAN else BLACK_CHESSMAN
+            boards.append((board, sequence[:len(sequence) // 2]))
+
+    checks = wins = 0
+    start = time.perf_counter()
+    for board, points in boards:
+        for point in points:
+            if board._win(point):
+                wins += 1
+        checks += len(points)
+    return checks / (time.perf_counter() - start), wins
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--games', type=int, default=200)
+    parser.add_argument('--seed', type=int, default=2048)
+    args = parser.parse_args()
+
+    sequences = _random_games(args.games, args.seed)
+    print(f'{args.games} games on a {Line_Points}x{Line_Points} board')
+    print(f'{"backend":<22}{"drops/s":>14}{"win checks/s":>16}{"wins":>8}')
+    results = {}
+    for name, board_cls in (('Checkerboard', Checkerboard), ('BitboardCheckerboard', BitboardCheckerboard),
+                            ('SparseCheckerboard', SparseCheckerboard)):
+        drops = bench_drops(board_cls, sequences)
+        checks, wins = bench_win_checks(board_cls, sequences)
+        results[name] = (drops, checks)
+        print(f'{name:<22}{drops:>14,.0f}{checks:>16,.0f}{wins:>8}')
+    base_drops, base_checks = results['Checkerboard']
+    fast_drops, fast_checks = results['BitboardCheckerboard']
+    print(f'speedup: drops x{fast_drops / base_drops:.2f}, win checks x{fast_checks / base_checks:.2f}')
+
+
+if __name__ == '__main__':
+    main()
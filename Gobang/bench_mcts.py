@@ -0,0 +1,54 @@
+"""
+Benchmark: playouts per second and tree memory of the MCTS engine (mcts.py).
+
+Each batch size runs a fixed number of playouts on the same mid-game positions (see
+bench_search.py) and reports playouts per second, tree nodes, and tree memory per
+10k playouts. Tree memory is the summed sys.getsizeof of the nodes and their lists;
+`traced` is the tracemalloc peak of the whole search for comparison.
+
+Usage: python bench_mcts.py [--playouts 10000] [--batches 1,8,32] [--positions N]
+"""
+import argparse
+import tracemalloc
+
+from checkerboard import BLACK_CHESSMAN, WHITE_CHESSMAN
+from bench_search import make_positions, Line_Points
+from mcts import MCTSAI
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--playouts', type=int, default=10000, help='playouts per search')
+    parser.add_argument('--batches', default='1,8,32', help='comma-separated rollout batch sizes')
+    parser.add_argument('--positions', type=int, default=3)
+    parser.add_argument('--plies', type=int, default=16, help='stones on the board in each test position')
+    parser.add_argument('--seed', type=int, default=3)
+    args = parser.parse_args()
+
+    positions = make_positions(args.positions, args.plies, args.seed)
+    print(f'{len(positions)} positions with {args.plies} stones each, {args.playouts} playouts per search')
+    print(f'{"batch":>6}{"playouts/s":>12}{"tree nodes":>12}{"KiB/10k":>10}{"traced KiB/10k":>16}')
+    for batch_size in (int(b) for b in args.batches.split(',')):
+        playouts, elapsed, nodes, tree_bytes, traced = 0, 0.0, 0, 0, 0
+        for moves in positions:
+            side = BLACK_CHESSMAN if len(moves) % 2 == 0 else WHITE_CHESSMAN
+            ai = MCTSAI(Line_Points, side, time_limit_ms=10 ** 9, batch_size=batch_size,
+                        max_playouts=args.playouts, seed=args.seed)
+            for i, point in enumerate(moves):
+                ai._place(point, BLACK_CHESSMAN.Value if i % 2 == 0 else WHITE_CHESSMAN.Value)
+            tracemalloc.start()
+            ai.search()
+            traced += tracemalloc.get_traced_memory()[1]
+            tracemalloc.stop()
+            ai.search()  # Timed without tracemalloc overhead
+            playouts += ai.stats.playouts
+            elapsed += ai.stats.elapsed_ms
+            nodes += ai.stats.tree_nodes
+            tree_bytes += ai.stats.tree_bytes
+        count = len(positions)
+        print(f'{batch_size:>6}{int(playouts / elapsed * 1000):>12}{nodes // count:>12}'
+              f'{tree_bytes * 10000 / playouts / 1024:>10.1f}{traced * 10000 / playouts / 1024:>16.1f}')
+
+
+if __name__ == '__main__':
+    main()
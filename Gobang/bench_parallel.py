@@ -0,0 +1,70 @@
+"""
+Benchmark: scaling of the root-parallel search (parallel.py) with the number of worker processes.
+
+For each worker count the same mid-game positions are searched under the same time
+budget. Reported per count: total nodes per second over all workers, the depth every
+worker completed, and move quality as the share of moves that match a reference
+single-process search given `--reference-factor` times the budget.
+
+Usage: python bench_parallel.py [--workers 1,2,4,8] [--budget 1000] [--positions N]
+"""
+import argparse
+import contextlib
+import io
+import os
+
+from checkerboard import BLACK_CHESSMAN, WHITE_CHESSMAN
+from bench_search import make_positions, _searcher_for, Line_Points
+from parallel import ParallelSearchAI
+
+
+def _load(ai, moves):
+    """Sets up the position after 'moves' on a long-lived ParallelSearchAI."""
+    while ai._board.moves:
+        ai._remove(ai._board.moves[-1])
+    for i, point in enumerate(moves):
+        ai._place(point, BLACK_CHESSMAN.Value if i % 2 == 0 else WHITE_CHESSMAN.Value)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--workers', default='1,2,4,8', help='comma-separated worker counts')
+    parser.add_argument('--budget', type=int, default=1000, help='time limit per move in ms')
+    parser.add_argument('--positions', type=int, default=5)
+    parser.add_argument('--plies', type=int, default=16, help='stones on the board in each test position (even)')
+    parser.add_argument('--reference-factor', type=int, default=4)
+    parser.add_argument('--seed', type=int, default=3)
+    args = parser.parse_args()
+
+    positions = make_positions(args.positions, args.plies - args.plies % 2, args.seed)
+    print(f'{len(positions)} positions, {args.budget} ms per move, {os.cpu_count()} CPUs')
+    references = []
+    for moves in positions:
+        searcher = _searcher_for(moves, time_limit_ms=args.budget * args.reference_factor, threat_search=False)
+        references.append(searcher.search())
+
+    print(f'{"workers":>8}{"avg depth":>11}{"avg nodes":>11}{"nodes/s":>10}{"speedup":>9}{"same move":>11}')
+    base_nps = None
+    for workers in (int(w) for w in args.workers.split(',')):
+        ai = ParallelSearchAI(Line_Points, BLACK_CHESSMAN, workers=workers,
+                              time_limit_ms=args.budget, threat_search=False)
+        depths, nodes, elapsed, matches = 0, 0, 0.0, 0
+        try:
+            with contextlib.redirect_stdout(io.StringIO()):
+                for moves, reference in zip(positions, references):
+                    _load(ai, moves)
+                    point = ai.search()
+                    depths += ai.stats.depth
+                    nodes += ai.stats.nodes
+                    elapsed += ai.stats.elapsed_ms
+                    matches += point == reference
+        finally:
+            ai.close()
+        nps = int(nodes / elapsed * 1000)
+        base_nps = base_nps or nps
+        print(f'{workers:>8}{depths / len(positions):>11.2f}{nodes // len(positions):>11}{nps:>10}'
+              f'{nps / base_nps:>8.2f}x{matches / len(positions):>11.0%}')
+
+
+if __name__ == '__main__':
+    main()
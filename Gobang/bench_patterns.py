@@ -0,0 +1,67 @@
+"""
+Benchmark: direction scores from the precomputed pattern tables (patterns.py) vs the
+cell-by-cell board walk they replace.
+
+For each test position and both colors, every empty cell and direction is scored with
+AI._get_direction_scores (table lookup) and AI._scan_direction_scores (board walk);
+they must agree everywhere. Timings are for a full-board evaluation, i.e. the four
+direction scores of every empty cell, as the original AI_drop scan did.
+
+Usage: python bench_patterns.py [--positions N] [--repeat R]
+"""
+import argparse
+import time
+
+from checkerboard import Point, offset, BLACK_CHESSMAN, WHITE_CHESSMAN
+from ai import AI
+from bench_search import make_positions, Line_Points
+from patterns import TABLE_FILE, build_tables
+
+
+def full_board(ai, score):
+    empty = [Point(x, y) for y in range(Line_Points) for x in range(Line_Points) if ai._checkerboard[y][x] == 0]
+    return [score(point, x_offset, y_offset) for point in empty for x_offset, y_offset in offset]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--positions', type=int, default=10)
+    parser.add_argument('--repeat', type=int, default=5, help='timed full-board evaluations per position and method')
+    parser.add_argument('--seed', type=int, default=3)
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    build_tables()
+    print(f'building the tables takes {(time.perf_counter() - start) * 1000:.0f} ms (cached in {TABLE_FILE})')
+
+    positions = (make_positions(args.positions // 2, 10, args.seed)
+                 + make_positions(args.positions - args.positions // 2, 30, args.seed))
+    mismatches = lookups = 0
+    scan_ms = table_ms = 0.0
+    for moves in positions:
+        for chessman in (BLACK_CHESSMAN, WHITE_CHESSMAN):
+            ai = AI(Line_Points, chessman)
+            for i, point in enumerate(moves):
+                ai._place(point, BLACK_CHESSMAN.Value if i % 2 == 0 else WHITE_CHESSMAN.Value)
+            start = time.perf_counter()
+            for _ in range(args.repeat):
+                expected = full_board(ai, ai._scan_direction_scores)
+            scan_ms += (time.perf_counter() - start) * 1000 / args.repeat
+            start = time.perf_counter()
+            for _ in range(args.repeat):
+                scores = full_board(ai, ai._get_direction_scores)
+            table_ms += (time.perf_counter() - start) * 1000 / args.repeat
+            mismatches += sum(a != b for a, b in zip(expected, scores))
+            lookups += len(scores)
+
+    count = len(positions) * 2
+    print(f'{len(positions)} positions x 2 colors, {lookups} direction scores, '
+          f'{"no" if not mismatches else mismatches} mismatches')
+    print(f'{"method":<16}{"ms per board":>14}{"ns per score":>14}')
+    print(f'{"board walk":<16}{scan_ms / count:>14.3f}{scan_ms * 1e6 / lookups:>14.0f}')
+    print(f'{"table lookup":<16}{table_ms / count:>14.3f}{table_ms * 1e6 / lookups:>14.0f}')
+    print(f'speedup: x{scan_ms / table_ms:.1f}')
+
+
+if __name__ == '__main__':
+    main()
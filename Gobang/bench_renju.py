@@ -0,0 +1,221 @@
+"""
+Benchmark: Renju forbidden-point detection (renju.py) on a corpus of known positions.
+
+Each corpus position is a small diagram (X black, O white, * the point tested for
+black) placed on a 19x19 RenjuCheckerboard stone by stone, so the answer comes from
+the incremental updates. Then random games check the incrementally kept forbidden set
+against a full rescan after every move and take-back, and time the updates, the O(1)
+lookup and the full rescan they replace. --search also compares the alpha-beta
+search's speed with and without Renju rules.
+
+Usage: python bench_renju.py [--games 20] [--seed 1] [--search]
+"""
+import argparse
+import random
+import time
+
+from checkerboard import Point, BLACK_CHESSMAN, WHITE_CHESSMAN
+from renju import RenjuCheckerboard, RenjuRules
+from search import SearchAI
+
+Line_Points = 19
+ORIGIN = Point(5, 5)  # Where the diagrams' top-left corner goes on the board
+
+# (name, diagram, whether * is forbidden for black)
+CORPUS = [
+    ('3-3', '''
+        ..X..
+        ..X..
+        XX*..''', True),
+    ('4-4', '''
+        ...X.
+        ...X.
+        ...X.
+        XXX*.''', True),
+    ('4-4 on one line', '''
+        X.X*X.X''', True),
+    ('overline', '''
+        XX*XXX''', True),
+    ('five with a 3-3', '''
+        ....X
+        ....X
+        XXXX*''', False),
+    ('five with an overline', '''
+        ....X
+        ....X
+        ....X
+        XXXX*
+        ....X
+        ....X''', False),
+    ('4-3', '''
+        ....X
+        ....X
+        OXXX*''', False),
+    ('straight four', '''
+        .XXX*.''', False),
+    ('3-3 with a split three', '''
+        ..X.
+        ....
+        ..X.
+        XX*.''', True),
+    ('blocked three is no three', '''
+        ...X.
+        ...X.
+        OXX*.''', False),
+    ('fake three: its four would need an overline', '''
+        .....X..
+        .....X..
+        XX.XX*..''', False),
+    ('4-3-3', '''
+        ..X.X....
+        ...XX....
+        OXXX*....''', True),
+    # The horizontal three's only straight-four point is right of *, and black there
+    # would also make a vertical four: a forbidden 4-4, so that three is fake
+    ('fake three: its four point is a 4-4', '''
+        ....X....
+        ....X....
+        O.XX*....
+        .....X...
+        .....X...
+        .....X...''', False),
+    # The same with a vertical three instead: the four point is an allowed 4-3
+    ('real three: its four point is a 4-3', '''
+        ....X....
+        ....X....
+        O.XX*....
+        .....X...
+        .....X...''', True),
+]
+
+
+def parse_diagram(diagram):
+    """Stones and the tested point of a diagram, in board coordinates: ({point: value}, point)."""
+    stones = {}
+    target = None
+    for y, row in enumerate(line.strip() for line in diagram.strip().splitlines()):
+        for x, char in enumerate(row):
+            point = Point(ORIGIN.X + x, ORIGIN.Y + y)
+            if char == 'X':
+                stones[point] = BLACK_CHESSMAN
+            elif char == 'O':
+                stones[point] = WHITE_CHESSMAN
+            elif char == '*':
+                target = point
+    return stones, target
+
+
+def full_scan(rules):
+    """Black's forbidden cells computed from scratch, cell by cell."""
+    n = Line_Points
+    return {y * n + x for y in range(n) for x in range(n)
+            if rules._cells[rules._pad(Point(x, y))] == 0 and rules._is_forbidden(rules._pad(Point(x, y)), set())}
+
+
+def run_corpus():
+    print(f'{"position":<46}{"expected":>10}{"got":>8}{"checks":>8}{"ms":>8}')
+    passed = 0
+    for name, diagram, expected in CORPUS:
+        stones, target = parse_diagram(diagram)
+        start = time.perf_counter()
+        board = RenjuCheckerboard(Line_Points, quiet=True)
+        for point, chessman in stones.items():
+            board.make(point, chessman)
+        got = board.is_forbidden(target)
+        elapsed_ms = (time.perf_counter() - start) * 1000
+        consistent = board.rules.forbidden == full_scan(board.rules)
+        passed += got == expected and consistent
+        print(f'{name:<46}{str(expected):>10}{str(got):>8}{board.rules.checks:>8}{elapsed_ms:>8.2f}'
+              + ('' if consistent else '  (incremental set differs from a rescan)'))
+    print(f'corpus: {passed}/{len(CORPUS)} correct')
+    return passed == len(CORPUS)
+
+
+def run_games(games, seed):
+    """Random games near the center with take-backs; checks every state against a full rescan."""
+    rng = random.Random(seed)
+    rules = RenjuRules(Line_Points)
+    moves = []
+    updates = update_s = scan_s = 0
+    checks = 0
+    mismatches = 0
+    max_forbidden = 0
+    for _ in range(games):
+        while moves:
+            rules.remove(moves.pop())
+        for ply in range(120):
+            if moves and rng.random() < 0.15:
+                point = moves.pop()
+                start = time.perf_counter()
+                rules.remove(point)
+            else:
+                while True:
+                    point = Point(rng.randint(4, 14), rng.randint(4, 14))
+                    if rules._cells[rules._pad(point)] == 0:
+                        break
+                value = BLACK_CHESSMAN.Value if len(moves) % 2 == 0 else WHITE_CHESSMAN.Value
+                checks_before = rules.checks
+                start = time.perf_counter()
+                rules.place(point, value)
+                checks += rules.checks - checks_before
+                moves.append(point)
+            update_s += time.perf_counter() - start
+            updates += 1
+            start = time.perf_counter()
+            expected = full_scan(rules)
+            scan_s += time.perf_counter() - start
+            mismatches += rules.forbidden != expected
+            max_forbidden = max(max_forbidden, len(expected))
+            if len(moves) >= 80:
+                break
+
+    empty = [Point(x, y) for y in range(Line_Points) for x in range(Line_Points)]
+    start = time.perf_counter()
+    for _ in range(10):
+        for point in empty:
+            rules.is_forbidden(point)
+    lookup_ns = (time.perf_counter() - start) / (10 * len(empty)) * 1e9
+    print(f'random games: {games} games, {updates} updates (moves and take-backs), '
+          f'up to {max_forbidden} forbidden points at once, {mismatches} mismatches against a rescan')
+    print(f'  incremental update {update_s / updates * 1000:.3f} ms '
+          f'({checks / max(1, updates):.1f} cell checks per update), '
+          f'full rescan {scan_s / updates * 1000:.2f} ms, lookup {lookup_ns:.0f} ns')
+    return mismatches == 0
+
+
+def run_search(seed):
+    """Nodes per second of a 1 s search for black, without and with Renju rules."""
+    rng = random.Random(seed)
+    for renju in (False, True):
+        ai = SearchAI(Line_Points, BLACK_CHESSMAN, time_limit_ms=1000, threat_search=False)
+        if renju:
+            ai.enable_renju()
+        rng.seed(seed)
+        for ply in range(20):
+            while True:
+                point = Point(rng.randint(6, 12), rng.randint(6, 12))
+                if ai._checkerboard[point.Y][point.X] == 0:
+                    break
+            ai._place(point, BLACK_CHESSMAN.Value if ply % 2 == 0 else WHITE_CHESSMAN.Value)
+        point = ai.search()
+        forbidden = ai.renju is not None and ai.renju.is_forbidden(point)
+        print(f'search {"with" if renju else "without"} Renju rules: depth {ai.stats.depth}, '
+              f'{ai.stats.nodes} nodes, {ai.stats.nps} nodes/s, plays ({point.X}, {point.Y})'
+              + (' FORBIDDEN' if forbidden else ''))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--games', type=int, default=20)
+    parser.add_argument('--seed', type=int, default=1)
+    parser.add_argument('--search', action='store_true', help='also time the search with Renju rules')
+    args = parser.parse_args()
+    ok = run_corpus()
+    ok = run_games(args.games, args.seed) and ok
+    if args.search:
+        run_search(args.seed)
+    print('all correct' if ok else 'FAILURES')
+
+
+if __name__ == '__main__':
+    main()
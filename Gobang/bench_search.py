@@ -0,0 +1,107 @@
+"""
+Benchmark: depth reached and nodes per second of SearchAI at several time budgets,
+and the work saved by the transposition table at a fixed depth.
+
+Test positions come from greedy-vs-greedy games with a few random opening stones, so
+the numbers reflect mid-game positions on this machine.
+
+Usage: python bench_search.py [--positions N] [--budgets 100,250,500,1000] [--tt-depth D]
+"""
+import argparse
+import contextlib
+import io
+import random
+
+from checkerboard import Checkerboard, Point, BLACK_CHESSMAN, WHITE_CHESSMAN
+from ai import AI
+from search import SearchAI
+
+Line_Points = 19
+
+
+def make_positions(count, plies, seed):
+    """Returns move lists (black first) of unfinished greedy-vs-greedy games."""
+    rng = random.Random(seed)
+    positions = []
+    center = Line_Points // 2
+    while len(positions) < count:
+        # Both players search directly on the game board
+        board = Checkerboard(Line_Points, quiet=True)
+        players = {BLACK_CHESSMAN.Value: AI(Line_Points, BLACK_CHESSMAN, checkerboard=board),
+                   WHITE_CHESSMAN.Value: AI(Line_Points, WHITE_CHESSMAN, checkerboard=board)}
+        chessman = BLACK_CHESSMAN
+        moves = []
+        with contextlib.redirect_stdout(io.StringIO()):
+            for ply in range(plies):
+                if ply < 3:
+                    point = Point(center + rng.randint(-2, 2), center + rng.randint(-2, 2))
+                    if not board.can_drop(point):
+                        break
+                else:
+                    point = players[chessman.Value].AI_drop()
+                moves.append(point)
+                if board.drop(chessman, point):
+                    break
+                chessman = WHITE_CHESSMAN if chessman is BLACK_CHESSMAN else BLACK_CHESSMAN
+            else:
+                positions.append(moves)
+    return positions
+
+
+def _searcher_for(moves, **options):
+    side = BLACK_CHESSMAN if len(moves) % 2 == 0 else WHITE_CHESSMAN
+    searcher = SearchAI(Line_Points, side, **options)
+    for i, point in enumerate(moves):
+        searcher._place(point, BLACK_CHESSMAN.Value if i % 2 == 0 else WHITE_CHESSMAN.Value)
+    return searcher
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--positions', type=int, default=5)
+    parser.add_argument('--plies', type=int, default=16, help='stones on the board in each test position')
+    parser.add_argument('--budgets', default='100,250,500,1000', help='comma-separated time limits in ms')
+    parser.add_argument('--tt-depth', type=int, default=4, help='fixed depth for the transposition table comparison')
+    parser.add_argument('--seed', type=int, default=3)
+    args = parser.parse_args()
+
+    positions = make_positions(args.positions, args.plies, args.seed)
+    print(f'{len(positions)} positions with {args.plies} stones each')
+    print(f'{"budget ms":>10}{"avg depth":>11}{"max depth":>11}{"avg nodes":>11}{"nodes/s":>10}'
+          f'{"candidates":>12}{"branching":>11}')
+    for budget in (int(b) for b in args.budgets.split(',')):
+        depths, nodes, elapsed, candidates, branching = [], 0, 0.0, 0.0, 0.0
+        for moves in positions:
+            searcher = _searcher_for(moves, time_limit_ms=budget)
+            searcher.search()
+            candidates += searcher._candidates.average_candidates
+            branching += searcher.stats.branching
+            depths.append(searcher.stats.depth)
+            nodes += searcher.stats.nodes
+            elapsed += searcher.stats.elapsed_ms
+        print(f'{budget:>10}{sum(depths) / len(depths):>11.2f}{max(depths):>11}'
+              f'{nodes // len(positions):>11}{int(nodes / elapsed * 1000):>10}'
+              f'{candidates / len(positions):>12.1f}{branching / len(positions):>11.2f}')
+
+    print(f'\ntransposition table at fixed depth {args.tt_depth}')
+    print(f'{"table":>10}{"avg nodes":>11}{"avg ms":>10}{"hit rate":>10}{"fill":>9}{"memory":>10}')
+    for tt_bytes in (0, 16 * 1024 * 1024):
+        nodes, elapsed, hits, probes, fill = 0, 0.0, 0, 0, 0.0
+        for moves in positions:
+            searcher = _searcher_for(moves, time_limit_ms=10 ** 9, max_depth=args.tt_depth, tt_bytes=tt_bytes)
+            searcher.search()
+            nodes += searcher.stats.nodes
+            elapsed += searcher.stats.elapsed_ms
+            if searcher.tt is not None:
+                tt_stats = searcher.tt.stats()
+                hits += tt_stats.hits
+                probes += tt_stats.probes
+                fill = max(fill, tt_stats.fill)
+        memory = f'{searcher.tt.memory_bytes // 1024} KiB' if searcher.tt is not None else '-'
+        hit_rate = f'{hits / probes:.1%}' if probes else '-'
+        print(f'{"on" if tt_bytes else "off":>10}{nodes // len(positions):>11}{elapsed / len(positions):>10.1f}'
+              f'{hit_rate:>10}{fill:>9.2%}{memory:>10}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,115 @@
+"""
+Benchmark: VCF solve times on a corpus of known VCF puzzles.
+
+Each puzzle is a 19x19 position given as the move list that reached it (black first)
+and the side to move, which has a forced win by continuous fours. Every solution the
+solver returns is replayed and checked: each defender reply must be the only point that
+stops five, and the line must end in five in a row.
+
+Usage: python bench_threats.py [--vct] [--max-nodes N]
+"""
+import argparse
+import time
+
+from checkerboard import Checkerboard, Point, BLACK_CHESSMAN, WHITE_CHESSMAN
+from threats import ThreatSolver, WIN
+
+Line_Points = 19
+
+# (side to move, moves "x,y x,y ..." with black first); solution length in plies as comment
+VCF_PUZZLES = [
+    (2, '11,7 12,9 8,6 9,12 11,8 11,9 10,9 12,7 12,8 10,8 13,9 10,6 12,10 11,11 14,10 15,11 13,10 11,10 '
+        '10,11 13,8 14,9 11,12 11,13 10,12 12,12 13,11 14,11 14,12 15,10 16,10 13,13 8,12 7,12 12,13 14,8 '
+        '14,7 15,6 15,7 15,8 16,7 13,7 16,9 16,8 17,9 18,8 17,8 17,7 15,9 8,11 9,10 9,11 7,11 9,13 11,6 '
+        '12,6 10,5 9,4 11,5 9,5 10,4 10,7 9,7 8,8 10,3 10,2 9,3 8,7'),  # 17
+    (1, '6,8 7,12 10,12 11,9 7,9 8,10 7,8 7,10 8,8 9,8 6,10 9,7 6,9 6,11 8,9 9,9'),  # 17
+    (1, '10,6 8,6 6,6 11,10 9,7 8,8 8,7 7,7 9,5 9,6 11,7 12,8 10,7 12,7 10,8 10,9 12,6 9,9'),  # 15
+    (1, '12,9 8,6 7,7 12,8 11,9 13,9 11,7 11,8 10,8 12,10 9,9 8,10 10,9 8,9 8,8 10,10 11,10 9,8 13,8 '
+        '10,11 10,7 11,11'),  # 15
+    (1, '6,9 7,11 7,7 11,12 7,8 7,9 8,7 9,6 6,7 9,7 6,8 6,10 8,8 9,8'),  # 15
+    (2, '12,11 11,8 6,9 11,10 11,9 12,9 13,10 10,11 9,12 11,12 9,10 9,11 8,11 7,10 7,12 6,13 8,12 6,12 '
+        '8,13 8,10 6,11 5,10 7,11 6,10 4,10 7,9 10,12 5,11 8,8'),  # 13
+    (2, '10,8 12,10 8,9 8,11 9,9 10,9 9,10 9,8 8,10 7,11 7,10 10,10 9,11 11,10 12,11 10,11 9,12 9,13 '
+        '10,12 7,9 8,12 11,12 6,10 5,10 11,13 12,14 11,7 12,6 7,12 6,12 13,10 8,7 7,6 12,13 13,14 12,15 '
+        '12,16 11,15 13,15 13,13 14,12 10,16 9,17 14,14 12,12 13,11 13,16 14,16 13,17 13,18 14,15 12,17 '
+        '6,11 5,12 5,11 4,11 6,9 6,13 7,14 3,10 2,9 6,8 8,13 9,14 6,15 5,16 7,7'),  # 13
+    (1, '6,11 7,9 11,10 11,9 10,9 9,8 10,10 10,8 12,10 9,10 9,9 8,8 7,8 9,7 6,10 6,9 5,9 11,8 12,8 12,9 '
+        '13,10 14,10 7,11 8,12 8,11 9,11 8,10 8,6 7,5 8,7'),  # 13
+    (1, '10,12 7,11 12,11 10,9 11,11 10,11 12,10 9,13 12,12 12,9 11,12 9,12 11,10 11,9'),  # 13
+    (1, '11,10 10,6 9,7 8,6 9,6 9,5 7,7 8,7 8,5 10,7 10,8 11,7 8,4 12,8 13,9 9,8 7,6 11,6 8,9 11,8 11,5 '
+        '12,5 13,4 7,8 9,4 6,7 10,4 11,4'),  # 13
+    (1, '6,9 6,12 9,9 10,12 8,9 7,9 8,8 8,10 9,11 9,10 10,10 11,11 11,9 8,12 10,9 12,9 10,8 10,7'),  # 11
+    (1, '6,12 10,7 8,8 6,7 9,8 10,8 10,9 8,7 9,7 9,9 10,6 7,9 11,7 12,8 11,5 12,4 11,6 11,8 9,6 12,6'),  # 11
+]
+
+
+def parse_moves(text):
+    return [Point(*map(int, move.split(','))) for move in text.split()]
+
+
+def build_board(moves):
+    board = Checkerboard(Line_Points)
+    for i, point in enumerate(moves):
+        board.checkerboard[point.Y][point.X] = BLACK_CHESSMAN.Value if i % 2 == 0 else WHITE_CHESSMAN.Value
+    return board
+
+
+def _five_points(board, value):
+    points = []
+    for y in range(Line_Points):
+        for x in range(Line_Points):
+            if board.checkerboard[y][x] == 0:
+                board.checkerboard[y][x] = value
+                if board._win(Point(x, y)):
+                    points.append(Point(x, y))
+                board.checkerboard[y][x] = 0
+    return points
+
+
+def verify_vcf(moves, value, line):
+    """Replays a VCF line with brute-force five detection; True if it is a forced win."""
+    board = build_board(moves)
+    for i in range(0, len(line), 2):
+        attack = line[i]
+        if _five_points(board, 3 - value) and i + 1 < len(line):
+            return False  # The defender could have won instead of answering
+        board.checkerboard[attack.Y][attack.X] = value
+        if board._win(attack):
+            return i == len(line) - 1
+        gains = _five_points(board, value)
+        if len(gains) >= 2 and not _five_points(board, 3 - value):
+            return True
+        if gains != [line[i + 1]]:
+            return False
+        board.checkerboard[gains[0].Y][gains[0].X] = 3 - value
+    return False
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--vct', action='store_true', help='also time VCT on the same positions')
+    parser.add_argument('--max-nodes', type=int, default=20000)
+    args = parser.parse_args()
+
+    print(f'{"#":>3}{"side":>6}{"stones":>8}{"status":>9}{"plies":>7}{"nodes":>8}{"ms":>10}{"verified":>10}')
+    solved = 0
+    total_ms = 0.0
+    start = time.perf_counter()
+    for number, (value, text) in enumerate(VCF_PUZZLES, 1):
+        moves = parse_moves(text)
+        result = ThreatSolver(build_board(moves).checkerboard).solve_vcf(value, max_nodes=args.max_nodes)
+        verified = result.status == WIN and verify_vcf(moves, value, result.moves)
+        solved += verified
+        total_ms += result.elapsed_ms
+        side = BLACK_CHESSMAN.Name if value == BLACK_CHESSMAN.Value else WHITE_CHESSMAN.Name
+        print(f'{number:>3}{side:>5}{len(moves):>8}{result.status:>9}{len(result.moves):>7}'
+              f'{result.nodes:>8}{result.elapsed_ms:>10.2f}{"yes" if verified else "NO":>10}')
+        if args.vct:
+            vct = ThreatSolver(build_board(moves).checkerboard).solve_vct(value, max_nodes=args.max_nodes)
+            print(f'{"":>3}{"VCT":>5}{"":>8}{vct.status:>9}{"":>7}{vct.nodes:>8}{vct.elapsed_ms:>10.2f}')
+    print(f'solved {solved}/{len(VCF_PUZZLES)}, total solve time {total_ms:.1f} ms '
+          f'(wall {time.perf_counter() - start:.2f} s incl. verification)')
+
+
+if __name__ == '__main__':
+    main()
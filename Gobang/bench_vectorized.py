@@ -0,0 +1,72 @@
+"""
+Benchmark: whole-board score map with NumPy (vectorized.py) vs the per-cell Python loops.
+
+For each test position, every empty cell is scored with AI._get_point_score and the
+result is compared with VectorizedEvaluator.score_map for both colors; the move chosen
+by the original full-board scan must also match VectorizedEvaluator.best_point.
+Timings are for one full 19x19 score map.
+
+Usage: python bench_vectorized.py [--positions N] [--repeat R]
+"""
+import argparse
+import time
+
+import numpy as np
+
+from checkerboard import Point, BLACK_CHESSMAN, WHITE_CHESSMAN
+from ai import AI
+from bench_ai import full_scan_drop
+from bench_search import make_positions, Line_Points
+from vectorized import VectorizedEvaluator
+
+
+def loop_score_map(ai):
+    """Scores every cell with the per-cell loops, as a [y][x] list (occupied cells are None)."""
+    return [[ai._get_point_score(Point(x, y)) if ai._checkerboard[y][x] == 0 else None
+             for x in range(Line_Points)] for y in range(Line_Points)]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--positions', type=int, default=10)
+    parser.add_argument('--repeat', type=int, default=5, help='timed score maps per position and method')
+    parser.add_argument('--seed', type=int, default=3)
+    args = parser.parse_args()
+
+    # Half early-game, half mid-game positions
+    positions = (make_positions(args.positions // 2, 10, args.seed)
+                 + make_positions(args.positions - args.positions // 2, 30, args.seed))
+    mismatches = 0
+    loop_ms = numpy_ms = 0.0
+    for moves in positions:
+        for chessman in (BLACK_CHESSMAN, WHITE_CHESSMAN):
+            ai = AI(Line_Points, chessman)
+            evaluator = VectorizedEvaluator(Line_Points)
+            for i, point in enumerate(moves):
+                value = BLACK_CHESSMAN.Value if i % 2 == 0 else WHITE_CHESSMAN.Value
+                ai._place(point, value)
+                evaluator.place(point, value)
+
+            start = time.perf_counter()
+            for _ in range(args.repeat):
+                expected = loop_score_map(ai)
+            loop_ms += (time.perf_counter() - start) * 1000 / args.repeat
+            start = time.perf_counter()
+            for _ in range(args.repeat):
+                scores = evaluator.score_map(chessman.Value)
+            numpy_ms += (time.perf_counter() - start) * 1000 / args.repeat
+
+            expected = np.array([[-np.inf if s is None else s for s in row] for row in expected])
+            mismatches += int(np.count_nonzero(expected != scores))
+            mismatches += full_scan_drop(ai) != evaluator.best_point(chessman.Value)
+
+    count = len(positions) * 2
+    print(f'{len(positions)} positions x 2 colors, {"no" if not mismatches else mismatches} mismatches')
+    print(f'{"method":<22}{"ms per map":>12}')
+    print(f'{"Python loops":<22}{loop_ms / count:>12.3f}')
+    print(f'{"NumPy score_map":<22}{numpy_ms / count:>12.3f}')
+    print(f'speedup: x{loop_ms / numpy_ms:.1f}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,121 @@
+from checkerboard import offset
+
+# Line masks depend only on the board size, so boards of the same size share them.
+_line_mask_cache = {}
+
+
+def line_shifts(line_points):
+    """Bit distance between neighbours for each direction in `offset`, with stride line_points + 1."""
+    stride = line_points + 1
+    # (1, -1) is stored as its mirror (-1, 1) so every shift is positive.
+    return [x_offset + y_offset * stride if y_offset >= 0 else stride - x_offset
+            for x_offset, y_offset in offset]
+
+
+def line_masks(line_points):
+    """For every cell (index y * line_points + x), the 9-cell segment through it in each direction, as a bitmask."""
+    if line_points in _line_mask_cache:
+        return _line_mask_cache[line_points]
+    n = line_points
+    stride = n + 1
+    masks = []
+    for y in range(n):
+        for x in range(n):
+            cell_masks = []
+            for x_offset, y_offset in offset:
+                mask = 0
+                for step in range(-4, 5):
+                    cx = x + step * x_offset
+                    cy = y + step * y_offset
+                    if 0 <= cx < n and 0 <= cy < n:
+                        mask |= 1 << (cy * stride + cx)
+                cell_masks.append(mask)
+            masks.append(tuple(cell_masks))
+    _line_mask_cache[line_points] = masks
+    return masks
+
+
+def has_five(bits, masks, shifts):
+    """True if 'bits' holds five in a row on one of the lines given by a cell's `masks`."""
+    for shift, mask in zip(shifts, masks):
+        line = bits & mask
+        run = line & (line >> shift)    # two in a row
+        run &= run >> (2 * shift)       # four in a row
+        if run & (line >> (4 * shift)):  # five in a row
+            return True
+    return False
+
+
+class BitboardCheckerboard:
+    """
+    Drop-in replacement for Checkerboard that keeps one Python-int bitboard per color.
+
+    Cell (x, y) maps to bit y * stride + x, where stride = line_points + 1. The extra
+    always-empty column stops horizontal and diagonal shifts from wrapping onto the next
+    row, so a five in any direction is found with a handful of shift-and-AND operations.
+    The list-of-lists view behind `checkerboard` is kept in sync for the renderers.
+    """
+
+    def __init__(self, line_points, quiet=False):
+        self._line_points = line_points
+        self._stride = line_points + 1
+        self._checkerboard = [[0] * line_points for _ in range(line_points)]
+        self._bits = [0, 0, 0]  # indexed by Chessman.Value
+        self._shifts = line_shifts(line_points)
+        self._line_masks = line_masks(line_points)
+        self._moves = []
+        self.quiet = quiet
+
+    def _get_checkerboard(self):
+        return self._checkerboard
+
+    checkerboard = property(_get_checkerboard)
+
+    def _get_moves(self):
+        return self._moves
+
+    moves = property(_get_moves)
+
+    def value_at(self, point):
+        """Chessman value of the stone at 'point', 0 if the cell is empty."""
+        return self._checkerboard[point.Y][point.X]
+
+    def make(self, point, chessman):
+        """Puts a stone on the board and pushes it on the move stack; no win check, no print."""
+        self._checkerboard[point.Y][point.X] = chessman.Value
+        self._bits[chessman.Value] |= 1 << (point.Y * self._stride + point.X)
+        self._moves.append(point)
+
+    def unmake(self):
+        """Takes back the last move made and returns its point."""
+        point = self._moves.pop()
+        self._bits[self._checkerboard[point.Y][point.X]] &= ~(1 << (point.Y * self._stride + point.X))
+        self._checkerboard[point.Y][point.X] = 0
+        return point
+
+    # 判断是否可落子
+    def can_drop(self, point):
+        """Checks if a stone can be placed at the given point."""
+        return self._checkerboard[point.Y][point.X] == 0
+
+    def drop(self, chessman, point):
+        """
+        落子
+        :param chessman:
+        :param point:落子位置
+        :return:若该子落下之后即可获胜，则返回获胜方，否则返回 None
+        """
+        if not self.quiet:
+            print(f'{chessman.Name} ({point.X}, {point.Y})')
+        self.make(point, chessman)
+
+        if self._win(point):
+            if not self.quiet:
+                print(f'{chessman.Name}获胜')
+            return chessman
+
+    # 判断是否赢了
+    def _win(self, point):
+        """Checks if the last move at 'point' resulted in a win."""
+        cur_value = self._checkerboard[point.Y][point.X]
+        return has_five(self._bits[cur_value], self._line_masks[point.Y * self._line_points + point.X], self._shifts)
@@ -0,0 +1,105 @@
+"""
+Builds the opening book (opening_book.py) from self-play and/or analysis output.
+
+Self-play: games between two copies of one AI configuration (an arena.py player spec)
+are played for the first --plies stones, in worker processes. Game g starts from
+g % (K + 1) random stones (K = --opening-stones), so the book covers the AI's own
+opening line as well as its answers to varied starts; the random stones themselves
+are not book moves.
+
+Analysis output: text files with one move sequence per line, black first, each move
+as x,y separated by spaces (e.g. "9,9 10,10 10,8"); '#' starts a comment. Every move
+in the first --plies counts as a good reply to the position before it.
+
+Positions are merged over the 8 board symmetries; for each one the most frequent reply
+is written.
+
+Usage: python build_book.py [--self-play N] [--player SPEC] [--from FILE ...] [--plies 8] [--output opening_book.bin]
+"""
+import argparse
+import os
+import random
+import time
+from collections import defaultdict, Counter
+from concurrent.futures import ProcessPoolExecutor
+
+from checkerboard import Point, BLACK_CHESSMAN, WHITE_CHESSMAN
+from arena import parse_player, random_opening, play_game, Line_Points
+from opening_book import BOOK_FILE, OpeningBook, canonical_key, canonical_move, write_book
+
+
+def read_lines(path):
+    """Move sequences of an analysis file, as lists of Points."""
+    sequences = []
+    with open(path) as f:
+        for number, line in enumerate(f, 1):
+            line = line.split('#', 1)[0].strip()
+            if not line:
+                continue
+            try:
+                sequences.append([Point(*map(int, move.split(','))) for move in line.split()])
+            except (ValueError, TypeError):
+                print(f'{path}:{number}: skipped, expected moves as x,y')
+    return sequences
+
+
+def add_votes(votes, moves, first, plies):
+    """Counts moves[first:plies] as the replies to the positions before them."""
+    stones = []
+    for ply, point in enumerate(moves[:plies]):
+        if ply >= first:
+            key, symmetry = canonical_key(Line_Points, stones)
+            votes[key][canonical_move(Line_Points, symmetry, point)] += 1
+        stones.append((point, BLACK_CHESSMAN.Value if ply % 2 == 0 else WHITE_CHESSMAN.Value))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--self-play', type=int, default=0, metavar='GAMES', help='self-play games to learn from')
+    parser.add_argument('--player', type=parse_player, default=parse_player('search:time_limit_ms=1000'),
+                        help="AI for self-play, as for arena.py (default 'search:time_limit_ms=1000')")
+    parser.add_argument('--opening-stones', type=int, default=2, help='most random stones a self-play game starts from')
+    parser.add_argument('--from', dest='files', nargs='*', default=[], metavar='FILE', help='analysis output files')
+    parser.add_argument('--plies', type=int, default=8, help='book depth in stones')
+    parser.add_argument('--workers', type=int, default=os.cpu_count() or 1)
+    parser.add_argument('--seed', type=int, default=1)
+    parser.add_argument('--output', default=BOOK_FILE)
+    args = parser.parse_args()
+    if not args.self_play and not args.files:
+        parser.error('nothing to learn from: give --self-play and/or --from')
+
+    votes = defaultdict(Counter)
+    for path in args.files:
+        sequences = read_lines(path)
+        for moves in sequences:
+            add_votes(votes, moves, 0, args.plies)
+        print(f'{path}: {len(sequences)} lines')
+
+    if args.self_play:
+        rng = random.Random(args.seed)
+        tasks = []
+        for game in range(args.self_play):
+            opening = random_opening(game % (args.opening_stones + 1), rng)
+            tasks.append((game, args.player, args.player, True, opening, args.plies))
+        start = time.perf_counter()
+        with ProcessPoolExecutor(max_workers=args.workers) as pool:
+            results = list(pool.map(play_game, *zip(*tasks)))
+        for (_, _, _, _, opening, _), result in zip(tasks, results):
+            add_votes(votes, result.stones, len(opening), args.plies)
+        print(f'{args.self_play} self-play games in {time.perf_counter() - start:.1f} s')
+
+    entries = {}
+    for key, replies in votes.items():
+        move, weight = replies.most_common(1)[0]
+        entries[key] = (move, weight)
+    write_book(args.output, Line_Points, entries, args.plies)
+
+    start = time.perf_counter()
+    book = OpeningBook(args.output)
+    open_ms = (time.perf_counter() - start) * 1000
+    print(f'{args.output}: {len(book)} positions, {os.path.getsize(args.output)} bytes, opened in {open_ms:.2f} ms')
+    book.close()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,114 @@
+from checkerboard import Point
+
+# Neighbourhood offsets depend only on board size and radius, so generators share them
+_neighbourhood_cache = {}
+
+
+def _neighbourhoods(line_points, radius):
+    if (line_points, radius) not in _neighbourhood_cache:
+        n = line_points
+        table = []
+        for y in range(n):
+            for x in range(n):
+                table.append(tuple(cy * n + cx
+                                   for cy in range(max(0, y - radius), min(n, y + radius + 1))
+                                   for cx in range(max(0, x - radius), min(n, x + radius + 1))
+                                   if (cx, cy) != (x, y)))
+        _neighbourhood_cache[(line_points, radius)] = table
+    return _neighbourhood_cache[(line_points, radius)]
+
+
+class CandidateGenerator:
+    """
+    Set of empty cells within `radius` (Chebyshev distance) of any stone.
+
+    Each cell keeps a count of stones in its neighbourhood, so placing or removing a
+    stone touches only the (2 * radius + 1) ** 2 cells around it. On an empty board the
+    only candidate is the center point.
+    """
+
+    def __init__(self, line_points, radius=2):
+        self._line_points = line_points
+        self._neighbourhoods = _neighbourhoods(line_points, radius)
+        self._near_stones = [0] * (line_points * line_points)
+        self._occupied = bytearray(line_points * line_points)
+        self._candidates = set()
+        self._stones = 0
+        self._calls = 0
+        self._generated = 0
+        self._returned = 0
+
+    def place(self, point):
+        index = point.Y * self._line_points + point.X
+        self._occupied[index] = 1
+        self._candidates.discard(index)
+        self._stones += 1
+        near_stones = self._near_stones
+        occupied = self._occupied
+        for neighbour in self._neighbourhoods[index]:
+            near_stones[neighbour] += 1
+            if not occupied[neighbour]:
+                self._candidates.add(neighbour)
+
+    def remove(self, point):
+        index = point.Y * self._line_points + point.X
+        self._occupied[index] = 0
+        self._stones -= 1
+        near_stones = self._near_stones
+        for neighbour in self._neighbourhoods[index]:
+            near_stones[neighbour] -= 1
+            if not near_stones[neighbour]:
+                self._candidates.discard(neighbour)
+        if near_stones[index]:
+            self._candidates.add(index)
+
+    def __len__(self):
+        return len(self._candidates)
+
+    def __contains__(self, point):
+        return point.Y * self._line_points + point.X in self._candidates
+
+    def indices(self):
+        """Candidate cell indices (y * line_points + x), unordered."""
+        if self._stones == 0:
+            center = self._line_points // 2
+            return [center * self._line_points + center]
+        if not self._candidates:
+            # Every cell near a stone is taken: fall back to any empty cell
+            return [i for i, taken in enumerate(self._occupied) if not taken]
+        return list(self._candidates)
+
+    def ordered(self, key, limit=None, keep=None, exclude=None):
+        """
+        Candidate points sorted best-first by key(index).
+        :param key: scoring function over cell indices, e.g. the AI's cached threat scores
+        :param limit: keep only the best `limit` candidates
+        :param keep: optional filter over cell indices, applied before sorting
+        :param exclude: optional set of cell indices never to return, e.g. Renju forbidden points
+        """
+        indices = self.indices()
+        self._calls += 1
+        self._generated += len(indices)
+        if exclude:
+            indices = [index for index in indices if index not in exclude]
+        if keep is not None:
+            indices = [index for index in indices if keep(index)]
+        indices.sort(key=key, reverse=True)
+        if limit is not None:
+            del indices[limit:]
+        self._returned += len(indices)
+        n = self._line_points
+        return [Point(index % n, index // n) for index in indices]
+
+    @property
+    def average_candidates(self):
+        """Average number of candidates per `ordered` call, before any limit."""
+        return self._generated / self._calls if self._calls else 0.0
+
+    @property
+    def average_branching(self):
+        """Average number of moves returned per `ordered` call, i.e. the branching factor."""
+        return self._returned / self._calls if self._calls else 0.0
+
+    def reset_stats(self):
+        self._calls = self._generated = self._returned = 0
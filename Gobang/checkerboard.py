@@ -10,15 +10,37 @@ offset = [(1, 0), (0, 1), (1, 1), (1, -1)]
 
 
 class Checkerboard:
-    def __init__(self, line_points):
+    def __init__(self, line_points, quiet=False):
         self._line_points = line_points
         self._checkerboard = [[0] * line_points for _ in range(line_points)]
+        self._moves = []  # Move stack: points in the order they were played
+        self.quiet = quiet  # No print from drop()
 
     def _get_checkerboard(self):
         return self._checkerboard
 
     checkerboard = property(_get_checkerboard)
 
+    def _get_moves(self):
+        return self._moves
+
+    moves = property(_get_moves)  # Read-only by convention: change it through make/unmake
+
+    def value_at(self, point):
+        """Chessman value of the stone at 'point', 0 if the cell is empty."""
+        return self._checkerboard[point.Y][point.X]
+
+    def make(self, point, chessman):
+        """Puts a stone on the board and pushes it on the move stack; no win check, no print."""
+        self._checkerboard[point.Y][point.X] = chessman.Value
+        self._moves.append(point)
+
+    def unmake(self):
+        """Takes back the last move made and returns its point."""
+        point = self._moves.pop()
+        self._checkerboard[point.Y][point.X] = 0
+        return point
+
     # 判断是否可落子
     def can_drop(self, point):
         """Checks if a stone can be placed at the given point."""
@@ -31,11 +53,13 @@ class Checkerboard:
         :param point:落子位置
         :return:若该子落下之后即可获胜，则返回获胜方，否则返回 None
         """
-        print(f'{chessman.Name} ({point.X}, {point.Y})')
-        self._checkerboard[point.Y][point.X] = chessman.Value
+        if not self.quiet:
+            print(f'{chessman.Name} ({point.X}, {point.Y})')
+        self.make(point, chessman)
 
         if self._win(point):
-            print(f'{chessman.Name}获胜')
+            if not self.quiet:
+                print(f'{chessman.Name}获胜')
             return chessman
 
     # 判断是否赢了
@@ -0,0 +1,42 @@
+from ai import AI
+from vectorized import VectorizedAI
+from search import SearchAI
+from parallel import ParallelSearchAI
+from mcts import MCTSAI
+
+# Gobang AI engines by name; all share the AI interface (get_opponent_drop / AI_drop)
+ENGINES = {
+    'greedy': AI,                  # One-ply greedy scan, the original AI (ai.py)
+    'vectorized': VectorizedAI,    # The same greedy AI scored with NumPy (vectorized.py)
+    'search': SearchAI,            # Alpha-beta search (search.py)
+    'parallel': ParallelSearchAI,  # Alpha-beta split across processes (parallel.py)
+    'mcts': MCTSAI,                # Monte Carlo Tree Search (mcts.py)
+}
+# The engines that think against the clock and so take time_limit_ms
+TIMED_ENGINES = ('search', 'parallel', 'mcts')
+
+
+def create_ai(line_points, chessman, engine='search', **options):
+    """Creates the AI for 'chessman' with the named engine; options go to its constructor."""
+    if engine not in ENGINES:
+        raise ValueError(f"Unknown AI engine '{engine}', expected one of: {', '.join(ENGINES)}")
+    return ENGINES[engine](line_points, chessman, **options)
+
+
+def create_timed_ai(line_points, chessman, engine, time_limit_ms, **options):
+    """create_ai with a thinking time per move for the timed engines; the greedy ones have none and ignore it."""
+    if engine in TIMED_ENGINES:
+        options['time_limit_ms'] = time_limit_ms
+    return create_ai(line_points, chessman, engine, **options)
+
+
+if __name__ == '__main__':
+    # Builds every engine the way ManAndMachine does and lets each answer one move
+    from checkerboard import BLACK_CHESSMAN, WHITE_CHESSMAN, Point
+    for name in ENGINES:
+        options = {'workers': 2} if name == 'parallel' else {}
+        computer = create_timed_ai(15, WHITE_CHESSMAN, name, 100, **options)
+        computer.get_opponent_drop(Point(7, 7))
+        print(f'{name:<10} {type(computer).__name__:<16} answers {computer.AI_drop()}')
+        if hasattr(computer, 'close'):
+            computer.close()
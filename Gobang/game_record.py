@@ -0,0 +1,94 @@
+"""
+The game log: every finished game appended as one compact binary record to games.rec.
+
+A move is stored as its cell index in as few bytes as the board allows, so a 15x15 game
+takes 1 byte per move, but the 361 cells of the 19x19 board the games use need 2 bytes
+per move.
+"""
+import os
+import struct
+import sys
+import time
+from array import array
+from collections import namedtuple
+
+from checkerboard import Point
+
+GAME_LOG = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'games.rec')
+
+# Game modes
+MODE_PVP = 0    # ManAndMan.py
+MODE_PVAI = 1   # ManAndMachine.py
+MODE_AIVAI = 2  # arena.py
+
+# Results: the winner's Chessman value, or NO_WINNER (draw or abandoned)
+NO_WINNER = 0
+
+# A record is the header followed by one move index (y * line_points + x) per stone, as
+# MOVE_TYPECODES[move width] little-endian unsigned ints. The width is the smallest that
+# fits every cell: 1 byte up to 16x16, 2 bytes up to 256x256, 4 bytes beyond.
+_MAGIC = b'G2'
+_HEADER = struct.Struct('<2sBHBII')  # magic, mode, line_points, result, move count, unix time
+MOVE_TYPECODES = {1: 'B', 2: 'H', 4: 'I'}
+
+GameRecord = namedtuple('GameRecord', 'mode line_points result timestamp moves')
+
+
+def move_width(line_points):
+    """Bytes per move index on a line_points x line_points board."""
+    cells = line_points * line_points
+    return 1 if cells <= 1 << 8 else 2 if cells <= 1 << 16 else 4
+
+
+def encode_record(mode, line_points, result, moves, timestamp=None):
+    """The bytes of one record. 'moves' are Points in play order (e.g. Checkerboard.moves)."""
+    cells = array(MOVE_TYPECODES[move_width(line_points)], [p.Y * line_points + p.X for p in moves])
+    if cells.itemsize > 1 and sys.byteorder == 'big':
+        cells.byteswap()  # Records are little-endian
+    timestamp = int(time.time()) if timestamp is None else timestamp
+    return _HEADER.pack(_MAGIC, mode, line_points, result, len(moves), timestamp) + cells.tobytes()
+
+
+def append_record(mode, line_points, result, moves, path=GAME_LOG):
+    """Appends one game to the log file at 'path' (a single write, so records never interleave)."""
+    try:
+        with open(path, 'ab') as f:
+            f.write(encode_record(mode, line_points, result, moves))
+    except OSError as e:
+        print(f"Could not record the game: {e}")
+
+
+def read_records(path=GAME_LOG):
+    """
+    Yields the GameRecords of a log file one at a time, so archives of any size stream in
+    constant memory. 'moves' is an array of move indices; see record_points. A truncated
+    last record (e.g. the game was being written when the program died) ends the stream.
+    """
+    with open(path, 'rb', buffering=1 << 20) as f:
+        while True:
+            start = f.tell()
+            header = f.read(_HEADER.size)
+            if not header:
+                return
+            if len(header) < _HEADER.size:
+                print(f"{path}: truncated record at the end, ignored")
+                return
+            magic, mode, line_points, result, count, timestamp = _HEADER.unpack(header)
+            if magic != _MAGIC:
+                raise ValueError(f"{path}: corrupt record at byte {start}")
+            width = move_width(line_points)
+            data = f.read(count * width)
+            if len(data) < count * width:
+                print(f"{path}: truncated record at the end, ignored")
+                return
+            moves = array(MOVE_TYPECODES[width])
+            moves.frombytes(data)
+            if width > 1 and sys.byteorder == 'big':
+                moves.byteswap()
+            yield GameRecord(mode, line_points, result, timestamp, moves)
+
+
+def record_points(record):
+    """The moves of a GameRecord as Points."""
+    n = record.line_points
+    return [Point(cell % n, cell // n) for cell in record.moves]
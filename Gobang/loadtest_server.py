@@ -0,0 +1,185 @@
+"""
+Load test for the Gobang server (server.py) on loopback.
+
+Starts a server in a subprocess (unless --port points at a running one) and connects
+--rooms x (2 + --spectators) bot clients from this process. The two players of each
+room play random legal moves as soon as it is their turn, game after game. Reports the
+moves per second the server accepted and the broadcast latency: from a player sending
+a move to each member of the room (both players and the spectators) receiving it, as
+p50 / p99 / max.
+
+Usage: python loadtest_server.py [--rooms 500] [--spectators 2] [--duration 10] [--port P]
+"""
+import argparse
+import asyncio
+import os
+import random
+import resource
+import socket
+import subprocess
+import sys
+import time
+from collections import deque
+
+from server import Line_Points
+
+
+class Stats:
+    def __init__(self):
+        self.moves = 0
+        self.latencies = []
+        self.errors = 0
+        self.stale = 0
+        self.disconnects = 0
+        # (room, game, ply) -> [perf_counter when the move was sent, room members yet to receive it];
+        # dropped once the last member has it, so long runs keep only the moves in flight
+        self.sent_at = {}
+
+
+async def bot(host, port, room, spectate, members, stats, stop, rng):
+    reader, writer = await asyncio.open_connection(host, port)
+    writer.write(f'JOIN {room}{" spectate" if spectate else ""}\n'.encode())
+    my_value, started, game, ply = 0, False, 0, 0
+    empty = set(range(Line_Points * Line_Points))
+    sent = deque()  # Keys in stats.sent_at of our moves not yet echoed or rejected, oldest first
+
+    def play():
+        cell = rng.choice(tuple(empty))
+        sent.append((room, game, ply + 1))
+        stats.sent_at[sent[-1]] = [time.perf_counter(), members]
+        writer.write(f'MOVE {cell % Line_Points} {cell // Line_Points} {ply + 1}\n'.encode())
+
+    try:
+        while not stop.is_set():
+            line = await reader.readline()
+            if not line:
+                stats.disconnects += 1
+                return
+            fields = line.split()
+            kind = fields[0]
+            if kind == b'MOVE':
+                ply = int(fields[1])
+                empty.discard(int(fields[4]) * Line_Points + int(fields[3]))
+                key = (room, game, ply)
+                if sent and sent[0] == key:
+                    sent.popleft()
+                entry = stats.sent_at.get(key)
+                if entry is not None:
+                    stats.latencies.append(time.perf_counter() - entry[0])
+                    entry[1] -= 1
+                    if not entry[1]:
+                        del stats.sent_at[key]
+                if my_value == 1:
+                    stats.moves += 1  # Counted once per room
+            elif kind == b'JOINED':
+                my_value = {b'black': 1, b'white': 2}.get(fields[2], 0)
+            elif kind == b'START':
+                started = True
+            elif kind == b'NEW':
+                game, ply = game + 1, 0
+                empty = set(range(Line_Points * Line_Points))
+            elif kind == b'LEFT':
+                started = False
+            elif kind == b'ERROR':
+                if fields[1:] == [b'stale', b'move']:
+                    stats.stale += 1  # Our reply to the move that ended the game
+                    if sent:
+                        # The server answers in order, so it is our oldest move; it is never broadcast
+                        stats.sent_at.pop(sent.popleft(), None)
+                else:
+                    stats.errors += 1
+            # Black moves on odd plies, white on even ones
+            if started and my_value and kind in (b'START', b'MOVE', b'NEW') and ply % 2 + 1 == my_value and empty:
+                play()
+    except ConnectionError:
+        stats.disconnects += 1
+    finally:
+        writer.close()
+
+
+def _free_port():
+    with socket.socket() as s:
+        s.bind(('127.0.0.1', 0))
+        return s.getsockname()[1]
+
+
+async def run(args):
+    stats = Stats()
+    stop = asyncio.Event()
+    rng = random.Random(args.seed)
+    tasks = []
+    # Connect room by room so each room's players and spectators are in before the next
+    start = time.perf_counter()
+    for room in range(args.rooms):
+        for member in range(2 + args.spectators):
+            tasks.append(asyncio.create_task(
+                bot(args.host, args.port, f'room{room}', member >= 2, 2 + args.spectators, stats, stop,
+                    random.Random(rng.random()))))
+        if room % 50 == 49:
+            await asyncio.sleep(0)
+    while stats.moves == 0 and time.perf_counter() - start < 30:
+        await asyncio.sleep(0.05)
+    connect_s = time.perf_counter() - start
+    stats.latencies.clear()
+    moves = stats.moves
+    start = time.perf_counter()
+    await asyncio.sleep(args.duration)
+    elapsed = time.perf_counter() - start
+    moves = stats.moves - moves
+    latencies = sorted(stats.latencies)
+    stop.set()
+    for task in tasks:
+        task.cancel()
+    await asyncio.gather(*tasks, return_exceptions=True)
+
+    clients = args.rooms * (2 + args.spectators)
+    print(f'{clients} clients in {args.rooms} rooms ({args.spectators} spectators each), started in {connect_s:.1f} s')
+    print(f'{moves} moves in {elapsed:.1f} s: {moves / elapsed:.0f} moves/s, '
+          f'{len(latencies) / elapsed:.0f} move deliveries/s')
+    if latencies:
+        def percentile(p):
+            return latencies[min(len(latencies) - 1, int(p * len(latencies)))] * 1000
+        print(f'broadcast latency: p50 {percentile(0.5):.1f} ms, p99 {percentile(0.99):.1f} ms, '
+              f'max {latencies[-1] * 1000:.1f} ms')
+    print(f'stale moves {stats.stale}, errors {stats.errors}, disconnects {stats.disconnects}, '
+          f'moves in flight at the end {len(stats.sent_at)}')
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--rooms', type=int, default=500)
+    parser.add_argument('--spectators', type=int, default=2, help='spectators per room')
+    parser.add_argument('--duration', type=float, default=10, help='seconds to measure')
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, help='port of a running server (default: start one)')
+    parser.add_argument('--seed', type=int, default=1)
+    args = parser.parse_args()
+
+    # Two sockets per client when the server runs here too
+    soft, hard = resource.getrlimit(resource.RLIMIT_NOFILE)
+    resource.setrlimit(resource.RLIMIT_NOFILE, (hard, hard))
+    if args.rooms * (2 + args.spectators) + 64 > hard:
+        print(f'warning: {hard} file descriptors allowed, not enough for every client')
+
+    server = None
+    if args.port is None:
+        args.port = _free_port()
+        server = subprocess.Popen([sys.executable, os.path.join(os.path.dirname(os.path.abspath(__file__)), 'server.py'),
+                                   '--host', args.host, '--port', str(args.port), '--report', '0'],
+                                  stdout=subprocess.DEVNULL)
+        for _ in range(100):  # Wait until it listens
+            try:
+                socket.create_connection((args.host, args.port), timeout=1).close()
+                break
+            except OSError:
+                time.sleep(0.05)
+    try:
+        asyncio.run(run(args))
+    finally:
+        if server is not None:
+            server.terminate()
+            server.wait()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,311 @@
+import math
+import random
+import sys
+import time
+from collections import namedtuple
+
+from checkerboard import Point, offset
+from ai import AI
+from bitboard import line_masks, line_shifts, has_five
+
+MCTSStats = namedtuple('MCTSStats', 'playouts elapsed_ms playouts_per_s tree_nodes tree_bytes bytes_per_10k')
+
+# Neighbour and window tables depend only on the board size
+_neighbour_cache = {}
+_window_cache = {}
+
+
+def _neighbours(line_points):
+    """For every cell index (y * line_points + x), the indices of its 8 adjacent cells."""
+    if line_points not in _neighbour_cache:
+        n = line_points
+        _neighbour_cache[n] = [tuple((y + dy) * n + x + dx
+                                     for dy in (-1, 0, 1) for dx in (-1, 0, 1)
+                                     if (dx or dy) and 0 <= x + dx < n and 0 <= y + dy < n)
+                               for y in range(n) for x in range(n)]
+    return _neighbour_cache[line_points]
+
+
+def _windows(line_points):
+    """For every cell index, the bitmasks (stride line_points + 1) of all 5-cell windows through it."""
+    if line_points not in _window_cache:
+        n = line_points
+        stride = n + 1
+        table = []
+        for y in range(n):
+            for x in range(n):
+                windows = []
+                for x_offset, y_offset in offset:
+                    for start in range(-4, 1):
+                        cells = [(x + (start + k) * x_offset, y + (start + k) * y_offset) for k in range(5)]
+                        if all(0 <= cx < n and 0 <= cy < n for cx, cy in cells):
+                            windows.append(sum(1 << (cy * stride + cx) for cx, cy in cells))
+                table.append(tuple(windows))
+        _window_cache[n] = table
+    return _window_cache[line_points]
+
+
+class _Node:
+    """Search tree node: the position after `player` played `move` (a cell index)."""
+    __slots__ = ('move', 'player', 'parent', 'children', 'untried', 'visits', 'wins', 'terminal')
+
+    def __init__(self, move, player, parent, terminal=False):
+        self.move = move
+        self.player = player
+        self.parent = parent
+        self.children = []
+        self.untried = None  # Filled in the first time the node is selected
+        self.visits = 0
+        self.wins = 0.0      # From the point of view of `player`; draws count half
+        self.terminal = terminal
+
+
+class MCTSAI(AI):
+    """
+    Monte Carlo Tree Search AI (UCT), an alternative to the hand-tuned point scores.
+
+    The tree and the rollouts only consider empty cells next to a stone. Each selected
+    leaf is expanded by one child, and `batch_size` rollouts are played from it in one
+    go, so the cost of selection and backup is shared by the whole batch. Rollouts run
+    on bitboards with a cheap policy: complete a four, else block the opponent's four,
+    else a random move. Fours are found from the 5-cell windows through each new stone;
+    the tree's terminal nodes use the shift-and-AND five test of bitboard.py. A rollout
+    that reaches `max_rollout_moves` plies without a winner counts as a draw.
+
+    Immediate fives at the root are handled directly: the AI completes its own or
+    blocks the opponent's. `stats` reports the playouts, playouts per second and the tree's memory
+    (also per 10k playouts) of the last search.
+    """
+
+    def __init__(self, line_points, chessman, time_limit_ms=1000, exploration=0.7, batch_size=8,
+                 max_playouts=None, max_rollout_moves=60, seed=None, checkerboard=None):
+        super().__init__(line_points, chessman, checkerboard)
+        self.time_limit_ms = time_limit_ms
+        self.exploration = exploration
+        self.batch_size = batch_size
+        self.max_playouts = max_playouts
+        self.max_rollout_moves = max_rollout_moves
+        self.stats = MCTSStats(0, 0.0, 0, 0, 0, 0)
+        self._rng = random.Random(seed)
+        self._stride = line_points + 1
+        self._bit = [1 << (i // line_points * self._stride + i % line_points)
+                     for i in range(line_points * line_points)]
+        self._masks = line_masks(line_points)
+        self._shifts = line_shifts(line_points)
+        self._neighbours = _neighbours(line_points)
+        self._windows = _windows(line_points)
+        self._cancelled = False
+        self.should_stop = None
+        self.interrupted = False
+
+    def AI_drop(self):
+        point = self._book_drop()
+        if point is not None:
+            return point
+        point = self.search()
+        if point is None:
+            print("AI Error: No empty cells found!")
+            return None
+        self._play(point)
+        print(f"AI chooses: ({point.X}, {point.Y}) "
+              f"{self.stats.playouts} playouts, {self.stats.playouts_per_s} playouts/s, "
+              f"tree {self.stats.tree_nodes} nodes / {self.stats.tree_bytes // 1024} KiB "
+              f"({self.stats.bytes_per_10k // 1024} KiB per 10k playouts)")
+        return point
+
+    def cancel(self):
+        """Asks a running search (possibly on another thread) to stop after the current batch."""
+        self._cancelled = True
+
+    def search(self):
+        """Runs MCTS from the current position and returns the most visited move."""
+        self._sync()
+        self._cancelled = False
+        self.interrupted = False
+        start = time.perf_counter()
+        my, opponent = self._my.Value, self._opponent.Value
+        # Complete a five, or block the opponent's
+        for value, fives in ((my, self._my_fives), (opponent, self._opp_fives)):
+            if fives:
+                forced = self.candidate_moves(keep=lambda index: self._is_five_at(index, value), value=my)
+                if forced:
+                    self.stats = MCTSStats(0, round((time.perf_counter() - start) * 1000, 1), 0, 0, 0, 0)
+                    return forced[0]
+
+        n = self._line_points
+        bits = [0, 0, 0]
+        seen = bytearray(n * n)
+        for y, row in enumerate(self._checkerboard):
+            for x, value in enumerate(row):
+                if value:
+                    bits[value] |= self._bit[y * n + x]
+                    seen[y * n + x] = 1
+        root_candidates = set()
+        for index in range(n * n):
+            if seen[index]:
+                for neighbour in self._neighbours[index]:
+                    if not seen[neighbour]:
+                        root_candidates.add(neighbour)
+        if self._is_forbidden_side(my):
+            root_candidates -= self.renju.forbidden  # Playouts beyond the root ignore Renju rules
+        if not root_candidates:
+            self.stats = MCTSStats(0, round((time.perf_counter() - start) * 1000, 1), 0, 0, 0, 0)
+            moves = self.candidate_moves(1, value=my)
+            return moves[0] if moves else None
+        for index in root_candidates:
+            seen[index] = 1
+
+        root = _Node(None, opponent, None)
+        deadline = start + self.time_limit_ms / 1000
+        playouts = 0
+        while True:
+            playouts += self._run_batch(root, bits, seen, root_candidates)
+            if self.max_playouts is not None and playouts >= self.max_playouts:
+                break
+            if time.perf_counter() > deadline or self._stopping():
+                break
+
+        best = max(root.children, key=lambda child: child.visits)
+        elapsed = time.perf_counter() - start
+        tree_nodes, tree_bytes = _tree_size(root)
+        self.stats = MCTSStats(playouts, round(elapsed * 1000, 1), int(playouts / elapsed) if elapsed > 0 else 0,
+                               tree_nodes, tree_bytes, tree_bytes * 10000 // playouts if playouts else 0)
+        return Point(best.move % n, best.move // n)
+
+    def _stopping(self):
+        if self._cancelled or (self.should_stop is not None and self.should_stop()):
+            self.interrupted = True
+        return self.interrupted
+
+    def _run_batch(self, root, root_bits, root_seen, root_candidates):
+        """Selects a leaf, expands it, plays a batch of rollouts from it and backs up the result."""
+        bits = root_bits[:]
+        seen = bytearray(root_seen)
+        candidates = set(root_candidates)
+        threats = [[], [], []]  # Per player, bits of cells that would complete five
+        node = root
+        # Selection
+        while not node.terminal and node.untried is not None and not node.untried and node.children:
+            log_visits = math.log(node.visits)
+            exploration = self.exploration
+            node = max(node.children, key=lambda child: child.wins / child.visits
+                       + exploration * math.sqrt(log_visits / child.visits))
+            self._apply(node.move, node.player, bits, seen, candidates, threats)
+        # Expansion
+        if not node.terminal:
+            if node.untried is None:
+                node.untried = self._tree_moves(3 - node.player, bits, candidates, threats)
+            if node.untried:
+                move = node.untried.pop()
+                player = 3 - node.player
+                self._apply(move, player, bits, seen, candidates, threats)
+                child = _Node(move, player, node, has_five(bits[player], self._masks[move], self._shifts))
+                node.children.append(child)
+                node = child
+
+        # Simulation
+        results = [0.0, 0.0, 0.0]  # draws, black wins, white wins
+        if node.terminal:
+            results[node.player] = self.batch_size
+        else:
+            candidates = list(candidates)
+            for _ in range(self.batch_size):
+                results[self._rollout(bits, seen, candidates, threats, 3 - node.player)] += 1
+
+        # Backpropagation
+        draws = results[0] / 2
+        while node is not None:
+            node.visits += self.batch_size
+            node.wins += results[node.player] + draws
+            node = node.parent
+        return self.batch_size
+
+    def _tree_moves(self, player, bits, candidates, threats):
+        """Moves to expand for 'player': a win or forced blocks if there are any, else every candidate."""
+        occupied = bits[1] | bits[2]
+        for threat in threats[player]:
+            if not occupied & threat:
+                return [self._cell_of(threat)]
+        blocks = {self._cell_of(threat) for threat in threats[3 - player] if not occupied & threat}
+        moves = list(blocks or candidates)
+        self._rng.shuffle(moves)
+        return moves
+
+    def _apply(self, move, player, bits, seen, candidates, threats):
+        bits[player] |= self._bit[move]
+        candidates.discard(move)
+        for neighbour in self._neighbours[move]:
+            if not seen[neighbour]:
+                seen[neighbour] = 1
+                candidates.add(neighbour)
+        self._add_threats(move, bits, player, threats[player])
+
+    def _add_threats(self, move, bits, player, player_threats):
+        """Records the cells where 'player' completes five in a window through its stone on 'move'."""
+        own = bits[player]
+        other = bits[3 - player]
+        for window in self._windows[move]:
+            stones = own & window
+            if not other & window and stones.bit_count() == 4:
+                player_threats.append(window ^ stones)
+
+    def _cell_of(self, bit):
+        index = bit.bit_length() - 1
+        return index - index // self._stride
+
+    def _rollout(self, bits, seen, candidates, threats, player):
+        """
+        Plays moves next to stones until someone makes five; returns the winner's value, or
+        0 for a draw. A player completes a four if it can and otherwise blocks the
+        opponent's; all other moves are random.
+        """
+        rng_random = self._rng.random
+        bit = self._bit
+        neighbours = self._neighbours
+        add_threats = self._add_threats
+        player_bits = bits[:]
+        seen = bytearray(seen)
+        candidates = candidates[:]
+        threats = [threats[0], threats[1][:], threats[2][:]]
+        for _ in range(self.max_rollout_moves):
+            occupied = player_bits[1] | player_bits[2]
+            for threat in threats[player]:
+                if not occupied & threat:
+                    return player  # Completes five
+            move = None
+            for threat in threats[3 - player]:
+                if not occupied & threat:
+                    move = self._cell_of(threat)
+                    if move in candidates:
+                        candidates.remove(move)
+                    break
+            if move is None:
+                if not candidates:
+                    return 0
+                i = int(rng_random() * len(candidates))
+                move = candidates[i]
+                candidates[i] = candidates[-1]
+                candidates.pop()
+            player_bits[player] |= bit[move]
+            for neighbour in neighbours[move]:
+                if not seen[neighbour]:
+                    seen[neighbour] = 1
+                    candidates.append(neighbour)
+            add_threats(move, player_bits, player, threats[player])
+            player = 3 - player
+        return 0
+
+
+def _tree_size(root):
+    """Returns (node count, approximate bytes) of the tree under 'root'."""
+    nodes = 0
+    size = 0
+    stack = [root]
+    while stack:
+        node = stack.pop()
+        nodes += 1
+        size += sys.getsizeof(node) + sys.getsizeof(node.children)
+        if node.untried is not None:
+            size += sys.getsizeof(node.untried)
+        stack.extend(node.children)
+    return nodes, size
@@ -0,0 +1,61 @@
+import queue
+import socket
+import threading
+
+from server import DEFAULT_PORT
+
+
+class NetworkClient:
+    """
+    Connection to a Gobang server (server.py) for the pygame client.
+
+    A background thread reads the server's lines, so the game loop never blocks on the
+    network: poll() returns the messages received since the last call, each split into
+    its fields (e.g. ['MOVE', '3', '1', '9', '9']). A lost connection shows up as a
+    final ['CLOSED'] message.
+    """
+
+    def __init__(self, host, port=DEFAULT_PORT, room='lobby', spectate=False):
+        self._socket = socket.create_connection((host, port), timeout=5)
+        self._socket.settimeout(None)
+        self._messages = queue.Queue()
+        self._send(f'JOIN {room}{" spectate" if spectate else ""}')
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    def _send(self, line):
+        try:
+            self._socket.sendall((line + '\n').encode())
+        except OSError:
+            self._messages.put(['CLOSED'])
+
+    def _run(self):
+        try:
+            with self._socket.makefile('r', encoding='utf-8', errors='replace') as lines:
+                for line in lines:
+                    fields = line.split()
+                    if fields:
+                        self._messages.put(fields)
+        except OSError:
+            pass
+        self._messages.put(['CLOSED'])
+
+    def send_move(self, point, ply=None):
+        """Sends a move; with 'ply' (the number the move would get) the server drops it if the game moved on."""
+        self._send(f'MOVE {point.X} {point.Y}' + ('' if ply is None else f' {ply}'))
+
+    def poll(self):
+        """The messages received since the last call, oldest first; never blocks."""
+        messages = []
+        while True:
+            try:
+                messages.append(self._messages.get_nowait())
+            except queue.Empty:
+                return messages
+
+    def close(self):
+        try:
+            self._socket.shutdown(socket.SHUT_RDWR)
+        except OSError:
+            pass
+        self._socket.close()
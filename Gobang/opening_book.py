@@ -0,0 +1,161 @@
+import mmap
+import os
+import struct
+
+from checkerboard import Point
+from zobrist import zobrist_keys
+
+BOOK_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'opening_book.bin')
+
+# File layout: header, then records sorted by key. A record is the canonical Zobrist key
+# of a position, the best reply as a cell index (y * line_points + x) in the canonical
+# orientation, and a weight (how often the builder saw that reply).
+_MAGIC = b'GOBOOK1\0'
+_HEADER = struct.Struct('<8sHHI')  # magic, line_points, max plies, record count
+_RECORD = struct.Struct('<QHH')    # key, move, weight
+
+# Symmetries of the square board as (x, y) -> (x', y'): the 4 rotations and their mirrors
+_SYMMETRIES = (
+    lambda x, y, m: (x, y),
+    lambda x, y, m: (m - y, x),
+    lambda x, y, m: (m - x, m - y),
+    lambda x, y, m: (y, m - x),
+    lambda x, y, m: (m - x, y),
+    lambda x, y, m: (x, m - y),
+    lambda x, y, m: (y, x),
+    lambda x, y, m: (m - y, m - x),
+)
+
+_permutation_cache = {}
+
+
+def symmetry_maps(line_points):
+    """(forward, inverse) cell index maps of each symmetry."""
+    if line_points not in _permutation_cache:
+        n = line_points
+        forward = []
+        for symmetry in _SYMMETRIES:
+            cells = [0] * (n * n)
+            for y in range(n):
+                for x in range(n):
+                    tx, ty = symmetry(x, y, n - 1)
+                    cells[y * n + x] = ty * n + tx
+            forward.append(cells)
+        inverse = []
+        for cells in forward:
+            back = [0] * (n * n)
+            for i, j in enumerate(cells):
+                back[j] = i
+            inverse.append(back)
+        _permutation_cache[line_points] = (forward, inverse)
+    return _permutation_cache[line_points]
+
+
+def canonical_key(line_points, stones):
+    """
+    Key of a position that is the same for all 8 symmetric versions of it: the smallest
+    Zobrist hash over the symmetries.
+    :param stones: (point, value) of every stone on the board
+    :return: (key, index of the symmetry that maps the position onto its canonical form)
+    """
+    keys = zobrist_keys(line_points)
+    forward, _ = symmetry_maps(line_points)
+    cells = [(point.Y * line_points + point.X, value) for point, value in stones]
+    best_key, best_symmetry = None, 0
+    for symmetry, permutation in enumerate(forward):
+        key = 0
+        for cell, value in cells:
+            key ^= keys[value][permutation[cell]]
+        if best_key is None or key < best_key:
+            best_key, best_symmetry = key, symmetry
+    return best_key, best_symmetry
+
+
+def canonical_move(line_points, symmetry, point):
+    """Cell index of 'point' after the symmetry canonical_key returned, as stored in the book."""
+    forward, _ = symmetry_maps(line_points)
+    return forward[symmetry][point.Y * line_points + point.X]
+
+
+def write_book(path, line_points, entries, max_plies):
+    """
+    Writes a book file.
+    :param entries: {canonical key: (cell index in the canonical orientation, weight)}
+    """
+    with open(path, 'wb') as f:
+        f.write(_HEADER.pack(_MAGIC, line_points, max_plies, len(entries)))
+        for key in sorted(entries):
+            move, weight = entries[key]
+            f.write(_RECORD.pack(key, move, min(weight, 0xFFFF)))
+
+
+class OpeningBook:
+    """
+    Read-only opening book: a sorted file of (position key, best reply) records, mapped
+    with mmap and searched by binary search. Opening it reads only the header, and lookups
+    touch a few pages of the file, so it costs no heap memory however large it is.
+
+    Positions are normalized for the board's 8 symmetries (canonical_key), so one record
+    covers every rotation and mirror of a position and the reply is mapped back to the
+    orientation on the board.
+    """
+
+    def __init__(self, path=BOOK_FILE):
+        self._file = open(path, 'rb')
+        try:
+            self._data = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:  # Empty file
+            self._file.close()
+            raise ValueError(f"Not an opening book: {path}")
+        if len(self._data) < _HEADER.size:
+            self.close()
+            raise ValueError(f"Not an opening book: {path}")
+        magic, self.line_points, self.max_plies, self._count = _HEADER.unpack_from(self._data, 0)
+        if magic != _MAGIC or len(self._data) != _HEADER.size + self._count * _RECORD.size:
+            self.close()
+            raise ValueError(f"Not an opening book: {path}")
+
+    def __len__(self):
+        return self._count
+
+    def close(self):
+        self._data.close()
+        self._file.close()
+
+    def _find(self, key):
+        """(move, weight) stored for 'key', or None."""
+        data, record, low, high = self._data, _RECORD, 0, self._count
+        while low < high:
+            middle = (low + high) // 2
+            offset = _HEADER.size + middle * record.size
+            found, move, weight = record.unpack_from(data, offset)
+            if found < key:
+                low = middle + 1
+            elif found > key:
+                high = middle
+            else:
+                return move, weight
+        return None
+
+    def lookup(self, line_points, stones):
+        """
+        The book reply to a position, or None if it is not in the book.
+        :param stones: (point, value) of every stone on the board, e.g. AI._applied
+        """
+        if line_points != self.line_points or len(stones) > self.max_plies:
+            return None
+        key, symmetry = canonical_key(line_points, stones)
+        entry = self._find(key)
+        if entry is None:
+            return None
+        _, inverse = symmetry_maps(line_points)
+        cell = inverse[symmetry][entry[0]]
+        return Point(cell % line_points, cell // line_points)
+
+
+def open_book(path=BOOK_FILE):
+    """The OpeningBook at 'path', or None if there is none (or it is not a book file)."""
+    try:
+        return OpeningBook(path)
+    except (OSError, ValueError):
+        return None
@@ -0,0 +1,127 @@
+import multiprocessing
+import time
+from concurrent.futures import ProcessPoolExecutor, wait, FIRST_COMPLETED
+
+from checkerboard import Point
+from search import SearchAI, SearchStats, WIN_SCORE
+
+# Per-process state of a pool worker: its own SearchAI and the moves already on its board
+_worker_ai = None
+_worker_history = []
+
+
+def _init_worker(line_points, chessman, options, stop_event):
+    global _worker_ai, _worker_history
+    _worker_ai = SearchAI(line_points, chessman, threat_search=False, **options)
+    _worker_ai.should_stop = stop_event.is_set
+    _worker_history = []
+
+
+def _sync_worker(history):
+    """Brings the worker's board to 'history' by undoing/replaying only the moves that differ."""
+    common = 0
+    while common < min(len(history), len(_worker_history)) and history[common] == _worker_history[common]:
+        common += 1
+    while len(_worker_history) > common:
+        x, y, _ = _worker_history.pop()
+        _worker_ai._remove(Point(x, y))
+    for x, y, value in history[common:]:
+        _worker_ai._place(Point(x, y), value)
+        _worker_history.append((x, y, value))
+
+
+def _search_share(history, root_moves, deadline, renju=False):
+    """Pool task: searches 'root_moves' from the position after 'history' until the wall-clock deadline."""
+    _sync_worker(history)
+    if renju:
+        _worker_ai.enable_renju()
+    time_limit_ms = max(0.0, (deadline - time.time()) * 1000)
+    _worker_ai.search([Point(x, y) for x, y in root_moves], time_limit_ms=time_limit_ms)
+    iterations = [(score, (move.X, move.Y)) for score, move in _worker_ai.iterations]
+    return iterations, _worker_ai.stats.nodes
+
+
+def _ping():
+    return _worker_ai is not None
+
+
+class ParallelSearchAI(SearchAI):
+    """
+    SearchAI that splits the root moves across a pool of long-lived worker processes.
+
+    Every worker keeps its own board, hash and transposition table between moves; a
+    search sends it only the game's move stack (which it diffs against the moves it has
+    already played) and its share of the root moves. Shares are dealt round-robin in
+    move order so each worker gets some of the strongest candidates. All workers stop
+    at the same wall-clock deadline and the results are merged at the deepest depth
+    that every worker completed, which keeps the scores comparable.
+
+    The threat-space search still runs first in this process. Call close() to shut
+    the pool down.
+    """
+
+    def __init__(self, line_points, chessman, workers=4, **options):
+        # The workers own the transposition tables; this process never runs the alpha-beta search
+        super().__init__(line_points, chessman, **dict(options, tt_bytes=0))
+        self.workers = workers
+        worker_options = {key: value for key, value in options.items() if key in ('max_depth', 'beam_width', 'tt_bytes')}
+        self._stop_event = multiprocessing.Event()
+        self._pool = ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                                         initargs=(line_points, chessman, worker_options, self._stop_event))
+        # Start every worker now rather than on the first move
+        wait([self._pool.submit(_ping) for _ in range(workers)])
+
+    def close(self):
+        self._stop_event.set()
+        self._pool.shutdown(wait=True)
+
+    def search(self, root_moves=None, time_limit_ms=None):
+        """Same contract as SearchAI.search, but the alpha-beta part runs in the pool."""
+        self._sync()
+        self._cancelled = False
+        self.interrupted = False
+        start = time.perf_counter()
+        time_limit_ms = self.time_limit_ms if time_limit_ms is None else time_limit_ms
+        self._deadline = start + time_limit_ms / 1000
+        self._candidates.reset_stats()
+
+        moves = self._ordered_moves(self._my.Value) if root_moves is None else list(root_moves)
+        self.iterations = []
+        if len(moves) <= 1:
+            self.stats = SearchStats(0, 0, 0.0, 0, 0, 0.0)
+            return moves[0] if moves else None
+        forced_win = self._find_forced_win() if self.threat_search else None
+        if forced_win is not None:
+            self.stats = SearchStats(0, 0, round((time.perf_counter() - start) * 1000, 1), 0, WIN_SCORE, 0.0)
+            return forced_win
+
+        shares = [moves[i::self.workers] for i in range(min(self.workers, len(moves)))]
+        deadline = time.time() + (self._deadline - time.perf_counter())
+        history = [(point.X, point.Y, value) for point, value in self._applied]
+        self._stop_event.clear()
+        futures = [self._pool.submit(_search_share, history, [(p.X, p.Y) for p in share], deadline,
+                                     self.renju is not None)
+                   for share in shares]
+        pending = set(futures)
+        while pending:
+            _, pending = wait(pending, timeout=0.02, return_when=FIRST_COMPLETED)
+            if pending and self._stopping():
+                self._stop_event.set()
+                wait(pending)
+                break
+
+        results = [future.result() for future in futures]
+        nodes = sum(result_nodes for _, result_nodes in results)
+        depth = min(len(iterations) for iterations, _ in results)
+        best_score, best_move = 0, moves[0]
+        if depth:
+            best_score, (x, y) = max(iterations[depth - 1] for iterations, _ in results)
+            best_move = Point(x, y)
+            for d in range(depth):
+                score, (x, y) = max(iterations[d] for iterations, _ in results)
+                self.iterations.append((score, Point(x, y)))
+        elapsed = time.perf_counter() - start
+        self.stats = SearchStats(nodes, depth, round(elapsed * 1000, 1),
+                                 int(nodes / elapsed) if elapsed > 0 else 0, best_score,
+                                 round(self._candidates.average_branching, 2))
+        return best_move
@@ -0,0 +1,138 @@
+import os
+from array import array
+
+from checkerboard import offset
+
+# Direction scores that mean "a stone here completes five"
+MY_FIVE_SCORE = 10000
+OPP_FIVE_SCORE = 9000
+
+# Direction score by [continuous stones next to the cell, capped at 4][live ends], for the
+# side placing the stone (attack) and for the other side (what the stone blocks)
+MY_SCORES = ((0, 0, 0), (0, 1, 10), (0, 10, 100), (0, 100, 1000), (MY_FIVE_SCORE,) * 3)
+OPP_SCORES = ((0, 0, 0), (0, 0, 9), (0, 9, 90), (0, 90, 900), (OPP_FIVE_SCORE,) * 3)
+
+# 2-bit cell codes of a packed line; OFF_BOARD pads both ends so windows never run out
+EMPTY, OFF_BOARD = 0, 3
+PAD = 4
+WINDOW_BITS = 18  # 9 cells x 2 bits
+WINDOW_MASK = (1 << WINDOW_BITS) - 1
+
+TABLE_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'pattern_table.bin')
+_TABLE_VERSION = 1
+
+
+def _half_run(cells, value):
+    """
+    Continuous 'value' stones in 'cells' (nearest first, up to 4) and whether the cell
+    that ends them is empty: the walk of AI._scan_direction_scores in one direction.
+    """
+    count = 0
+    for cell in cells:
+        if cell == value:
+            count += 1
+        else:
+            return count, int(cell == EMPTY)
+    return count, 0
+
+
+def build_tables():
+    """
+    Score tables indexed by the 18-bit code of a 9-cell window (cell i of the window at
+    bits 2i, the scored cell in the middle). Returns {value: (my_scores, opp_scores)}, the
+    direction scores of a stone of 'value' in the middle, as arrays of 2 ** 18 entries.
+    """
+    halves = {}
+    for value in (1, 2):
+        runs = []
+        for code in range(256):
+            nearest_first = [(code >> (2 * i)) & 3 for i in range(4)]
+            runs.append(_half_run(nearest_first, value))
+        halves[value] = runs
+    tables = {}
+    for value in (1, 2):
+        runs = halves[value]
+        other_runs = halves[3 - value]
+        my_scores = array('H', bytes(2 << WINDOW_BITS))
+        opp_scores = array('H', bytes(2 << WINDOW_BITS))
+        for back in range(256):
+            # Window cells 0..3 hold steps -4..-1, so the nearest cell is in the high bits
+            back_nearest = sum(((back >> (2 * i)) & 3) << (2 * (3 - i)) for i in range(4))
+            my_back_count, my_back_live = runs[back_nearest]
+            opp_back_count, opp_back_live = other_runs[back_nearest]
+            for forward in range(256):
+                my_count, my_live = runs[forward]
+                opp_count, opp_live = other_runs[forward]
+                my_score = MY_SCORES[min(my_back_count + my_count, 4)][my_back_live + my_live]
+                opp_score = OPP_SCORES[min(opp_back_count + opp_count, 4)][opp_back_live + opp_live]
+                for middle in range(4):
+                    code = back | middle << 8 | forward << 10
+                    my_scores[code] = my_score
+                    opp_scores[code] = opp_score
+        tables[value] = (my_scores, opp_scores)
+    return tables
+
+
+def load_tables(path=TABLE_FILE):
+    """Reads the score tables from 'path', rebuilding (and re-saving) them if it is missing or stale."""
+    size = 1 << WINDOW_BITS
+    try:
+        with open(path, 'rb') as f:
+            header = array('H')
+            header.fromfile(f, 1)
+            if header[0] == _TABLE_VERSION:
+                data = array('H')
+                data.fromfile(f, 4 * size)
+                return {1: (data[0:size], data[size:2 * size]), 2: (data[2 * size:3 * size], data[3 * size:])}
+    except (OSError, EOFError):
+        pass
+    tables = build_tables()
+    try:
+        with open(path, 'wb') as f:
+            array('H', [_TABLE_VERSION]).tofile(f)
+            for value in (1, 2):
+                for table in tables[value]:
+                    table.tofile(f)
+    except OSError:
+        pass  # Read-only install: just rebuild next time
+    return tables
+
+
+SCORE_TABLES = load_tables()
+
+# Line geometry depends only on the board size
+_geometry_cache = {}
+
+
+def line_geometry(line_points):
+    """
+    Packs the board into lines: every row, column and diagonal in each `offset`
+    direction, with cells in the order of that direction and PAD off-board cells on
+    each end.
+    :return: (empty_lines, cell_lines) where empty_lines are the packed ints of the
+             empty board, and cell_lines[y * line_points + x][k] is (line index, bit
+             shift of the cell) for direction offset[k]
+    """
+    if line_points in _geometry_cache:
+        return _geometry_cache[line_points]
+    n = line_points
+    empty_lines = []
+    cell_lines = [[None] * len(offset) for _ in range(n * n)]
+    padding = (1 << (2 * PAD)) - 1  # PAD cells of OFF_BOARD
+    for k, (x_offset, y_offset) in enumerate(offset):
+        for y in range(n):
+            for x in range(n):
+                if 0 <= x - x_offset < n and 0 <= y - y_offset < n:
+                    continue  # Not the first cell of its line
+                line = len(empty_lines)
+                t = 0
+                cx, cy = x, y
+                while 0 <= cx < n and 0 <= cy < n:
+                    cell_lines[cy * n + cx][k] = (line, 2 * (t + PAD))
+                    t += 1
+                    cx += x_offset
+                    cy += y_offset
+                empty_lines.append(padding | padding << (2 * (t + PAD)))
+    cell_lines = [tuple(lines) for lines in cell_lines]
+    _geometry_cache[line_points] = (empty_lines, cell_lines)
+    return empty_lines, cell_lines
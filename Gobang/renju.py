@@ -0,0 +1,291 @@
+from checkerboard import Checkerboard, Point, offset, BLACK_CHESSMAN
+
+_EDGE = 3  # Padding value outside the board: blocks lines like a white stone
+_PAD = 5  # Every check reads at most 5 cells along a line from the cell it is about
+
+
+class RenjuRules:
+    """
+    Black's forbidden points under Renju rules, kept up to date as stones come and go.
+
+    A black move is forbidden if it makes an overline (six or more in a row), two fours
+    (4-4) or two open threes (3-3), unless it also makes exactly five, which wins.
+    A three only counts if the stone that would turn it into a straight four (.XXXX.)
+    is itself allowed, so the check recurses into that point: the classic fake threes.
+
+    The stones are kept in a flat array padded by _PAD cells of _EDGE on every side so
+    line scans never bounds-check. Checking a cell reads only the cells within _PAD of
+    it along its four lines, plus the same around each point the fake-three recursion
+    visits. A stone therefore only re-checks the empty cells within _PAD of it along its
+    lines, and the few cells whose recursion passed near it (`_remote`). Per-direction
+    counts of the black stones near each cell settle most of those re-checks without
+    reading the lines, so place/remove are cheap while is_forbidden is a set lookup.
+    """
+
+    def __init__(self, line_points):
+        self._line_points = line_points
+        self._width = width = line_points + 2 * _PAD
+        self._cells = bytearray([_EDGE]) * (width * width)
+        for y in range(line_points):
+            start = (y + _PAD) * width + _PAD
+            self._cells[start:start + line_points] = bytes(line_points)
+        self._steps = [dy * width + dx for dx, dy in offset]
+        # Board index of each padded cell (-1 off the board)
+        self._index = [(cell // width - _PAD) * line_points + cell % width - _PAD
+                       if self._cells[cell] != _EDGE else -1 for cell in range(width * width)]
+        # Per direction, black stones within 4 cells of each cell along it
+        self._black_near = [bytearray(width * width) for _ in offset]
+        self._forbidden = set()  # Forbidden cells, as board indices y * line_points + x
+        self._visited = {}  # Padded cell -> the other points its check recursed into
+        self._remote = {}  # Padded point -> cells whose check recursed into it
+        self.checks = 0  # Cell checks run so far, recursion included
+
+    @property
+    def forbidden(self):
+        """Black's forbidden cells as board indices (y * line_points + x); read-only by convention."""
+        return self._forbidden
+
+    def forbidden_points(self):
+        n = self._line_points
+        return [Point(index % n, index // n) for index in sorted(self._forbidden)]
+
+    def is_forbidden(self, point):
+        """Whether black may not play on the empty cell 'point'; O(1)."""
+        return point.Y * self._line_points + point.X in self._forbidden
+
+    def _pad(self, point):
+        return (point.Y + _PAD) * self._width + point.X + _PAD
+
+    def place(self, point, value):
+        """A stone of 'value' (1 black, 2 white) is now on 'point'."""
+        cell = self._pad(point)
+        self._cells[cell] = value
+        if value == 1:
+            self._count_black(cell, 1)
+        self._forget(cell)
+        self._forbidden.discard(self._index[cell])
+        self._recheck(cell)
+
+    def remove(self, point):
+        """The stone on 'point' was taken back."""
+        cell = self._pad(point)
+        if self._cells[cell] == 1:
+            self._count_black(cell, -1)
+        self._cells[cell] = 0
+        self._recheck(cell)
+
+    def _count_black(self, cell, change):
+        for step, counts in zip(self._steps, self._black_near):
+            for distance in (1, 2, 3, 4):
+                counts[cell + distance * step] += change
+                counts[cell - distance * step] += change
+
+    def _recheck(self, cell):
+        """Re-checks every empty cell whose answer may read 'cell'."""
+        cells = self._cells
+        remote = self._remote
+        stale = set()
+        for step in self._steps:
+            for distance in range(-_PAD, _PAD + 1):
+                near = cell + distance * step
+                if cells[near] == 0:
+                    stale.add(near)
+                # Cells elsewhere whose recursion went through a point that reads 'cell'
+                if near in remote:
+                    stale.update(remote[near])
+        for near in stale:
+            if cells[near] == 0:
+                self._update(near)
+
+    def _update(self, cell):
+        self._forget(cell)
+        index = self._index[cell]
+        # The same test _is_forbidden starts with, from the kept counts: settles most cells
+        twos = 0
+        for counts in self._black_near:
+            count = counts[cell]
+            if count >= 4:
+                break
+            twos += count >= 2
+        else:
+            if twos < 2:
+                self._forbidden.discard(index)
+                return
+        visited = set()
+        forbidden = self._is_forbidden(cell, visited)
+        visited.discard(cell)
+        if visited:
+            self._visited[cell] = visited
+            for point in visited:
+                self._remote.setdefault(point, set()).add(cell)
+        if forbidden:
+            self._forbidden.add(index)
+        else:
+            self._forbidden.discard(index)
+
+    def _forget(self, cell):
+        """Drops the recursion points recorded for 'cell'."""
+        for point in self._visited.pop(cell, ()):
+            watchers = self._remote[point]
+            watchers.discard(cell)
+            if not watchers:
+                del self._remote[point]
+
+    # --- The rules, on the padded array; black is 1 ---
+
+    def _is_forbidden(self, cell, visited):
+        """Whether black on the empty 'cell' is forbidden; adds the points the recursion checks to 'visited'."""
+        visited.add(cell)  # Even when the stones near it settle it: they are what the answer depends on
+        cells = self._cells
+        # Black stones within 4 along each direction: a three needs 2 of them, a four 3 and
+        # a five or an overline 4, so most cells are settled by these 32 reads
+        near = []
+        for step in self._steps:
+            count = 0
+            for distance in (1, 2, 3, 4):
+                count += (cells[cell + distance * step] == 1) + (cells[cell - distance * step] == 1)
+            if count >= 2:
+                near.append((step, count))
+        if len(near) < 2 and not (near and near[0][1] >= 4):
+            return False
+        self.checks += 1
+        cells[cell] = 1
+        try:
+            overline = False
+            for step, count in near:
+                if count >= 4:
+                    run = self._run(cell, step)
+                    if run == 5:
+                        return False  # Five wins, whatever else the move makes
+                    overline = overline or run > 5
+            if overline:
+                return True
+            fours = 0
+            four_steps = []
+            for step, count in near:
+                if count >= 3:
+                    found = self._fours(cell, step)
+                    if found:
+                        fours += found
+                        four_steps.append(step)
+            if fours >= 2:
+                return True
+            threes = 0
+            for step, count in near:
+                if step not in four_steps and self._is_three(cell, step, visited):
+                    threes += 1
+                    if threes >= 2:
+                        return True
+            return False
+        finally:
+            cells[cell] = 0
+
+    def _run(self, cell, step):
+        """Length of the black run through 'cell' along 'step', counted up to 6 (an overline)."""
+        cells = self._cells
+        run = 1
+        for sign in (step, -step):
+            near = cell + sign
+            for _ in range(_PAD):
+                if cells[near] != 1:
+                    break
+                run += 1
+                near += sign
+        return run
+
+    def _five_points(self, cell, step):
+        """Empty cells along 'step' that complete exactly five together with the black 'cell'."""
+        cells = self._cells
+        points = set()
+        for start in range(-4, 1):
+            first = cell + start * step
+            empty = None
+            for i in range(5):
+                value = cells[first + i * step]
+                if value == 0:
+                    if empty is not None:
+                        break
+                    empty = first + i * step
+                elif value != 1:
+                    break
+            else:
+                # Four black and one empty in the window, and no black right outside it
+                if (empty is not None and cells[first - step] != 1
+                        and cells[first + 5 * step] != 1):
+                    points.add(empty)
+        return points
+
+    def _fours(self, cell, step):
+        """Number of fours through the black 'cell' along 'step' (a straight four counts once)."""
+        points = self._five_points(cell, step)
+        if len(points) == 2:
+            a, b = points
+            if abs(a - b) == 5 * abs(step):
+                return 1  # .XXXX.: one four with two ways to complete it
+        return len(points)
+
+    def _is_straight_four(self, cell, step):
+        """Whether the black run through 'cell' along 'step' is .XXXX. with both ends completing exactly five."""
+        cells = self._cells
+        low = high = cell
+        while cells[low - step] == 1:
+            low -= step
+        while cells[high + step] == 1:
+            high += step
+        return (high - low == 3 * step and cells[low - step] == 0 and cells[high + step] == 0
+                and cells[low - 2 * step] != 1 and cells[high + 2 * step] != 1)
+
+    def _is_three(self, cell, step, visited):
+        """Whether the black 'cell' makes a three along 'step': one more allowed stone makes a straight four."""
+        cells = self._cells
+        for distance in (-3, -2, -1, 1, 2, 3):  # A straight four through both is at most 4 long
+            near = cell + distance * step
+            if cells[near] != 0:
+                continue
+            cells[near] = 1
+            straight = self._is_straight_four(cell, step)
+            cells[near] = 0
+            if straight and not self._is_forbidden(near, visited):
+                return True
+        return False
+
+
+class RenjuCheckerboard(Checkerboard):
+    """
+    Checkerboard played by Renju rules: black's forbidden points are kept by a RenjuRules
+    updated on every make/unmake, and only exactly five wins for black (an overline does
+    not). Callers check is_forbidden before dropping a black stone.
+    """
+
+    def __init__(self, line_points, quiet=False):
+        super().__init__(line_points, quiet)
+        self.rules = RenjuRules(line_points)
+
+    def is_forbidden(self, point):
+        """Whether black may not play on 'point'; O(1)."""
+        return self.rules.is_forbidden(point)
+
+    def make(self, point, chessman):
+        super().make(point, chessman)
+        self.rules.place(point, chessman.Value)
+
+    def unmake(self):
+        point = super().unmake()
+        self.rules.remove(point)
+        return point
+
+    def _win(self, point):
+        if self._checkerboard[point.Y][point.X] != BLACK_CHESSMAN.Value:
+            return super()._win(point)
+        for x_offset, y_offset in offset:
+            count = 1
+            for sign in (1, -1):
+                x, y = point.X + sign * x_offset, point.Y + sign * y_offset
+                while (0 <= x < self._line_points and 0 <= y < self._line_points
+                       and self._checkerboard[y][x] == BLACK_CHESSMAN.Value):
+                    count += 1
+                    x += sign * x_offset
+                    y += sign * y_offset
+            if count == 5:
+                return True
+        return False
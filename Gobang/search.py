@@ -0,0 +1,311 @@
+import time
+from collections import namedtuple
+
+from checkerboard import Point
+from ai import AI
+from zobrist import TranspositionTable, EXACT, LOWER, UPPER, NO_MOVE
+from threats import ThreatSolver, WIN
+
+SearchStats = namedtuple('SearchStats', 'nodes depth elapsed_ms nps score branching')
+
+WIN_SCORE = 10 ** 8
+MAX_PLY = 100  # Scores within MAX_PLY of WIN_SCORE are forced wins or losses
+
+
+class _Timeout(Exception):
+    """Raised inside the search tree when the move deadline has passed."""
+
+
+class SearchAI(AI):
+    """
+    Negamax alpha-beta AI with iterative deepening under a per-move time budget.
+
+    Moves come from the AI's neighbourhood candidate generator, ordered by the cached
+    point scores of the greedy AI, and only the best `beam_width` of them are searched
+    at each node. Leaves are scored with the cached
+    attack potentials (sum of direction scores over empty cells) of both sides.
+    AI_drop always plays the best move of the last fully searched depth; `stats`
+    holds the nodes searched, depth reached and nodes per second of the last search.
+
+    Positions reached through different move orders share results through a
+    transposition table keyed by the AI's Zobrist hash, capped at `tt_bytes`
+    (0 disables it). `tt.stats()` reports its hit rate and fill.
+
+    Before the alpha-beta search, a VCF and then a VCT threat-space search (threats.py)
+    get up to `threat_share` of the time budget; a proven forced win is played directly.
+    """
+
+    def __init__(self, line_points, chessman, time_limit_ms=1000, max_depth=10, beam_width=12,
+                 tt_bytes=16 * 1024 * 1024, threat_search=True, threat_share=0.3, checkerboard=None):
+        super().__init__(line_points, chessman, checkerboard)
+        self.time_limit_ms = time_limit_ms
+        self.max_depth = max_depth
+        self.beam_width = beam_width
+        self.tt = TranspositionTable(tt_bytes) if tt_bytes else None
+        self.threat_search = threat_search
+        self.threat_share = threat_share
+        self.threat_result = None
+        self.stats = SearchStats(0, 0, 0.0, 0, 0, 0.0)
+        self._nodes = 0
+        self._deadline = 0.0
+        self._cancelled = False
+        # Optional callable polled during the search; returning True stops it like cancel()
+        self.should_stop = None
+        self.interrupted = False
+        self.iterations = []
+
+    def AI_drop(self):
+        point = self._book_drop()
+        if point is not None:
+            return point
+        point = self.search()
+        if point is None:
+            print("AI Error: No empty cells found!")
+            return None
+        self._play(point)
+        print(f"AI chooses: ({point.X}, {point.Y}) "
+              f"depth {self.stats.depth}, {self.stats.nodes} nodes, {self.stats.nps} nodes/s, "
+              f"branching {self.stats.branching}")
+        if self.tt is not None:
+            tt_stats = self.tt.stats()
+            print(f"TT: hit rate {tt_stats.hit_rate:.1%}, fill {tt_stats.fill:.1%} of {tt_stats.size} entries")
+        return point
+
+    def cancel(self):
+        """
+        Asks a running search (possibly on another thread) to stop as soon as possible.
+        It then returns the best move of the last completed depth and sets `interrupted`.
+        """
+        self._cancelled = True
+
+    def search(self, root_moves=None, time_limit_ms=None):
+        """
+        Runs iterative deepening from the current position and returns the chosen point.
+        :param root_moves: search only these root moves (e.g. one share of a parallel search)
+        :param time_limit_ms: overrides `time_limit_ms` for this search
+        """
+        self._sync()
+        self._cancelled = False
+        self.interrupted = False
+        start = time.perf_counter()
+        self._deadline = start + (self.time_limit_ms if time_limit_ms is None else time_limit_ms) / 1000
+        self._nodes = 0
+        self._candidates.reset_stats()
+        if self.tt is not None:
+            self.tt.new_search()
+
+        moves = self._ordered_moves(self._my.Value) if root_moves is None else list(root_moves)
+        best_move = moves[0] if moves else None
+        best_score = 0
+        depth_reached = 0
+        # (score, move) of every completed depth, so partial searches can be merged
+        self.iterations = []
+        forced_win = self._find_forced_win() if self.threat_search and len(moves) > 1 else None
+        if forced_win is not None:
+            best_move, best_score = forced_win, WIN_SCORE
+        elif len(moves) > 1 or (root_moves is not None and moves):
+            for depth in range(1, self.max_depth + 1):
+                try:
+                    # Depth 1 always completes so there is a searched move to fall back on
+                    score, move = self._search_root(moves, depth, check_time=depth > 1)
+                except _Timeout:
+                    break
+                best_score, best_move, depth_reached = score, move, depth
+                self.iterations.append((score, move))
+                # Search the previous best move first at the next depth
+                moves.remove(move)
+                moves.insert(0, move)
+                if abs(score) >= WIN_SCORE - MAX_PLY:
+                    break  # A forced win or loss has been found; deeper search changes nothing
+
+        elapsed = time.perf_counter() - start
+        self.stats = SearchStats(self._nodes, depth_reached, round(elapsed * 1000, 1),
+                                 int(self._nodes / elapsed) if elapsed > 0 else 0, best_score,
+                                 round(self._candidates.average_branching, 2))
+        return best_move
+
+    def analyze(self, value, top_n=3, on_depth=None, time_limit_ms=None):
+        """
+        Scores the `top_n` best moves for the side 'value' (either side) by iterative deepening.
+        Every root move is searched with alpha at the N-th best score so far, so the moves that
+        make the list have exact scores. After each completed depth, on_depth(depth, lines) gets
+        the list as [(score, point)], best first. Runs until `max_depth`, the time limit (None:
+        no limit), cancel() or should_stop; returns the lines of the last completed depth.
+        """
+        self._sync()
+        self._cancelled = False
+        self.interrupted = False
+        start = time.perf_counter()
+        self._deadline = float('inf') if time_limit_ms is None else start + time_limit_ms / 1000
+        self._nodes = 0
+        self._candidates.reset_stats()
+        if self.tt is not None:
+            self.tt.new_search()
+
+        moves = self._ordered_moves(value)
+        lines = []
+        for depth in range(1, self.max_depth + 1):
+            if self._stopping():
+                break
+            try:
+                depth_lines = []
+                for point in moves:
+                    alpha = depth_lines[-1][0] if len(depth_lines) >= top_n else -WIN_SCORE - 1
+                    score = self._score_move(point, value, depth, alpha, WIN_SCORE + 1, 1, check_time=True)
+                    if score > alpha:
+                        depth_lines.append((score, point))
+                        depth_lines.sort(key=lambda line: -line[0])
+                        del depth_lines[top_n:]
+            except _Timeout:
+                break
+            lines = depth_lines
+            elapsed = time.perf_counter() - start
+            self.stats = SearchStats(self._nodes, depth, round(elapsed * 1000, 1),
+                                     int(self._nodes / elapsed) if elapsed > 0 else 0, lines[0][0] if lines else 0,
+                                     round(self._candidates.average_branching, 2))
+            if on_depth is not None:
+                on_depth(depth, lines)
+            # The best moves first at the next depth
+            best = [point for _, point in lines]
+            moves = best + [point for point in moves if point not in best]
+            if len(moves) <= 1 or (lines and abs(lines[0][0]) >= WIN_SCORE - MAX_PLY):
+                break  # Nothing to compare, or a forced result that deeper search will not change
+        return lines
+
+    def _find_forced_win(self):
+        """Runs VCF, then VCT, for the AI; returns the first move of a proven win or None."""
+        if self._is_forbidden_side(self._my.Value):
+            return None  # The threat solver does not know black's forbidden points, its wins may use them
+        solver = ThreatSolver(self._checkerboard, self._line_points, should_stop=self._stopping)
+        budget_ms = self.time_limit_ms * self.threat_share
+        result = solver.solve_vcf(self._my.Value, time_limit_ms=budget_ms / 2)
+        kind = 'VCF'
+        if result.status != WIN and not self._opp_fives:
+            result = solver.solve_vct(self._my.Value, time_limit_ms=budget_ms / 2)
+            kind = 'VCT'
+        self.threat_result = result
+        if result.status != WIN:
+            return None
+        print(f"AI found a {kind} win in {result.nodes} nodes ({result.elapsed_ms} ms): "
+              + ' '.join(f'({p.X}, {p.Y})' for p in result.moves))
+        return result.moves[0]
+
+    def _stopping(self):
+        if self._cancelled or (self.should_stop is not None and self.should_stop()):
+            self.interrupted = True
+        return self.interrupted
+
+    def _search_root(self, moves, depth, check_time):
+        alpha = -WIN_SCORE - 1
+        best_move = moves[0]
+        for point in moves:
+            score = self._score_move(point, self._my.Value, depth, alpha, WIN_SCORE + 1, 1, check_time)
+            if score > alpha:
+                alpha = score
+                best_move = point
+        return alpha, best_move
+
+    def _score_move(self, point, value, depth, alpha, beta, ply, check_time):
+        """Plays 'point' for 'value' and returns its negamax score for that side."""
+        if self._is_five(point, value):
+            return WIN_SCORE - ply
+        self._place(point, value)
+        try:
+            return -self._negamax(depth - 1, -beta, -alpha, self._other(value), ply + 1, check_time)
+        finally:
+            self._remove(point)
+
+    def _negamax(self, depth, alpha, beta, value, ply, check_time):
+        self._nodes += 1
+        if check_time and self._nodes & 255 == 0 and (time.perf_counter() > self._deadline or self._stopping()):
+            raise _Timeout()
+
+        if depth == 0:
+            return self._evaluate(value, ply)
+
+        tt_move = NO_MOVE
+        if self.tt is not None:
+            entry = self.tt.probe(self._hash)
+            if entry is not None:
+                tt_depth, flag, tt_score, tt_move = entry
+                if tt_depth >= depth:
+                    tt_score = _score_from_tt(tt_score, ply)
+                    if flag == EXACT or (flag == LOWER and tt_score >= beta) or (flag == UPPER and tt_score <= alpha):
+                        return tt_score
+
+        moves = self._ordered_moves(value)
+        if not moves:
+            return 0  # Board full: draw
+        if tt_move != NO_MOVE:
+            tt_point = Point(tt_move % self._line_points, tt_move // self._line_points)
+            if tt_point in moves:
+                moves.remove(tt_point)
+                moves.insert(0, tt_point)
+
+        original_alpha = alpha
+        best_score = -WIN_SCORE - 1
+        best_move = NO_MOVE
+        for point in moves:
+            score = self._score_move(point, value, depth, alpha, beta, ply, check_time)
+            if score > best_score:
+                best_score = score
+                best_move = point.Y * self._line_points + point.X
+                if score > alpha:
+                    alpha = score
+                    if alpha >= beta:
+                        break
+
+        if self.tt is not None:
+            if best_score <= original_alpha:
+                flag = UPPER
+            elif best_score >= beta:
+                flag = LOWER
+            else:
+                flag = EXACT
+            self.tt.store(self._hash, depth, flag, _score_to_tt(best_score, ply), best_move)
+        return best_score
+
+    def _ordered_moves(self, value):
+        """Best `beam_width` candidates by cached point score; forced blocks only if one is needed."""
+        if value == self._my.Value:
+            opponent_fives = self._opp_fives
+        else:
+            opponent_fives = self._my_fives
+        if opponent_fives:
+            # The opponent threatens five: winning now or blocking are the only sensible moves
+            other = self._other(value)
+            forced = self.candidate_moves(keep=lambda index: self._is_five_at(index, value)
+                                          or self._is_five_at(index, other), value=value)
+            if forced:
+                return forced
+        return self.candidate_moves(self.beam_width, value=value)
+
+    def _evaluate(self, value, ply):
+        """Static score of the position for the side 'value' that is about to move."""
+        if value == self._my.Value:
+            if self._my_fives:
+                return WIN_SCORE - ply  # Side to move completes five with this move
+            return self._my_potential - self._opp_potential
+        if self._opp_fives:
+            return WIN_SCORE - ply
+        return self._opp_potential - self._my_potential
+
+    def _other(self, value):
+        return self._opponent.Value if value == self._my.Value else self._my.Value
+
+
+def _score_to_tt(score, ply):
+    """Stores win/loss scores relative to the node, so they stay valid at any ply."""
+    if score >= WIN_SCORE - MAX_PLY:
+        return score + ply
+    if score <= -WIN_SCORE + MAX_PLY:
+        return score - ply
+    return score
+
+
+def _score_from_tt(score, ply):
+    if score >= WIN_SCORE - MAX_PLY:
+        return score - ply
+    if score <= -WIN_SCORE + MAX_PLY:
+        return score + ply
+    return score
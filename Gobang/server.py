@@ -0,0 +1,262 @@
+"""
+asyncio Gobang server: many concurrent rooms, two players and any number of spectators each.
+
+The server owns the game state: every room plays on a Checkerboard, and a move only
+counts once the server has accepted it and broadcast it to the whole room.
+
+Protocol: one text command per line, fields separated by spaces.
+  client -> server
+    JOIN <room> [spectate]     join (or create) a room; the first two players are black, white
+    MOVE <x> <y> [<ply>]       play a stone (only on your turn); with <ply>, the move is
+                               rejected as stale unless it would be that ply of the game
+  server -> client
+    JOINED <room> <role> <line points>   role is black, white or spectator
+    START                      both seats are taken: black to move
+    MOVE <ply> <value> <x> <y> a stone was played (ply counts from 1; value 1 black, 2 white)
+    WIN <value> | DRAW         the game is over; a NEW game follows straight away
+    NEW                        a new game starts in the room, black to move
+    LEFT <role>                a player left; the next player to join takes the seat
+    ERROR <message>
+A client joining mid-game receives START (if both seats are taken) and the game's moves.
+
+Backpressure: each client has a bounded send queue drained by its own writer task, which
+waits for the socket to accept data (drain) before writing more; socket and transport
+buffers are capped at SEND_BUFFER_BYTES. A client that falls more than SEND_QUEUE_SIZE
+messages behind is disconnected rather than let its backlog grow without bound or hold
+up the room.
+
+Usage: python server.py [--host 127.0.0.1] [--port 5555] [--size 19]
+"""
+import argparse
+import asyncio
+import socket
+import time
+
+from checkerboard import Checkerboard, Point, BLACK_CHESSMAN, WHITE_CHESSMAN
+
+DEFAULT_PORT = 5555
+Line_Points = 19
+MAX_LINE_BYTES = 256
+SEND_QUEUE_SIZE = 256  # Messages a client may lag behind before it is dropped
+SEND_BUFFER_BYTES = 64 * 1024  # Kernel and transport buffering per client on top of the queue
+ROLES = {BLACK_CHESSMAN.Value: 'black', WHITE_CHESSMAN.Value: 'white'}
+
+
+class Client:
+    """One connection: its send queue and writer task, and its seat."""
+
+    def __init__(self, writer):
+        self.writer = writer
+        # Small buffers so a stalled reader fills its queue (and is dropped) instead of
+        # having megabytes parked for it in the kernel
+        sock = writer.get_extra_info('socket')
+        if sock is not None:
+            sock.setsockopt(socket.SOL_SOCKET, socket.SO_SNDBUF, SEND_BUFFER_BYTES)
+        writer.transport.set_write_buffer_limits(high=SEND_BUFFER_BYTES)
+        self.queue = asyncio.Queue(SEND_QUEUE_SIZE)
+        self.room = None
+        self.value = 0  # Chessman value of a player, 0 for a spectator
+        self.closed = False
+
+    def send(self, data):
+        """Queues encoded message bytes; never blocks. Drops the client if it is too far behind."""
+        if self.closed:
+            return
+        try:
+            self.queue.put_nowait(data)
+        except asyncio.QueueFull:
+            self.close()
+
+    async def pump(self):
+        """Writes queued messages, batching whatever is waiting, and waits for the socket to drain."""
+        try:
+            while not self.closed:
+                batch = [await self.queue.get()]
+                while not self.queue.empty():
+                    batch.append(self.queue.get_nowait())
+                self.writer.write(b''.join(batch))
+                await self.writer.drain()
+        except (ConnectionError, asyncio.CancelledError):
+            pass
+        finally:
+            self.close()
+
+    def close(self):
+        if not self.closed:
+            self.closed = True
+            self.writer.close()
+
+
+class Room:
+    def __init__(self, name, line_points):
+        self.name = name
+        self.line_points = line_points
+        self.players = {BLACK_CHESSMAN.Value: None, WHITE_CHESSMAN.Value: None}
+        self.spectators = set()
+        self.new_game()
+
+    def new_game(self):
+        self.board = Checkerboard(self.line_points, quiet=True)
+        self.turn = BLACK_CHESSMAN
+
+    def members(self):
+        yield from (client for client in self.players.values() if client is not None)
+        yield from self.spectators
+
+    def broadcast(self, line):
+        data = (line + '\n').encode()
+        for client in list(self.members()):
+            client.send(data)
+
+    def is_full(self):
+        return all(self.players.values())
+
+    def join(self, client, spectate):
+        free = [value for value, player in self.players.items() if player is None]
+        if spectate or not free:
+            self.spectators.add(client)
+            client.value = 0
+        else:
+            client.value = free[0]
+            self.players[client.value] = client
+        client.room = self
+        role = ROLES.get(client.value, 'spectator')
+        client.send(f'JOINED {self.name} {role} {self.line_points}\n'.encode())
+        if client.value and self.is_full():
+            self.broadcast('START')
+        elif self.is_full():
+            client.send(b'START\n')
+        for ply, point in enumerate(self.board.moves, 1):
+            value = BLACK_CHESSMAN.Value if ply % 2 else WHITE_CHESSMAN.Value
+            client.send(f'MOVE {ply} {value} {point.X} {point.Y}\n'.encode())
+
+    def leave(self, client):
+        if client.value and self.players.get(client.value) is client:
+            self.players[client.value] = None
+            self.broadcast(f'LEFT {ROLES[client.value]}')
+        self.spectators.discard(client)
+        client.room = None
+
+    def is_empty(self):
+        return not any(self.players.values()) and not self.spectators
+
+    def move(self, client, point, ply=None):
+        """Plays 'point' for 'client'; returns an error message or None (the move was broadcast)."""
+        if not client.value:
+            return 'spectators cannot move'
+        if not self.is_full():
+            return 'waiting for an opponent'
+        if ply is not None and ply != len(self.board.moves) + 1:
+            return 'stale move'  # Sent for a position that has changed, e.g. a game that just ended
+        if client.value != self.turn.Value:
+            return 'not your turn'
+        if not (0 <= point.X < self.line_points and 0 <= point.Y < self.line_points) or not self.board.can_drop(point):
+            return 'illegal move'
+        winner = self.board.drop(self.turn, point)
+        self.broadcast(f'MOVE {len(self.board.moves)} {self.turn.Value} {point.X} {point.Y}')
+        if winner is not None or len(self.board.moves) == self.line_points ** 2:
+            self.broadcast(f'WIN {winner.Value}' if winner is not None else 'DRAW')
+            self.new_game()
+            self.broadcast('NEW')
+        else:
+            self.turn = WHITE_CHESSMAN if self.turn is BLACK_CHESSMAN else BLACK_CHESSMAN
+        return None
+
+
+class GameServer:
+    def __init__(self, line_points=Line_Points):
+        self.line_points = line_points
+        self.rooms = {}
+        self.clients = 0
+        self.moves = 0
+
+    async def handle(self, reader, writer):
+        client = Client(writer)
+        pump = asyncio.create_task(client.pump())
+        self.clients += 1
+        try:
+            while not client.closed:
+                try:
+                    line = await reader.readline()
+                except (ValueError, ConnectionError):  # Line too long, or the connection was reset
+                    break
+                if not line:
+                    break
+                error = self.dispatch(client, line.decode(errors='replace').split())
+                if error:
+                    client.send(f'ERROR {error}\n'.encode())
+        finally:
+            self.clients -= 1
+            room = client.room
+            if room is not None:
+                room.leave(client)
+                if room.is_empty():
+                    del self.rooms[room.name]
+            pump.cancel()
+            client.close()
+
+    def dispatch(self, client, fields):
+        """Runs one command; returns an error message or None."""
+        if not fields:
+            return None
+        command = fields[0].upper()
+        if command == 'JOIN' and len(fields) in (2, 3):
+            if client.room is not None:
+                return 'already in a room'
+            room = self.rooms.get(fields[1])
+            if room is None:
+                room = self.rooms[fields[1]] = Room(fields[1], self.line_points)
+            room.join(client, len(fields) == 3 and fields[2].lower() == 'spectate')
+            return None
+        if command == 'MOVE' and len(fields) in (3, 4):
+            if client.room is None:
+                return 'join a room first'
+            try:
+                point = Point(int(fields[1]), int(fields[2]))
+                ply = int(fields[3]) if len(fields) == 4 else None
+            except ValueError:
+                return 'bad move'
+            error = client.room.move(client, point, ply)
+            if error is None:
+                self.moves += 1
+            return error
+        return f'unknown command {fields[0]}'
+
+    async def report(self, interval):
+        """Prints the load every 'interval' seconds while there are clients."""
+        last_moves, last_time = self.moves, time.perf_counter()
+        while True:
+            await asyncio.sleep(interval)
+            now = time.perf_counter()
+            if self.clients or self.moves != last_moves:
+                print(f'{self.clients} clients, {len(self.rooms)} rooms, '
+                      f'{(self.moves - last_moves) / (now - last_time):.0f} moves/s')
+            last_moves, last_time = self.moves, now
+
+    async def serve(self, host, port, report_interval=10):
+        server = await asyncio.start_server(self.handle, host, port, limit=MAX_LINE_BYTES, backlog=4096)
+        print(f'Gobang server on {", ".join(str(s.getsockname()[:2]) for s in server.sockets)}')
+        reporter = asyncio.create_task(self.report(report_interval)) if report_interval else None
+        try:
+            async with server:
+                await server.serve_forever()
+        finally:
+            if reporter is not None:
+                reporter.cancel()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=DEFAULT_PORT)
+    parser.add_argument('--size', type=int, default=Line_Points, help='board lines')
+    parser.add_argument('--report', type=float, default=10, help='seconds between load reports (0 for none)')
+    args = parser.parse_args()
+    try:
+        asyncio.run(GameServer(args.size).serve(args.host, args.port, args.report))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == '__main__':
+    main()
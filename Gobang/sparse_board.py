@@ -0,0 +1,126 @@
+from checkerboard import offset
+
+
+class SparseCheckerboard:
+    """
+    Checkerboard for large and unbounded boards ("infinite gomoku").
+
+    Only the stones are stored: a dict from (x, y) to Chessman value, plus for each
+    direction in `offset` an index from line to the set of positions occupied along it.
+    Memory and the cost of a move grow with the number of stones, never with the board
+    area, so a 1000x1000 board costs the same as a 19x19 one with the same stones.
+    With line_points=None the board is unbounded and coordinates may be any ints,
+    negative included.
+
+    Same drop/make/unmake/moves interface as Checkerboard; there is no dense
+    `checkerboard` view, use value_at() or `stones` instead.
+    """
+
+    def __init__(self, line_points=None, quiet=False):
+        self._line_points = line_points
+        self._stones = {}  # (x, y) -> Chessman value
+        # Per direction: line id -> positions of the stones on that line
+        self._lines = [{} for _ in offset]
+        self._moves = []
+        self.quiet = quiet
+
+    def _get_line_points(self):
+        return self._line_points
+
+    line_points = property(_get_line_points)  # None for an unbounded board
+
+    def _get_stones(self):
+        return self._stones
+
+    stones = property(_get_stones)  # Read-only by convention
+
+    def _get_moves(self):
+        return self._moves
+
+    moves = property(_get_moves)
+
+    @staticmethod
+    def _line_of(x, y, k):
+        """(line id, position along the line) of cell (x, y) in direction offset[k]."""
+        if k == 0:
+            return y, x
+        if k == 1:
+            return x, y
+        if k == 2:
+            return x - y, x
+        return x + y, x
+
+    def in_bounds(self, point):
+        n = self._line_points
+        return n is None or (0 <= point.X < n and 0 <= point.Y < n)
+
+    def value_at(self, point):
+        """Chessman value of the stone at 'point', 0 if the cell is empty."""
+        return self._stones.get((point.X, point.Y), 0)
+
+    def line_stones(self, point, k):
+        """Positions along the line through 'point' in direction offset[k] that hold a stone."""
+        line, _ = self._line_of(point.X, point.Y, k)
+        return self._lines[k].get(line, ())
+
+    def make(self, point, chessman):
+        """Puts a stone on the board and pushes it on the move stack; no win check, no print."""
+        x, y = point.X, point.Y
+        self._stones[(x, y)] = chessman.Value
+        for k, lines in enumerate(self._lines):
+            line, position = self._line_of(x, y, k)
+            positions = lines.get(line)
+            if positions is None:
+                positions = lines[line] = set()
+            positions.add(position)
+        self._moves.append(point)
+
+    def unmake(self):
+        """Takes back the last move made and returns its point."""
+        point = self._moves.pop()
+        x, y = point.X, point.Y
+        del self._stones[(x, y)]
+        for k, lines in enumerate(self._lines):
+            line, position = self._line_of(x, y, k)
+            positions = lines[line]
+            positions.discard(position)
+            if not positions:
+                del lines[line]
+        return point
+
+    def can_drop(self, point):
+        """Checks if a stone can be placed at the given point."""
+        return self.in_bounds(point) and (point.X, point.Y) not in self._stones
+
+    def drop(self, chessman, point):
+        """
+        落子
+        :return:若该子落下之后即可获胜，则返回获胜方，否则返回 None
+        """
+        if not self.quiet:
+            print(f'{chessman.Name} ({point.X}, {point.Y})')
+        self.make(point, chessman)
+
+        if self._win(point):
+            if not self.quiet:
+                print(f'{chessman.Name}获胜')
+            return chessman
+
+    def _win(self, point):
+        """Checks if the last move at 'point' resulted in a win."""
+        stones = self._stones
+        value = stones[(point.X, point.Y)]
+        for k, (x_offset, y_offset) in enumerate(offset):
+            positions = self.line_stones(point, k)
+            if len(positions) < 5:
+                continue  # Fewer than five stones of any color on the whole line
+            count = 1
+            for sign in (1, -1):
+                x, y = point.X + sign * x_offset, point.Y + sign * y_offset
+                while stones.get((x, y)) == value:
+                    count += 1
+                    x += sign * x_offset
+                    y += sign * y_offset
+            if count >= 5:
+                return True
+        return False
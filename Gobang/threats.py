@@ -0,0 +1,252 @@
+import time
+from collections import namedtuple
+from functools import lru_cache
+
+from checkerboard import Point, offset
+from candidates import CandidateGenerator
+
+# Result states of a threat-space search
+WIN = 'win'          # A forced win was proven; `moves` is the winning line
+NO_WIN = 'no_win'    # Every threat sequence within the depth limit was refuted
+UNKNOWN = 'unknown'  # The node or time limit was hit before the search finished
+
+ThreatResult = namedtuple('ThreatResult', 'status moves nodes elapsed_ms')
+
+# Threat classes of an attacking move, from the attacker's point of view
+_NONE, _THREE, _FOUR, _FIVE = 0, 1, 2, 3
+
+# Relative cell values inside a line segment
+_EMPTY, _OWN, _BLOCKED = 0, 1, 2
+
+
+class _LimitReached(Exception):
+    """Raised when the node or time limit of a solve is exhausted."""
+
+
+@lru_cache(maxsize=None)
+def _analyze_segment(segment):
+    """
+    Classifies a stone dropped in the middle of a 9-cell line segment.
+    :param segment: 9 relative cell values (_EMPTY/_OWN/_BLOCKED); index 4 is the empty drop point
+    :return: (five, gains, defences): whether the drop makes five, the offsets where a
+             follow-up stone would complete five (a four), and the offsets that defend an
+             open three created by the drop (empty if it makes none)
+    """
+    line = list(segment)
+    line[4] = _OWN
+
+    def run_through(i):
+        start = end = i
+        while start > 0 and line[start - 1] == _OWN:
+            start -= 1
+        while end < 8 and line[end + 1] == _OWN:
+            end += 1
+        return start, end
+
+    start, end = run_through(4)
+    if end - start >= 4:
+        return True, (), ()
+
+    gains = []
+    for i in range(9):
+        if line[i] == _EMPTY:
+            line[i] = _OWN
+            start, end = run_through(4)
+            if end - start >= 4 and start <= i <= end:
+                gains.append(i - 4)
+            line[i] = _EMPTY
+
+    defences = set()
+    if not gains:
+        # Open three: a 6-cell window with empty ends and 3 stones + 1 gap inside,
+        # so one more stone makes a straight four
+        for s in range(4):
+            window = line[s:s + 6]
+            inner = window[1:5]
+            if window[0] == _EMPTY and window[5] == _EMPTY and inner.count(_OWN) == 3 and inner.count(_EMPTY) == 1:
+                defences.update(s + k - 4 for k in range(6) if window[k] == _EMPTY)
+    return False, tuple(gains), tuple(sorted(defences))
+
+
+class ThreatSolver:
+    """
+    Threat-space search for forced wins: VCF (victory by continuous fours) and VCT
+    (victory by continuous threats, i.e. fours and open threes).
+
+    Only threat-making moves are expanded for the attacker. A four leaves the defender
+    a single reply; an open three may be answered on any of its defence points or by any
+    counter-four, and all of those replies must lose for the three to count. Results are
+    sound: a WIN is always a real forced win (five or more in a row), while a NO_WIN only
+    means none was found within the depth limit.
+    """
+
+    def __init__(self, board, line_points=None, should_stop=None):
+        """
+        :param board: list of lists of Chessman values ([y][x]); it is copied, not modified
+        :param should_stop: optional callable polled every node; returning True aborts the solve
+        """
+        self._line_points = line_points or len(board)
+        self._board = [row[:] for row in board]
+        self._candidates = CandidateGenerator(self._line_points)
+        for y, row in enumerate(self._board):
+            for x, value in enumerate(row):
+                if value:
+                    self._candidates.place(Point(x, y))
+        self._stack = []
+        self._nodes = 0
+        self._max_nodes = 0
+        self._deadline = None
+        self._should_stop = should_stop
+
+    def solve_vcf(self, value, max_depth=12, max_nodes=20000, time_limit_ms=None):
+        """Looks for a win for 'value' using fours only. max_depth counts attacker moves."""
+        return self._solve(self._vcf, value, max_depth, max_nodes, time_limit_ms)
+
+    def solve_vct(self, value, max_depth=4, max_nodes=20000, time_limit_ms=None, vcf_depth=6):
+        """Looks for a win for 'value' using fours and open threes; each node also tries VCF."""
+        return self._solve(lambda v, d: self._vct(v, d, vcf_depth), value, max_depth, max_nodes, time_limit_ms)
+
+    def _solve(self, search, value, max_depth, max_nodes, time_limit_ms):
+        start = time.perf_counter()
+        self._nodes = 0
+        self._max_nodes = max_nodes
+        self._deadline = start + time_limit_ms / 1000 if time_limit_ms else None
+        try:
+            moves = search(value, max_depth)
+            status = WIN if moves is not None else NO_WIN
+        except _LimitReached:
+            moves, status = None, UNKNOWN
+            while self._stack:
+                self._undo(self._stack[-1])
+        elapsed_ms = round((time.perf_counter() - start) * 1000, 2)
+        return ThreatResult(status, moves or [], self._nodes, elapsed_ms)
+
+    # --- Search ---
+    def _vcf(self, value, depth):
+        """Returns the winning move sequence for 'value' by continuous fours, or None."""
+        self._count_node()
+        threats = self._threats(value)
+        for point, kind, _ in threats:
+            if kind == _FIVE:
+                return [point]
+        if depth == 0 or self._has_five(3 - value):
+            return None
+
+        for point, kind, gains in threats:
+            if kind != _FOUR:
+                continue
+            if len(gains) >= 2:
+                return [point, gains[0], gains[1]]  # Double four / open four: cannot be stopped
+            self._make(point, value)
+            self._make(gains[0], 3 - value)
+            line = self._vcf(value, depth - 1)
+            self._undo(gains[0])
+            self._undo(point)
+            if line is not None:
+                return [point, gains[0]] + line
+        return None
+
+    def _vct(self, value, depth, vcf_depth):
+        """Returns a winning first move sequence for 'value' by fours and threes, or None."""
+        self._count_node()
+        if self._has_five(3 - value):
+            threats = self._threats(value)
+            for point, kind, _ in threats:
+                if kind == _FIVE:
+                    return [point]
+            return None
+        line = self._vcf(value, vcf_depth)
+        if line is not None or depth == 0:
+            return line
+
+        for point, kind, defences in self._threats(value):
+            if kind == _NONE:
+                continue
+            self._make(point, value)
+            replies = list(defences)
+            if kind == _THREE:
+                # The defender may also answer a three with a four of their own
+                replies.extend(p for p, k, _ in self._threats(3 - value) if k >= _FOUR and p not in replies)
+            refuted = False
+            for reply in replies:
+                self._make(reply, 3 - value)
+                line = self._vct(value, depth - 1, vcf_depth)
+                self._undo(reply)
+                if line is None:
+                    refuted = True
+                    break
+            self._undo(point)
+            if not refuted:
+                return [point]
+        return None
+
+    # --- Board helpers ---
+    def _count_node(self):
+        self._nodes += 1
+        if self._nodes > self._max_nodes:
+            raise _LimitReached()
+        if self._deadline is not None and time.perf_counter() > self._deadline:
+            raise _LimitReached()
+        if self._should_stop is not None and self._should_stop():
+            raise _LimitReached()
+
+    def _make(self, point, value):
+        self._board[point.Y][point.X] = value
+        self._candidates.place(point)
+        self._stack.append(point)
+
+    def _undo(self, point):
+        self._board[point.Y][point.X] = 0
+        self._candidates.remove(point)
+        self._stack.pop()
+
+    def _has_five(self, value):
+        return any(kind == _FIVE for _, kind, _ in self._threats(value, fives_only=True))
+
+    def _threats(self, value, fives_only=False):
+        """
+        Threat-making moves for 'value', strongest first, as (point, kind, extra) where
+        extra is the five points of a four or the defence points of a three.
+        """
+        n = self._line_points
+        board = self._board
+        threats = []
+        for index in self._candidates.indices():
+            x, y = index % n, index // n
+            if board[y][x]:
+                continue
+            kind = _NONE
+            gains = []
+            defences = []
+            for x_offset, y_offset in offset:
+                segment = []
+                for step in range(-4, 5):
+                    cx = x + step * x_offset
+                    cy = y + step * y_offset
+                    if step == 0:
+                        segment.append(_EMPTY)
+                    elif 0 <= cx < n and 0 <= cy < n:
+                        cell = board[cy][cx]
+                        segment.append(_EMPTY if cell == 0 else _OWN if cell == value else _BLOCKED)
+                    else:
+                        segment.append(_BLOCKED)
+                five, segment_gains, segment_defences = _analyze_segment(tuple(segment))
+                if five:
+                    kind = _FIVE
+                    break
+                if fives_only:
+                    continue
+                for step in segment_gains:
+                    gains.append(Point(x + step * x_offset, y + step * y_offset))
+                for step in segment_defences:
+                    defences.append(Point(x + step * x_offset, y + step * y_offset))
+            point = Point(x, y)
+            if kind == _FIVE:
+                threats.append((point, _FIVE, ()))
+            elif gains:
+                threats.append((point, _FOUR, tuple(dict.fromkeys(gains))))
+            elif defences:
+                threats.append((point, _THREE, tuple(dict.fromkeys(defences))))
+        # Fives first, then fours with the most five points, then threes
+        threats.sort(key=lambda threat: (threat[1], len(threat[2]) if threat[1] == _FOUR else 0), reverse=True)
+        return threats
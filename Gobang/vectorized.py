@@ -0,0 +1,139 @@
+import numpy as np
+
+from checkerboard import Point, offset
+from ai import AI
+from patterns import MY_SCORES, OPP_SCORES
+
+_OFF_BOARD = 3  # Padding value: blocks a line like an opponent stone
+
+# Direction score by [stones in the line through the cell (capped at 4)][live ends], as in
+# AI._scan_direction_scores: for the AI's own stones and for the opponent's (blocking value)
+_MY_TABLE = np.array(MY_SCORES, dtype=np.int64)
+_OPP_TABLE = np.array(OPP_SCORES, dtype=np.int64)
+
+
+class VectorizedEvaluator:
+    """
+    Whole-board version of AI._get_point_score on NumPy arrays.
+
+    The board is an int8 array padded by 4 off-board cells on each side. For each of the
+    4 `offset` directions and both ways along it, the 4 neighbouring cells of every
+    intersection are taken as shifted views of the padded board, so counting the
+    continuous stones next to each cell (a cumulative product over the shifts) and
+    checking whether the cell after them is empty happen for all 361 cells at once.
+    score_map() then looks up the same open/closed two/three/four scores as the loop
+    version and adds the same center bonus, so it matches _get_point_score exactly.
+    """
+
+    def __init__(self, line_points):
+        self._line_points = line_points
+        self._board = np.full((line_points + 8, line_points + 8), _OFF_BOARD, dtype=np.int8)
+        self._board[4:-4, 4:-4] = 0
+        center = line_points // 2
+        ys, xs = np.mgrid[0:line_points, 0:line_points]
+        center_dist_sq = (xs - center) ** 2 + (ys - center) ** 2
+        self._center_bonus = (1 - (center_dist_sq / (center ** 2 * 2))) * 5
+
+    @property
+    def board(self):
+        """The unpadded board as a (line_points, line_points) view indexed [y, x]."""
+        return self._board[4:-4, 4:-4]
+
+    def load(self, checkerboard):
+        """Copies a list-of-lists board ([y][x] Chessman values)."""
+        self.board[:, :] = np.asarray(checkerboard, dtype=np.int8)
+
+    def place(self, point, value):
+        self._board[point.Y + 4, point.X + 4] = value
+
+    def remove(self, point):
+        self._board[point.Y + 4, point.X + 4] = 0
+
+    def _shifted(self, k, x_offset, y_offset):
+        """View of the cells k steps away from every intersection in direction (x_offset, y_offset)."""
+        n = self._line_points
+        y0 = 4 + k * y_offset
+        x0 = 4 + k * x_offset
+        return self._board[y0:y0 + n, x0:x0 + n]
+
+    def _half_line(self, value, x_offset, y_offset):
+        """For every cell: (continuous 'value' stones within 4 steps one way, 1 if the cell after them is empty)."""
+        count = np.zeros((self._line_points, self._line_points), dtype=np.int64)
+        running = np.ones_like(count, dtype=bool)
+        live = np.zeros_like(count)
+        for k in range(1, 5):
+            cells = self._shifted(k, x_offset, y_offset)
+            # The first non-'value' cell ends the run: live if it is empty
+            live += running & (cells == 0)
+            running &= cells == value
+            count += running
+        return count, live
+
+    def direction_scores(self, my_value, x_offset, y_offset):
+        """(my_score, opp_score) arrays for one direction, as AI._scan_direction_scores."""
+        opp_value = 3 - my_value
+        forward, forward_live = self._half_line(my_value, x_offset, y_offset)
+        backward, backward_live = self._half_line(my_value, -x_offset, -y_offset)
+        my_score = _MY_TABLE[np.minimum(forward + backward, 4), forward_live + backward_live]
+        forward, forward_live = self._half_line(opp_value, x_offset, y_offset)
+        backward, backward_live = self._half_line(opp_value, -x_offset, -y_offset)
+        opp_score = _OPP_TABLE[np.minimum(forward + backward, 4), forward_live + backward_live]
+        return my_score, opp_score
+
+    def score_map(self, my_value):
+        """
+        _get_point_score for every cell of the board, for the side 'my_value'.
+        :return: float array indexed [y, x]; occupied cells are -inf
+        """
+        score = np.zeros((self._line_points, self._line_points), dtype=np.int64)
+        for x_offset, y_offset in offset:
+            my_score, opp_score = self.direction_scores(my_value, x_offset, y_offset)
+            score += np.maximum(my_score, opp_score)
+        scores = score + self._center_bonus
+        scores[self.board != 0] = -np.inf
+        return scores
+
+    def best_point(self, my_value):
+        """The cell the original AI_drop scan picks: best score, then nearest the center, then lowest x, y."""
+        scores = self.score_map(my_value)
+        best = scores.max()
+        if best == -np.inf:
+            return None
+        ys, xs = np.nonzero(scores == best)
+        center = self._line_points // 2
+        order = np.lexsort((ys, xs, (xs - center) ** 2 + (ys - center) ** 2))
+        return Point(int(xs[order[0]]), int(ys[order[0]]))
+
+
+class VectorizedAI(AI):
+    """Greedy AI that picks its move from VectorizedEvaluator.score_map instead of the score cache."""
+
+    def __init__(self, line_points, chessman, checkerboard=None):
+        self._evaluator = VectorizedEvaluator(line_points)
+        super().__init__(line_points, chessman, checkerboard)
+
+    def _add_stone(self, point, value):
+        super()._add_stone(point, value)
+        self._evaluator.place(point, value)
+
+    def _remove_stone(self, point, value):
+        super()._remove_stone(point, value)
+        self._evaluator.remove(point)
+
+    def AI_drop(self):
+        point = self._book_drop()
+        if point is not None:
+            return point
+        point = self._evaluator.best_point(self._my.Value)
+        if point is None:
+            print("AI Error: No empty cells found!")
+            return None
+        if self._is_forbidden(point, self._my.Value):
+            moves = self.candidate_moves(1, value=self._my.Value)  # Best allowed cell by the score cache
+            if not moves:
+                print("AI Error: No allowed cells found!")
+                return None
+            point = moves[0]
+        self._play(point)
+        print(f"AI chooses: ({point.X}, {point.Y})")
+        return point
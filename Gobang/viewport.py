@@ -0,0 +1,199 @@
+import math
+
+import pygame
+import pygame.gfxdraw
+
+from checkerboard import Point
+
+MIN_CELL_SIZE = 6
+MAX_CELL_SIZE = 60
+
+
+class Viewport:
+    """
+    Scrolling and zooming window onto a board of any size, drawn into `rect` of the screen.
+
+    `center` is the board coordinate shown in the middle of `rect` and `cell_size` the grid
+    spacing in pixels. Only the grid lines and stones inside the visible region are drawn,
+    so drawing costs the same on a 1000x1000 or unbounded board as on a 19x19 one. With
+    the default center and cell size a 19x19 board is laid out like the fixed renderer.
+
+    The grid is rendered once per view into a cached surface (background) and stones are
+    blitted from pre-rendered sprites, so a frame where only a stone was added costs one
+    small blit; view_key() tells callers when the view moved and the board needs a redraw.
+    """
+
+    def __init__(self, rect, line_points=None, cell_size=30):
+        self.rect = pygame.Rect(rect)
+        self.line_points = line_points  # None for an unbounded board
+        self.cell_size = cell_size
+        self._background = None  # (view key, style, surface)
+        self._sprites = {}  # (color, radius) -> stone surface
+        self.recenter()
+
+    def recenter(self, point=None):
+        """Centers the view on 'point', or on the middle of the board (the origin if unbounded)."""
+        if point is not None:
+            self.center = [float(point.X), float(point.Y)]
+        elif self.line_points is None:
+            self.center = [0.0, 0.0]
+        else:
+            self.center = [(self.line_points - 1) / 2, (self.line_points - 1) / 2]
+
+    def scroll(self, dx, dy):
+        """Moves the view by (dx, dy) pixels, e.g. a mouse drag; the board stays on screen."""
+        self.center[0] -= dx / self.cell_size
+        self.center[1] -= dy / self.cell_size
+        if self.line_points is not None:
+            for i in (0, 1):
+                self.center[i] = min(max(self.center[i], 0.0), self.line_points - 1.0)
+
+    def zoom(self, factor, anchor=None):
+        """Scales the grid by 'factor', keeping the board point under the 'anchor' pixel in place."""
+        size = min(max(round(self.cell_size * factor), MIN_CELL_SIZE), MAX_CELL_SIZE)
+        if size == self.cell_size:
+            return
+        if anchor is not None:
+            ax = self.center[0] + (anchor[0] - self.rect.centerx) / self.cell_size
+            ay = self.center[1] + (anchor[1] - self.rect.centery) / self.cell_size
+            self.center[0] = ax - (anchor[0] - self.rect.centerx) / size
+            self.center[1] = ay - (anchor[1] - self.rect.centery) / size
+        self.cell_size = size
+
+    def view_key(self):
+        """Changes whenever scrolling or zooming changes what is on screen."""
+        return self.center[0], self.center[1], self.cell_size
+
+    def to_screen(self, x, y):
+        """Pixel position of board intersection (x, y)."""
+        return (round(self.rect.centerx + (x - self.center[0]) * self.cell_size),
+                round(self.rect.centery + (y - self.center[1]) * self.cell_size))
+
+    def to_board(self, pos):
+        """The intersection within half a cell of pixel 'pos', or None (off the view or the board)."""
+        if not self.rect.collidepoint(pos):
+            return None
+        fx = self.center[0] + (pos[0] - self.rect.centerx) / self.cell_size
+        fy = self.center[1] + (pos[1] - self.rect.centery) / self.cell_size
+        x, y = round(fx), round(fy)
+        if (fx - x) ** 2 + (fy - y) ** 2 > 0.25:
+            return None
+        if self.line_points is not None and not (0 <= x < self.line_points and 0 <= y < self.line_points):
+            return None
+        return Point(x, y)
+
+    def visible_range(self):
+        """(x0, x1, y0, y1): the board intersections on screen, inclusive, clipped to the board."""
+        half_w = self.rect.width / 2 / self.cell_size
+        half_h = self.rect.height / 2 / self.cell_size
+        x0, x1 = math.floor(self.center[0] - half_w), math.ceil(self.center[0] + half_w)
+        y0, y1 = math.floor(self.center[1] - half_h), math.ceil(self.center[1] + half_h)
+        if self.line_points is not None:
+            x0, y0 = max(x0, 0), max(y0, 0)
+            x1, y1 = min(x1, self.line_points - 1), min(y1, self.line_points - 1)
+        return x0, x1, y0, y1
+
+    def star_points(self):
+        """Star points of a bounded board: the corners' 4-4 points and the center, as on 19x19."""
+        n = self.line_points
+        if n is None or n < 9:
+            return []
+        edge = 3 if n >= 13 else 2
+        ticks = sorted({edge, n // 2, n - 1 - edge})
+        return [(x, y) for x in ticks for y in ticks]
+
+    def background(self, fill_color, line_color, border_width=4, inside_width=4, star_color=(0, 0, 0)):
+        """The board area of the current view (fill, grid, border, star points) as a cached surface."""
+        style = (fill_color, line_color, border_width, inside_width, star_color)
+        if self._background is None or self._background[:2] != (self.view_key(), style):
+            surface = pygame.Surface(self.rect.size)
+            surface.fill(fill_color)
+            self._draw_grid(surface, (-self.rect.x, -self.rect.y), line_color, border_width, inside_width, star_color)
+            self._background = (self.view_key(), style, surface)
+        return self._background[2]
+
+    def _draw_grid(self, surface, shift, line_color, border_width, inside_width, star_color):
+        """Draws the visible grid lines, the board border and the star points onto 'surface', moved by 'shift'."""
+        def at(x, y):
+            sx, sy = self.to_screen(x, y)
+            return sx + shift[0], sy + shift[1]
+
+        x0, x1, y0, y1 = self.visible_range()
+        if x0 <= x1 and y0 <= y1:
+            left, top = at(x0, y0)
+            right, bottom = at(x1, y1)
+            for y in range(y0, y1 + 1):
+                sy = at(x0, y)[1]
+                pygame.draw.line(surface, line_color, (left, sy), (right, sy), 1)
+            for x in range(x0, x1 + 1):
+                sx = at(x, y0)[0]
+                pygame.draw.line(surface, line_color, (sx, top), (sx, bottom), 1)
+        if self.line_points is not None:
+            left, top = at(0, 0)
+            right, bottom = at(self.line_points - 1, self.line_points - 1)
+            margin = inside_width + border_width // 2
+            pygame.draw.rect(surface, line_color, (left - margin, top - margin,
+                                                   right - left + 2 * inside_width + border_width,
+                                                   bottom - top + 2 * inside_width + border_width), border_width)
+            radius_scale = self.cell_size / 30
+            center = self.line_points // 2
+            for x, y in self.star_points():
+                if x0 <= x <= x1 and y0 <= y <= y1:
+                    sx, sy = at(x, y)
+                    radius = max(1, round((5 if x == y == center else 3) * radius_scale))
+                    pygame.gfxdraw.aacircle(surface, sx, sy, radius, star_color)
+                    pygame.gfxdraw.filled_circle(surface, sx, sy, radius, star_color)
+
+    def stone_radius(self):
+        return max(2, self.cell_size // 2 - max(1, self.cell_size // 10))
+
+    def stone_sprite(self, color):
+        """Antialiased stone of the current size, rendered once per color and size."""
+        radius = self.stone_radius()
+        sprite = self._sprites.get((color, radius))
+        if sprite is None:
+            sprite = stone_sprite(color, radius)
+            self._sprites[(color, radius)] = sprite
+        return sprite
+
+    def draw_stone(self, screen, point, color):
+        """Blits one stone if it is in view; returns the screen rect it changed (or None)."""
+        x0, x1, y0, y1 = self.visible_range()
+        if not (x0 <= point.X <= x1 and y0 <= point.Y <= y1):
+            return None
+        sprite = self.stone_sprite(color)
+        rect = sprite.get_rect(center=self.to_screen(point.X, point.Y))
+        screen.set_clip(self.rect)
+        screen.blit(sprite, rect)
+        screen.set_clip(None)
+        return rect.clip(self.rect)
+
+    def draw_stones(self, screen, board, colors):
+        """
+        Draws the stones of 'board' (any board with `moves` and value_at) that are in view.
+        :param colors: {Chessman value: color}
+        """
+        screen.set_clip(self.rect)
+        x0, x1, y0, y1 = self.visible_range()
+        if len(board.moves) <= (x1 - x0 + 1) * (y1 - y0 + 1):
+            # Fewer stones than visible cells: cull the stones
+            cells = ((p.X, p.Y) for p in board.moves if x0 <= p.X <= x1 and y0 <= p.Y <= y1)
+        else:
+            cells = ((x, y) for y in range(y0, y1 + 1) for x in range(x0, x1 + 1))
+        sprites = {value: self.stone_sprite(color) for value, color in colors.items()}
+        for x, y in cells:
+            value = board.value_at(Point(x, y))
+            if value:
+                sprite = sprites[value]
+                screen.blit(sprite, sprite.get_rect(center=self.to_screen(x, y)))
+        screen.set_clip(None)
+
+
+def stone_sprite(color, radius):
+    """A stone as a small transparent surface: the antialiased circle drawn once, then blitted."""
+    size = 2 * radius + 3
+    sprite = pygame.Surface((size, size), pygame.SRCALPHA)
+    sprite.fill((*color[:3], 0))  # Transparent, but in the stone's color so the antialiased edge has no dark fringe
+    pygame.gfxdraw.aacircle(sprite, size // 2, size // 2, radius, color)
+    pygame.gfxdraw.filled_circle(sprite, size // 2, size // 2, radius, color)
+    return sprite
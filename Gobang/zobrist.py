@@ -0,0 +1,116 @@
+import random
+from array import array
+from collections import namedtuple
+
+# Bound types stored with each transposition table entry
+EXACT = 0
+LOWER = 1  # Search failed high: the true score is at least the stored score
+UPPER = 2  # Search failed low: the true score is at most the stored score
+
+NO_MOVE = -1
+
+TTStats = namedtuple('TTStats', 'size used fill probes hits hit_rate stores overwrites rejected memory_bytes')
+
+# Keys depend only on the board size and a fixed seed, so hashes are stable across runs
+_key_cache = {}
+
+
+def zobrist_keys(line_points, seed=0x5EED):
+    """
+    Random 64-bit keys indexed [value][y * line_points + x] for value 1 (black) and 2 (white).
+
+    The hash of a position is the XOR of the keys of its stones, so placing or removing a
+    stone updates it with a single XOR.
+    """
+    if (line_points, seed) not in _key_cache:
+        rng = random.Random(seed ^ line_points)
+        cells = line_points * line_points
+        _key_cache[(line_points, seed)] = (
+            None,
+            [rng.getrandbits(64) for _ in range(cells)],
+            [rng.getrandbits(64) for _ in range(cells)],
+        )
+    return _key_cache[(line_points, seed)]
+
+
+class TranspositionTable:
+    """
+    Fixed-size hash table of search results with a hard memory cap.
+
+    Entries live in preallocated typed arrays (no per-entry objects), so the table never
+    grows past `max_bytes`. Each slot stores the full key, depth, bound type, score and
+    best move. Replacement is depth-preferred: a slot is only overwritten by a search at
+    least as deep, unless the stored entry is from an earlier search (older generation).
+    """
+
+    # key(8) + score(8) + move(2) + depth(1) + flag(1) + generation(1)
+    ENTRY_BYTES = 21
+
+    def __init__(self, max_bytes=16 * 1024 * 1024):
+        size = 1
+        while size * 2 * self.ENTRY_BYTES <= max_bytes:
+            size *= 2
+        self._size = size
+        self._mask = size - 1
+        self._keys = array('Q', [0]) * size
+        self._scores = array('q', [0]) * size
+        self._moves = array('h', [NO_MOVE]) * size
+        self._depths = array('b', [-1]) * size  # -1 marks an empty slot
+        self._flags = array('b', [0]) * size
+        self._generations = array('B', [0]) * size
+        self._generation = 0
+        self._used = 0
+        self.reset_stats()
+
+    def reset_stats(self):
+        self._probes = self._hits = self._stores = self._overwrites = self._rejected = 0
+
+    def new_search(self):
+        """Marks existing entries as stale so a new search may replace them freely."""
+        self._generation = (self._generation + 1) & 0xFF
+
+    def clear(self):
+        for i in range(self._size):
+            self._depths[i] = -1
+        self._used = 0
+
+    def probe(self, key):
+        """Returns (depth, flag, score, move) for 'key', or None if it is not stored."""
+        self._probes += 1
+        slot = key & self._mask
+        if self._depths[slot] >= 0 and self._keys[slot] == key:
+            self._hits += 1
+            return self._depths[slot], self._flags[slot], self._scores[slot], self._moves[slot]
+        return None
+
+    def store(self, key, depth, flag, score, move=NO_MOVE):
+        slot = key & self._mask
+        stored_depth = self._depths[slot]
+        if stored_depth < 0:
+            self._used += 1
+        elif self._keys[slot] != key:
+            if depth < stored_depth and self._generations[slot] == self._generation:
+                self._rejected += 1
+                return
+            self._overwrites += 1
+        elif depth < stored_depth and flag != EXACT:
+            # Same position already searched deeper: keep the more valuable entry
+            self._rejected += 1
+            return
+        self._stores += 1
+        self._keys[slot] = key
+        self._depths[slot] = min(depth, 127)
+        self._flags[slot] = flag
+        self._scores[slot] = score
+        self._moves[slot] = move
+        self._generations[slot] = self._generation
+
+    @property
+    def memory_bytes(self):
+        return sum(a.itemsize * len(a) for a in (self._keys, self._scores, self._moves,
+                                                  self._depths, self._flags, self._generations))
+
+    def stats(self):
+        return TTStats(self._size, self._used, round(self._used / self._size, 4), self._probes, self._hits,
+                       round(self._hits / self._probes, 4) if self._probes else 0.0,
+                       self._stores, self._overwrites, self._rejected, self.memory_bytes)